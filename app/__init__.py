@@ -40,11 +40,116 @@ def create_app(config_name=None):
         logger.critical("WEATHER_API_KEY missing from environment variables")
         raise ValueError("WEATHER_API_KEY is missing. Please set it in your .env file.")
 
+    from app.core.batch import batch_executor
+    from app.core.cache import (
+        CacheSnapshotter,
+        SqliteCache,
+        SuggestionCache,
+        analytics,
+        favorites,
+        render_cache,
+        ttl_policy,
+        weather_cache,
+    )
+    from app.services.weather.service import DatabaseCache
+    if app.config['CACHE_BACKEND'] == 'sqlite':
+        DatabaseCache.use_backend(SqliteCache(
+            app.config['SHARED_CACHE_PATH'],
+            max_entries=app.config['WEATHER_CACHE_MAX_ENTRIES'],
+            max_bytes=app.config['WEATHER_CACHE_MAX_BYTES']
+        ))
+    else:
+        weather_cache.configure(
+            max_entries=app.config['WEATHER_CACHE_MAX_ENTRIES'],
+            max_bytes=app.config['WEATHER_CACHE_MAX_BYTES']
+        )
+        DatabaseCache.use_backend(weather_cache)
+        if app.config['CACHE_SNAPSHOT_PATH']:
+            snapshotter = CacheSnapshotter(
+                weather_cache,
+                app.config['CACHE_SNAPSHOT_PATH'],
+                interval=app.config['CACHE_SNAPSHOT_INTERVAL'],
+                max_load_seconds=app.config['CACHE_SNAPSHOT_MAX_LOAD_SECONDS']
+            )
+            snapshotter.start()
+            app.extensions['cache_snapshotter'] = snapshotter
+    favorites.configure(
+        path=app.config['FAVORITES_LOG_PATH'],
+        compact_min_records=app.config['FAVORITES_COMPACT_MIN_RECORDS']
+    )
+    analytics.configure(
+        popular_capacity=app.config['POPULAR_CITIES_CAPACITY'],
+        popular_half_life=app.config['POPULAR_CITIES_HALF_LIFE'],
+        query_log_capacity=app.config['QUERY_LOG_CAPACITY']
+    )
+    render_cache.configure(max_entries=app.config['RENDER_CACHE_MAX_ENTRIES'])
+    batch_executor.configure(max_workers=app.config['WEATHER_BATCH_MAX_WORKERS'])
+    ttl_policy.configure({
+        'weather': (app.config['WEATHER_CACHE_TIMEOUT'], app.config['WEATHER_STALE_TIMEOUT']),
+        'forecast': (app.config['FORECAST_CACHE_TIMEOUT'], app.config['FORECAST_STALE_TIMEOUT']),
+        'reverse_geocode': (app.config['REVERSE_GEOCODE_CACHE_TIMEOUT'], 0),
+        'negative': (app.config['NEGATIVE_CACHE_TIMEOUT'], 0)
+    }, jitter=app.config['CACHE_TTL_JITTER'])
+
+    from app.services.geo.gazetteer import load_gazetteer
+    from app.services.geo.ranking import RankingWeights
+    from app.services.geo.spatial_index import GridIndex
+    from app.services.weather.circuit_breaker import CircuitBreaker
+    from app.services.weather.group_batcher import GroupBatcher
+    from app.services.weather.quota import UpstreamQuota
     from app.services.weather.service import WeatherAPIService
+    from app.services.weather.transport import UpstreamTransport
+    gazetteer = load_gazetteer(app.config['GAZETTEER_PATH'], app.config['GAZETTEER_MIN_POPULATION'])
+    spatial_index = None
+    if gazetteer is not None:
+        spatial_index = GridIndex.from_gazetteer(gazetteer, app.config['SPATIAL_INDEX_CELL_DEGREES'])
+    quota = None
+    if app.config['UPSTREAM_QUOTA_PER_MINUTE'] > 0:
+        quota = UpstreamQuota(app.config['UPSTREAM_QUOTA_PER_MINUTE'] / max(app.config['UPSTREAM_QUOTA_WORKERS'], 1))
     weather_service = WeatherAPIService(
         api_key=app.config['WEATHER_API_KEY'],
-        base_url=app.config['WEATHER_API_BASE_URL']
+        base_url=app.config['WEATHER_API_BASE_URL'],
+        geo_base_url=app.config['WEATHER_GEO_BASE_URL'],
+        transport=UpstreamTransport(
+            connect_timeout=app.config['WEATHER_API_CONNECT_TIMEOUT'],
+            read_timeout=app.config['WEATHER_API_TIMEOUT'],
+            pool_maxsize=app.config['UPSTREAM_POOL_MAXSIZE'],
+            max_retries=app.config['UPSTREAM_MAX_RETRIES'],
+            backoff_factor=app.config['UPSTREAM_BACKOFF_FACTOR']
+        ),
+        breaker=CircuitBreaker(
+            failure_threshold=app.config['CIRCUIT_BREAKER_FAILURE_THRESHOLD'],
+            recovery_timeout=app.config['CIRCUIT_BREAKER_RECOVERY_TIMEOUT']
+        ),
+        gazetteer=gazetteer,
+        suggestion_cache=SuggestionCache(
+            max_entries=app.config['SUGGESTION_CACHE_MAX_ENTRIES'],
+            timeout=app.config['SUGGESTION_CACHE_TIMEOUT']
+        ),
+        spatial_index=spatial_index,
+        reverse_geocode_max_km=app.config['REVERSE_GEOCODE_MAX_DISTANCE_KM'],
+        ranking_weights=RankingWeights(
+            home_country_code=app.config['SUGGESTION_HOME_COUNTRY'],
+            per_country_limit=app.config['SUGGESTION_PER_COUNTRY_LIMIT']
+        ),
+        group_batcher=GroupBatcher(
+            window=app.config['UPSTREAM_GROUP_WINDOW'],
+            max_group=app.config['UPSTREAM_GROUP_MAX_CITIES'],
+            max_ids=app.config['UPSTREAM_CITY_ID_CACHE_SIZE']
+        ),
+        quota=quota
     )
+    app.extensions['weather_service'] = weather_service
+    if app.config['PREWARM_TOP_N'] > 0:
+        from app.services.weather.prewarm import CachePrewarmer
+        prewarmer = CachePrewarmer(
+            weather_service,
+            top_n=app.config['PREWARM_TOP_N'],
+            lead=app.config['PREWARM_LEAD_SECONDS'],
+            plan_interval=app.config['PREWARM_PLAN_INTERVAL']
+        )
+        prewarmer.start()
+        app.extensions['cache_prewarmer'] = prewarmer
 
     logger.info("Application started successfully (database-free mode)")
 
@@ -0,0 +1,194 @@
+import asyncio
+import json
+import logging
+import time
+from urllib.parse import parse_qs
+
+from werkzeug.http import parse_etags, quote_etag
+
+from app import create_app
+from app.core.single_flight import async_upstream_flights
+from app.services.weather.async_service import AsyncWeatherAPIService
+from app.services.weather.lookups import city_lookup, coords_lookup
+from app.services.weather.quota import BACKGROUND, upstream_priority
+from app.routes.weather_routes import render_projection, response_tag
+from app.services.weather.service import DatabaseCache, WeatherAnalytics
+from app.utils.cache_keys import normalize_unit
+from app.utils.projection import parse_projection
+from app.utils.units import convert_units
+from app.utils.validation import validate_city_name, validate_coordinates
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError:  # pragma: no cover - optional dependency for the ASGI serving mode
+    WsgiToAsgi = None
+
+logger = logging.getLogger(__name__)
+
+class AsyncWeatherApp:
+    def __init__(self, flask_app, weather_service):
+        if WsgiToAsgi is None:
+            raise RuntimeError("asgiref is required for the ASGI serving mode (pip install asgiref)")
+        self.flask_app = flask_app
+        self.wsgi_app = WsgiToAsgi(flask_app)
+        self.weather_service = weather_service
+        self.coords_precision = flask_app.config['COORDS_CACHE_PRECISION']
+        self.render_timeout = flask_app.config['RENDER_CACHE_TIMEOUT']
+        self._refresh_tasks = set()
+        self.routes = {
+            '/weather': self.get_weather,
+            '/weather_by_coords': self.get_weather_by_coords,
+            '/forecast': self.get_forecast
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        handler = self.routes.get(scope['path']) if scope['type'] == 'http' and scope['method'] == 'GET' else None
+        if handler is None:
+            await self.wsgi_app(scope, receive, send)
+            return
+        args = {key: values[0] for key, values in parse_qs(scope.get('query_string', b'').decode('latin-1')).items()}
+        headers = request_headers(scope)
+        try:
+            status, body, response_headers = await handler(args, client_ip(headers, scope), headers)
+        except Exception as error:
+            logger.error(f"Unhandled Exception: {str(error)}", exc_info=True)
+            status, body, response_headers = 500, {'error': 'En uventet feil oppstod. Vennligst prøv igjen senere.'}, []
+        await send_response(send, status, body, response_headers)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.weather_service.aclose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def get_weather(self, args, user_ip, headers):
+        return await self._city_route(args, user_ip, headers, 'weather')
+
+    async def get_forecast(self, args, user_ip, headers):
+        return await self._city_route(args, user_ip, headers, 'forecast')
+
+    async def _city_route(self, args, user_ip, headers, data_type):
+        start_time = time.perf_counter()
+        city = args.get('city', '').strip()
+        country = args.get('country', 'NO').strip()
+        unit = normalize_unit(args.get('unit'))
+        if not city:
+            return 400, {'error': 'By-parameter er påkrevd'}, []
+        valid_city, city_error = validate_city_name(city)
+        if not valid_city:
+            return 400, {'error': city_error}, []
+        projection, projection_error = parse_projection(args.get('fields'), args.get('format'))
+        if projection_error:
+            return 400, {'error': projection_error}, []
+        lookup = city_lookup(self.weather_service, city, country, data_type=data_type)
+        entry = self._get_cached(lookup)
+        if entry is not None:
+            return self._weather_response(headers, entry.value, unit, entry.etag, entry.ttl, projection)
+        data = await async_upstream_flights.do(lookup.cache_key, lambda: self._load(lookup))
+        response_time = (time.perf_counter() - start_time) * 1000
+        WeatherAnalytics.log_query(city, country, user_ip, response_time, data_type)
+        return self._weather_response(headers, data, unit, max_age=DatabaseCache.get_fresh_ttl(lookup.cache_key),
+                                      projection=projection)
+
+    async def get_weather_by_coords(self, args, user_ip, headers):
+        start_time = time.perf_counter()
+        lat = args.get('lat', '').strip()
+        lon = args.get('lon', '').strip()
+        unit = normalize_unit(args.get('unit'))
+        if not lat or not lon:
+            return 400, {'error': 'Breddegrad og lengdegrad parametere er påkrevd'}, []
+        valid_coords, coords_error = validate_coordinates(lat, lon)
+        if not valid_coords:
+            return 400, {'error': coords_error}, []
+        projection, projection_error = parse_projection(args.get('fields'), args.get('format'))
+        if projection_error:
+            return 400, {'error': projection_error}, []
+        lookup = coords_lookup(self.weather_service, lat, lon, self.coords_precision)
+        DatabaseCache.track_coordinates('weather', lat, lon, DatabaseCache.get_timeouts('weather')[0])
+        entry = self._get_cached(lookup)
+        if entry is not None:
+            return self._weather_response(headers, entry.value, unit, entry.etag, entry.ttl, projection)
+        data = await async_upstream_flights.do(lookup.cache_key, lambda: self._load(lookup))
+        response_time = (time.perf_counter() - start_time) * 1000
+        city_name = data.get('name', 'Unknown') if 'error' not in data else 'Unknown'
+        country_code = data.get('sys', {}).get('country', 'Unknown') if 'error' not in data else 'Unknown'
+        WeatherAnalytics.log_query(city_name, country_code, user_ip, response_time, 'coords')
+        return self._weather_response(headers, data, unit, max_age=DatabaseCache.get_fresh_ttl(lookup.cache_key),
+                                      projection=projection)
+
+    def _weather_response(self, headers, data, unit, etag=None, max_age=0, projection=None):
+        if 'error' in data:
+            return 200, convert_units(data, unit), []
+        tag = response_tag(data, unit, etag, projection)
+        response_headers = [
+            (b'etag', quote_etag(tag).encode('latin-1')),
+            (b'cache-control', f"public, max-age={max(int(max_age or 0), 0)}".encode('latin-1'))
+        ]
+        if parse_etags(headers.get('if-none-match')).contains(tag):
+            return 304, None, response_headers
+        if projection is None:
+            return 200, convert_units(data, unit), response_headers
+        return 200, render_projection(tag, data, unit, projection, self.render_timeout), response_headers
+
+    async def _load(self, lookup):
+        data = await self.weather_service.fetch_weather_data(lookup.url)
+        DatabaseCache.store_result(lookup, data)
+        return data
+
+    def _get_cached(self, lookup):
+        entry = DatabaseCache.get_entry(lookup.cache_key)
+        if entry is None:
+            return None
+        if not entry.fresh:
+            with upstream_priority(BACKGROUND):
+                task = asyncio.create_task(async_upstream_flights.do(lookup.cache_key, lambda: self._load(lookup)))
+            self._refresh_tasks.add(task)
+            task.add_done_callback(self._refresh_tasks.discard)
+        return entry
+
+def request_headers(scope):
+    return {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope.get('headers', [])}
+
+def client_ip(headers, scope):
+    forwarded_for = headers.get('x-forwarded-for')
+    if forwarded_for:
+        return forwarded_for.split(',')[0].strip()
+    if headers.get('x-real-ip'):
+        return headers['x-real-ip']
+    client = scope.get('client')
+    return client[0] if client else 'unknown'
+
+async def send_response(send, status, body, headers=()):
+    if body is None:
+        payload = b''
+        response_headers = list(headers)
+    else:
+        payload = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+        response_headers = [(b'content-type', b'application/json'), (b'content-length', str(len(payload)).encode())]
+        response_headers.extend(headers)
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': response_headers
+    })
+    await send({'type': 'http.response.body', 'body': payload})
+
+def create_asgi_app(config_name=None):
+    flask_app = create_app(config_name)
+    weather_service = AsyncWeatherAPIService(
+        api_key=flask_app.config['WEATHER_API_KEY'],
+        base_url=flask_app.config['WEATHER_API_BASE_URL'],
+        timeout=flask_app.config['WEATHER_API_TIMEOUT'],
+        connect_timeout=flask_app.config['WEATHER_API_CONNECT_TIMEOUT'],
+        max_connections=flask_app.config['ASYNC_UPSTREAM_MAX_CONNECTIONS'],
+        breaker=flask_app.extensions['weather_service'].breaker,
+        quota=flask_app.extensions['weather_service'].quota
+    )
+    return AsyncWeatherApp(flask_app, weather_service)
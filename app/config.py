@@ -7,9 +7,58 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-key-change-in-production'
     CACHE_TYPE = 'SimpleCache'
     CACHE_DEFAULT_TIMEOUT = 300
+    WEATHER_CACHE_MAX_ENTRIES = int(os.environ.get('WEATHER_CACHE_MAX_ENTRIES', 5000))
+    WEATHER_CACHE_MAX_BYTES = int(os.environ.get('WEATHER_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+    SHARED_CACHE_PATH = os.environ.get('SHARED_CACHE_PATH', os.path.join('instance', 'weather_cache.db'))
+    CACHE_SNAPSHOT_PATH = os.environ.get('CACHE_SNAPSHOT_PATH', os.path.join('instance', 'weather_cache.snapshot.gz'))
+    CACHE_SNAPSHOT_INTERVAL = int(os.environ.get('CACHE_SNAPSHOT_INTERVAL', 300))
+    CACHE_SNAPSHOT_MAX_LOAD_SECONDS = 2.0
+    WEATHER_CACHE_TIMEOUT = 300
+    WEATHER_STALE_TIMEOUT = 1800
+    FORECAST_CACHE_TIMEOUT = 1800
+    FORECAST_STALE_TIMEOUT = 3600
+    REVERSE_GEOCODE_CACHE_TIMEOUT = 86400
+    NEGATIVE_CACHE_TIMEOUT = 60
+    COORDS_CACHE_PRECISION = int(os.environ.get('COORDS_CACHE_PRECISION', 2))
+    REVERSE_GEOCODE_CACHE_PRECISION = int(os.environ.get('REVERSE_GEOCODE_CACHE_PRECISION', 2))
+    CACHE_TTL_JITTER = float(os.environ.get('CACHE_TTL_JITTER', 0.1))
     WEATHER_API_KEY = os.environ.get('API_KEY')
     WEATHER_API_BASE_URL = 'https://api.openweathermap.org/data/2.5/'
+    WEATHER_GEO_BASE_URL = 'https://api.openweathermap.org/geo/1.0/'
     WEATHER_API_TIMEOUT = 10
+    WEATHER_API_CONNECT_TIMEOUT = 3.05
+    UPSTREAM_POOL_MAXSIZE = int(os.environ.get('UPSTREAM_POOL_MAXSIZE', 16))
+    UPSTREAM_MAX_RETRIES = int(os.environ.get('UPSTREAM_MAX_RETRIES', 2))
+    UPSTREAM_BACKOFF_FACTOR = 0.3
+    UPSTREAM_QUOTA_PER_MINUTE = int(os.environ.get('UPSTREAM_QUOTA_PER_MINUTE', 60))
+    UPSTREAM_QUOTA_WORKERS = int(os.environ.get('WEB_CONCURRENCY', 1))
+    UPSTREAM_GROUP_WINDOW = float(os.environ.get('UPSTREAM_GROUP_WINDOW', 0.02))
+    UPSTREAM_GROUP_MAX_CITIES = 20
+    UPSTREAM_CITY_ID_CACHE_SIZE = int(os.environ.get('UPSTREAM_CITY_ID_CACHE_SIZE', 10000))
+    WEATHER_BATCH_MAX_ITEMS = int(os.environ.get('WEATHER_BATCH_MAX_ITEMS', 20))
+    WEATHER_BATCH_MAX_WORKERS = int(os.environ.get('WEATHER_BATCH_MAX_WORKERS', 8))
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5
+    SUGGESTION_CACHE_MAX_ENTRIES = int(os.environ.get('SUGGESTION_CACHE_MAX_ENTRIES', 5000))
+    SUGGESTION_CACHE_TIMEOUT = 86400
+    SUGGESTION_HOME_COUNTRY = os.environ.get('SUGGESTION_HOME_COUNTRY', 'NO')
+    SUGGESTION_PER_COUNTRY_LIMIT = 3
+    GAZETTEER_PATH = os.environ.get('GAZETTEER_PATH')
+    GAZETTEER_MIN_POPULATION = int(os.environ.get('GAZETTEER_MIN_POPULATION', 0))
+    SPATIAL_INDEX_CELL_DEGREES = 0.25
+    REVERSE_GEOCODE_MAX_DISTANCE_KM = float(os.environ.get('REVERSE_GEOCODE_MAX_DISTANCE_KM', 15))
+    CIRCUIT_BREAKER_RECOVERY_TIMEOUT = 30
+    ASYNC_UPSTREAM_MAX_CONNECTIONS = int(os.environ.get('ASYNC_UPSTREAM_MAX_CONNECTIONS', 200))
+    POPULAR_CITIES_CAPACITY = int(os.environ.get('POPULAR_CITIES_CAPACITY', 1000))
+    POPULAR_CITIES_HALF_LIFE = float(os.environ['POPULAR_CITIES_HALF_LIFE']) if os.environ.get('POPULAR_CITIES_HALF_LIFE') else None
+    FAVORITES_LOG_PATH = os.environ.get('FAVORITES_LOG_PATH', os.path.join('instance', 'favorites.log'))
+    FAVORITES_COMPACT_MIN_RECORDS = 1000
+    PREWARM_TOP_N = int(os.environ.get('PREWARM_TOP_N', 20))
+    PREWARM_LEAD_SECONDS = 30
+    PREWARM_PLAN_INTERVAL = 60
+    RENDER_CACHE_MAX_ENTRIES = int(os.environ.get('RENDER_CACHE_MAX_ENTRIES', 2048))
+    RENDER_CACHE_TIMEOUT = 3600
+    QUERY_LOG_CAPACITY = int(os.environ.get('QUERY_LOG_CAPACITY', 100000))
     RATELIMIT_STORAGE_URL = 'memory://'
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
 
@@ -22,6 +71,13 @@ class DevelopmentConfig(Config):
 
 class TestingConfig(Config):
     TESTING = True
+    GAZETTEER_PATH = None
+    CACHE_BACKEND = 'memory'
+    CACHE_SNAPSHOT_PATH = None
+    FAVORITES_LOG_PATH = None
+    PREWARM_TOP_N = 0
+    UPSTREAM_QUOTA_PER_MINUTE = 0
+    CACHE_TTL_JITTER = 0.0
 
 class ProductionConfig(Config):
     DEBUG = False
@@ -1,17 +1,37 @@
+from app.core.batch import BatchExecutor, batch_executor
 from app.core.cache import (
     InMemoryAnalytics,
     InMemoryCache,
-    InMemoryFavorites,
     analytics,
     favorites,
     weather_cache,
 )
+from app.core.favorites_store import FavoritesStore
+from app.core.heavy_hitters import SpaceSaving
+from app.core.metrics import ANALYTICS_WINDOWS, LatencyHistogram, LatencyRollups
+from app.core.query_log import QueryLog, StringTable
+from app.core.refresh import BackgroundRefresher, background_refresher
+from app.core.single_flight import AsyncSingleFlight, SingleFlight, async_upstream_flights, upstream_flights
 
 __all__ = [
+    "ANALYTICS_WINDOWS",
+    "AsyncSingleFlight",
+    "BackgroundRefresher",
+    "BatchExecutor",
+    "FavoritesStore",
     "InMemoryAnalytics",
     "InMemoryCache",
-    "InMemoryFavorites",
+    "LatencyHistogram",
+    "LatencyRollups",
+    "QueryLog",
+    "SingleFlight",
+    "SpaceSaving",
+    "StringTable",
     "analytics",
+    "async_upstream_flights",
+    "background_refresher",
+    "batch_executor",
     "favorites",
+    "upstream_flights",
     "weather_cache",
 ]
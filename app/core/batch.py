@@ -0,0 +1,49 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class BatchExecutor:
+    def __init__(self, max_workers: int = 8):
+        self._lock = threading.Lock()
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='weather-batch')
+        self._stats = {'batches': 0, 'tasks': 0, 'failed': 0}
+
+    def configure(self, max_workers: int = 8) -> None:
+        with self._lock:
+            if max_workers == self.max_workers:
+                return
+            previous = self._executor
+            self.max_workers = max_workers
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='weather-batch')
+        previous.shutdown(wait=False)
+
+    def run_all(self, tasks: Dict[Hashable, Callable[[], Dict]], fallback: Dict) -> Dict[Hashable, Dict]:
+        with self._lock:
+            executor = self._executor
+            self._stats['batches'] += 1
+            self._stats['tasks'] += len(tasks)
+        futures = {key: executor.submit(task) for key, task in tasks.items()}
+        results = {}
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as error:
+                logger.error(f"Batch task failed for {key}: {error}")
+                with self._lock:
+                    self._stats['failed'] += 1
+                results[key] = fallback
+        return results
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['max_workers'] = self.max_workers
+            return stats
+
+
+batch_executor = BatchExecutor()
@@ -1,17 +1,35 @@
+from app.core.cache.coordinate_stats import CoordinateHitTracker, coordinate_stats
 from app.core.cache.memory_cache import (
+    CacheEntry,
     InMemoryAnalytics,
     InMemoryCache,
-    InMemoryFavorites,
     analytics,
+    content_hash,
     favorites,
+    render_cache,
     weather_cache,
 )
+from app.core.cache.snapshot import CacheSnapshotter
+from app.core.cache.sqlite_cache import SqliteCache
+from app.core.cache.suggestion_cache import SuggestionCache
+from app.core.cache.ttl_policy import TTLPolicy, ttl_policy
+from app.core.favorites_store import FavoritesStore
 
 __all__ = [
+    "CacheEntry",
+    "CacheSnapshotter",
+    "CoordinateHitTracker",
+    "FavoritesStore",
     "InMemoryAnalytics",
     "InMemoryCache",
-    "InMemoryFavorites",
+    "SqliteCache",
+    "SuggestionCache",
+    "TTLPolicy",
     "analytics",
+    "content_hash",
+    "coordinate_stats",
     "favorites",
+    "render_cache",
+    "ttl_policy",
     "weather_cache",
 ]
@@ -0,0 +1,50 @@
+import threading
+from collections import defaultdict
+
+from app.core.cache.memory_cache import InMemoryCache
+from app.utils.geo import quantize_coordinates
+
+
+class CoordinateHitTracker:
+    def __init__(self, precisions=(0, 1, 2, 3, 4), max_cells=10000):
+        self.precisions = tuple(precisions)
+        self.max_cells = max_cells
+        self._lock = threading.Lock()
+        self._cells = defaultdict(self._new_shadow)
+        self._counts = defaultdict(lambda: {'hits': 0, 'misses': 0})
+
+    def _new_shadow(self):
+        return {precision: InMemoryCache(max_entries=self.max_cells) for precision in self.precisions}
+
+    def record(self, kind, lat, lon, timeout):
+        with self._lock:
+            shadows = self._cells[kind]
+            for precision in self.precisions:
+                cell = quantize_coordinates(lat, lon, precision)
+                counts = self._counts[(kind, precision)]
+                if shadows[precision].get(cell) is not None:
+                    counts['hits'] += 1
+                else:
+                    counts['misses'] += 1
+                    shadows[precision].set(cell, True, timeout)
+
+    def get_stats(self):
+        with self._lock:
+            stats = {}
+            for (kind, precision), counts in sorted(self._counts.items()):
+                total = counts['hits'] + counts['misses']
+                stats.setdefault(kind, {})[str(precision)] = {
+                    'hits': counts['hits'],
+                    'misses': counts['misses'],
+                    'hit_rate': round(counts['hits'] / total, 4) if total else 0.0,
+                    'cells': len(self._cells[kind][precision])
+                }
+            return stats
+
+    def reset(self):
+        with self._lock:
+            self._cells.clear()
+            self._counts.clear()
+
+
+coordinate_stats = CoordinateHitTracker()
@@ -1,97 +1,262 @@
-from collections import defaultdict, deque
-from datetime import datetime, timedelta, timezone
+import hashlib
+import heapq
+import itertools
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict, namedtuple
+
+from app.core.favorites_store import FavoritesStore
+from app.core.heavy_hitters import SpaceSaving
+from app.core.metrics import LatencyRollups
+from app.core.query_log import QueryLog
+
+class CacheEntry(namedtuple('CacheEntry', ['value', 'fresh', 'ttl'])):
+    def __new__(cls, value, fresh, ttl, etag=None):
+        entry = super().__new__(cls, value, fresh, ttl)
+        entry.etag = etag
+        return entry
+
+def payload_hash(payload):
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=10).hexdigest()
+
+def content_hash(value):
+    return payload_hash(json.dumps(value, separators=(',', ':'), default=str))
+
+def estimate_size(value):
+    try:
+        return len(json.dumps(value, separators=(',', ':'), default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+class _CacheEntry:
+    __slots__ = ('value', 'fresh_until', 'expires_at', 'size', 'seq', 'etag')
+
+    def __init__(self, value, fresh_until, expires_at, size, seq):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.expires_at = expires_at
+        self.size = size
+        self.seq = seq
+        self.etag = None
 
 class InMemoryCache:
-    def __init__(self):
-        self._cache = {}
-        self._expiry = {}
+    def __init__(self, max_entries=None, max_bytes=None, clock=time.monotonic):
+        self._entries = OrderedDict()
+        self._expiry_heap = []
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
+        self._clock = clock
+        self._bytes = 0
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+    def configure(self, max_entries=None, max_bytes=None):
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self._enforce_budget()
 
     def get(self, key):
-        if key in self._cache:
-            if datetime.now(timezone.utc) < self._expiry[key]:
-                return self._cache[key]
-            del self._cache[key]
-            del self._expiry[key]
-        return None
+        entry = self._lookup(key, allow_stale=False)
+        return entry.value if entry is not None else None
 
-    def set(self, key, value, timeout=300):
-        self._cache[key] = value
-        self._expiry[key] = datetime.now(timezone.utc) + timedelta(seconds=timeout)
+    def get_entry(self, key):
+        return self._lookup(key, allow_stale=True)
+
+    def _lookup(self, key, allow_stale):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            now = self._clock()
+            if now >= entry.expires_at:
+                self._remove(key)
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            if now < entry.fresh_until:
+                self._stats['hits'] += 1
+                return CacheEntry(entry.value, True, entry.fresh_until - now, self._etag(entry))
+            if not allow_stale:
+                self._stats['misses'] += 1
+                return None
+            self._stats['stale_hits'] += 1
+            return CacheEntry(entry.value, False, 0, self._etag(entry))
+
+    def _etag(self, entry):
+        if entry.etag is None:
+            entry.etag = content_hash(entry.value)
+        return entry.etag
+
+    def fresh_ttl(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            now = self._clock()
+            if entry is None or now >= entry.expires_at:
+                return None
+            return entry.fresh_until - now
+
+    def set(self, key, value, timeout=300, stale_timeout=0, size=None):
+        if size is None:
+            size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return False
+            self._purge_expired(self._clock())
+            fresh_until = self._clock() + timeout
+            entry = _CacheEntry(value, fresh_until, fresh_until + stale_timeout, size, next(self._seq))
+            self._entries[key] = entry
+            self._bytes += size
+            heapq.heappush(self._expiry_heap, (entry.expires_at, entry.seq, key))
+            self._enforce_budget()
+            if len(self._expiry_heap) > 2 * len(self._entries) + 64:
+                self._rebuild_heap()
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                return True
+            return False
 
     def clear_expired(self):
-        now = datetime.now(timezone.utc)
-        expired_keys = [key for key, expiry in self._expiry.items() if now >= expiry]
-        for key in expired_keys:
-            del self._cache[key]
-            del self._expiry[key]
-        return len(expired_keys)
+        with self._lock:
+            return self._purge_expired(self._clock())
 
     def clear(self):
-        count = len(self._cache)
-        self._cache.clear()
-        self._expiry.clear()
-        return count
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._expiry_heap.clear()
+            self._bytes = 0
+            return count
+
+    def export_entries(self):
+        with self._lock:
+            now = self._clock()
+            return [(key, entry.value, entry.fresh_until - now, entry.expires_at - now, entry.size)
+                    for key, entry in self._entries.items() if entry.expires_at > now]
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes
+            })
+            return stats
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        return entry
+
+    def _purge_expired(self, now):
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            _, seq, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            if entry is not None and entry.seq == seq:
+                self._remove(key)
+                removed += 1
+        self._stats['expirations'] += removed
+        return removed
+
+    def _enforce_budget(self):
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self._stats['evictions'] += 1
+
+    def _rebuild_heap(self):
+        self._expiry_heap = [(entry.expires_at, entry.seq, key) for key, entry in self._entries.items()]
+        heapq.heapify(self._expiry_heap)
+
+def _round_count(value):
+    return int(value) if float(value).is_integer() else round(value, 2)
 
 class InMemoryAnalytics:
-    def __init__(self):
-        self.queries = deque(maxlen=1000)
-        self.city_counts = defaultdict(int)
+    def __init__(self, clock=time.time, query_log_capacity=100000, avg_window=1000):
+        self._lock = threading.Lock()
+        self._clock = clock
+        self.queries = QueryLog(query_log_capacity)
+        self.avg_window = avg_window
+        self.city_counts = SpaceSaving(clock=clock)
         self.query_stats = {
             'total_queries': 0,
             'avg_response_time': 0,
             'endpoints': defaultdict(int)
         }
+        self._timed_total = 0
+        self._timed_count = 0
+        self.latency = LatencyRollups(clock=clock)
+
+    def configure(self, popular_capacity=1000, popular_half_life=None, query_log_capacity=None):
+        self.city_counts.configure(popular_capacity, popular_half_life)
+        if query_log_capacity and query_log_capacity != self.queries.capacity:
+            with self._lock:
+                self.queries = QueryLog(query_log_capacity)
+                self._timed_total = 0
+                self._timed_count = 0
 
     def log_query(self, city, country, user_ip, response_time, endpoint):
-        query = {
-            'city': city,
-            'country': country,
-            'user_ip': user_ip,
-            'response_time_ms': response_time,
-            'endpoint': endpoint,
-            'timestamp': datetime.now(timezone.utc)
-        }
-        self.queries.append(query)
-        city_key = f"{city}, {country}"
-        self.city_counts[city_key] += 1
-        self.query_stats['total_queries'] += 1
-        self.query_stats['endpoints'][endpoint] += 1
-        total_time = sum(q['response_time_ms'] for q in self.queries if q['response_time_ms'])
-        total_count = len([q for q in self.queries if q['response_time_ms']])
-        if total_count > 0:
-            self.query_stats['avg_response_time'] = total_time / total_count
+        with self._lock:
+            if len(self.queries) >= self.avg_window:
+                leaving = self.queries.latency(self.avg_window - 1)
+                if leaving:
+                    self._timed_total -= leaving
+                    self._timed_count -= 1
+            self.queries.append(city, country, user_ip, response_time, endpoint, self._clock())
+            if response_time:
+                self._timed_total += response_time
+                self._timed_count += 1
+            city_key = f"{city}, {country}"
+            self.city_counts.offer(city_key)
+            self.query_stats['total_queries'] += 1
+            self.query_stats['endpoints'][endpoint] += 1
+            if self._timed_count > 0:
+                self.query_stats['avg_response_time'] = self._timed_total / self._timed_count
+        if response_time is not None:
+            self.latency.record(endpoint, response_time)
 
     def get_query_stats(self):
         return dict(self.query_stats)
 
-    def get_popular_cities(self, limit=10):
-        sorted_cities = sorted(self.city_counts.items(), key=lambda x: x[1], reverse=True)
-        return [{'city': city, 'count': count} for city, count in sorted_cities[:limit]]
+    def get_latency_stats(self, window=None):
+        return self.latency.summary(window)
 
-class InMemoryFavorites:
-    def __init__(self):
-        self.favorites = defaultdict(list)
+    def get_log_summary(self, window=None):
+        with self._lock:
+            since = self._clock() - window if window is not None else None
+            summary = self.queries.summarize(since)
+            summary['log'] = self.queries.get_stats()
+            return summary
 
-    def get_user_favorites(self, user_ip):
-        return self.favorites.get(user_ip, [])
+    def get_popular_cities(self, limit=10):
+        return [{'city': city, 'count': _round_count(count), 'error': _round_count(error)}
+                for city, count, error in self.city_counts.top(limit)]
 
-    def add_favorite(self, user_ip, city, country):
-        favorite = {'city': city, 'country': country, 'added_at': datetime.now(timezone.utc).isoformat()}
-        user_favs = self.favorites[user_ip]
-        for fav in user_favs:
-            if fav['city'].lower() == city.lower() and fav['country'].lower() == country.lower():
-                return False
-        user_favs.append(favorite)
-        return True
-
-    def remove_favorite(self, user_ip, city, country):
-        user_favs = self.favorites[user_ip]
-        for index, fav in enumerate(user_favs):
-            if fav['city'].lower() == city.lower() and fav['country'].lower() == country.lower():
-                del user_favs[index]
-                return True
-        return False
+    def get_popular_stats(self):
+        return self.city_counts.get_stats()
 
 weather_cache = InMemoryCache()
+render_cache = InMemoryCache(max_entries=2048)
 analytics = InMemoryAnalytics()
-favorites = InMemoryFavorites()
+favorites = FavoritesStore()
@@ -0,0 +1,123 @@
+import atexit
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+
+class CacheSnapshotter:
+    def __init__(self, cache, path, interval=300, max_load_seconds=2.0, clock=time.time):
+        self.cache = cache
+        self.path = path
+        self.interval = interval
+        self.max_load_seconds = max_load_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._loaded = threading.Event()
+        self._thread = None
+        self._stats = {'saved': 0, 'loaded': 0, 'skipped_expired': 0, 'load_truncated': False,
+                       'last_save_seconds': None, 'last_load_seconds': None}
+
+    def save(self):
+        with self._lock:
+            started = time.perf_counter()
+            now = self._clock()
+            entries = self.cache.export_entries()
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with gzip.open(temp_path, 'wt', encoding='utf-8', compresslevel=5) as target:
+                target.write(json.dumps({'version': SNAPSHOT_VERSION, 'saved_at': now}) + '\n')
+                for key, value, fresh_ttl, expires_ttl, size in reversed(entries):
+                    record = [key, round(now + fresh_ttl, 3), round(now + expires_ttl, 3), size, value]
+                    target.write(json.dumps(record, separators=(',', ':'), default=str) + '\n')
+            os.replace(temp_path, self.path)
+            self._stats['saved'] = len(entries)
+            self._stats['last_save_seconds'] = round(time.perf_counter() - started, 4)
+            return len(entries)
+
+    def load(self):
+        try:
+            return self._load()
+        finally:
+            self._loaded.set()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return 0
+        started = time.perf_counter()
+        deadline = started + self.max_load_seconds
+        now = self._clock()
+        valid = []
+        skipped = 0
+        truncated = False
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as source:
+                header = json.loads(source.readline() or '{}')
+                if header.get('version') != SNAPSHOT_VERSION:
+                    logger.warning(f"Ignoring cache snapshot with unknown version in {self.path}")
+                    return 0
+                for line in source:
+                    if time.perf_counter() > deadline:
+                        truncated = True
+                        break
+                    key, fresh_until, expires_at, size, value = json.loads(line)
+                    if expires_at <= now:
+                        skipped += 1
+                        continue
+                    valid.append((key, value, fresh_until - now, expires_at - fresh_until, size))
+        except (OSError, EOFError, ValueError) as error:
+            logger.warning(f"Could not read cache snapshot {self.path}: {error}")
+        for key, value, timeout, stale_timeout, size in reversed(valid):
+            if self.cache.fresh_ttl(key) is None:
+                self.cache.set(key, value, timeout, stale_timeout, size=size)
+        with self._lock:
+            self._stats.update({
+                'loaded': len(valid),
+                'skipped_expired': skipped,
+                'load_truncated': truncated,
+                'last_load_seconds': round(time.perf_counter() - started, 4)
+            })
+        logger.info(f"Loaded {len(valid)} cache entries from snapshot")
+        return len(valid)
+
+    def _run(self):
+        try:
+            self.load()
+        except Exception as error:
+            logger.error(f"Cache snapshot load failed: {error}")
+        while not self._stop.wait(self.interval):
+            self._save_quietly()
+
+    def _save_quietly(self):
+        try:
+            self.save()
+        except Exception as error:
+            logger.error(f"Cache snapshot failed: {error}")
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='cache-snapshot', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        self._stop.set()
+        if self._loaded.is_set():
+            self._save_quietly()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['loading'] = not self._loaded.is_set()
+        stats['path'] = self.path
+        stats['interval_seconds'] = self.interval
+        return stats
@@ -0,0 +1,186 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from app.core.cache.memory_cache import CacheEntry, payload_hash
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    fresh_until REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_entries_expires_at ON cache_entries (expires_at);
+CREATE INDEX IF NOT EXISTS cache_entries_accessed_at ON cache_entries (accessed_at);
+"""
+
+
+class SqliteCache:
+    TOUCH_INTERVAL = 30
+
+    def __init__(self, path, max_entries=None, max_bytes=None, clock=time.time, busy_timeout=5.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.busy_timeout = busy_timeout
+        self._clock = clock
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or getattr(self._local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @contextmanager
+    def _transaction(self, connection):
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def configure(self, max_entries=None, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        connection = self._connection()
+        with self._transaction(connection):
+            self._enforce_budget(connection)
+
+    def get(self, key):
+        entry = self._lookup(key, allow_stale=False)
+        return entry.value if entry is not None else None
+
+    def get_entry(self, key):
+        return self._lookup(key, allow_stale=True)
+
+    def _lookup(self, key, allow_stale):
+        connection = self._connection()
+        row = connection.execute(
+            'SELECT value, fresh_until, expires_at, accessed_at FROM cache_entries WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            self._count('misses')
+            return None
+        value, fresh_until, expires_at, accessed_at = row
+        now = self._clock()
+        if now >= expires_at:
+            connection.execute('DELETE FROM cache_entries WHERE key = ? AND expires_at <= ?', (key, now))
+            self._count('expirations')
+            self._count('misses')
+            return None
+        if now - accessed_at > self.TOUCH_INTERVAL:
+            connection.execute('UPDATE cache_entries SET accessed_at = ? WHERE key = ?', (now, key))
+        if now < fresh_until:
+            self._count('hits')
+            return CacheEntry(json.loads(value), True, fresh_until - now, payload_hash(value))
+        if not allow_stale:
+            self._count('misses')
+            return None
+        self._count('stale_hits')
+        return CacheEntry(json.loads(value), False, 0, payload_hash(value))
+
+    def fresh_ttl(self, key):
+        row = self._connection().execute(
+            'SELECT fresh_until, expires_at FROM cache_entries WHERE key = ?', (key,)
+        ).fetchone()
+        now = self._clock()
+        if row is None or now >= row[1]:
+            return None
+        return row[0] - now
+
+    def set(self, key, value, timeout=300, stale_timeout=0):
+        payload = json.dumps(value, separators=(',', ':'), default=str)
+        size = len(payload)
+        connection = self._connection()
+        if self.max_bytes is not None and size > self.max_bytes:
+            connection.execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+            return False
+        now = self._clock()
+        fresh_until = now + timeout
+        with self._transaction(connection):
+            connection.execute(
+                'INSERT OR REPLACE INTO cache_entries (key, value, fresh_until, expires_at, size, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, payload, fresh_until, fresh_until + stale_timeout, size, now)
+            )
+            self._enforce_budget(connection)
+        return True
+
+    def delete(self, key):
+        return self._connection().execute('DELETE FROM cache_entries WHERE key = ?', (key,)).rowcount > 0
+
+    def clear_expired(self):
+        removed = self._connection().execute(
+            'DELETE FROM cache_entries WHERE expires_at <= ?', (self._clock(),)
+        ).rowcount
+        self._count('expirations', removed)
+        return removed
+
+    def clear(self):
+        return self._connection().execute('DELETE FROM cache_entries').rowcount
+
+    def _enforce_budget(self, connection):
+        if self.max_entries is None and self.max_bytes is None:
+            return
+        entries, total_bytes = connection.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries'
+        ).fetchone()
+        evicted = 0
+        if self.max_entries is not None and entries > self.max_entries:
+            evicted += connection.execute(
+                'DELETE FROM cache_entries WHERE key IN '
+                '(SELECT key FROM cache_entries ORDER BY accessed_at LIMIT ?)', (entries - self.max_entries,)
+            ).rowcount
+            total_bytes = connection.execute('SELECT COALESCE(SUM(size), 0) FROM cache_entries').fetchone()[0]
+        while self.max_bytes is not None and total_bytes > self.max_bytes:
+            row = connection.execute(
+                'SELECT key, size FROM cache_entries ORDER BY accessed_at LIMIT 1'
+            ).fetchone()
+            if row is None:
+                break
+            connection.execute('DELETE FROM cache_entries WHERE key = ?', (row[0],))
+            total_bytes -= row[1]
+            evicted += 1
+        if evicted:
+            self._count('evictions', evicted)
+
+    def get_stats(self):
+        entries, total_bytes = self._connection().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries'
+        ).fetchone()
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats.update({
+            'entries': entries,
+            'bytes': total_bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'backend': 'sqlite',
+            'path': self.path
+        })
+        return stats
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
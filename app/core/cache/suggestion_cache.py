@@ -0,0 +1,55 @@
+import threading
+from collections import defaultdict, namedtuple
+
+from app.core.cache.memory_cache import InMemoryCache
+from app.utils.geo import normalize_name
+
+CandidateSet = namedtuple('CandidateSet', ['candidates', 'complete'])
+
+
+class SuggestionCache:
+    def __init__(self, max_entries=5000, timeout=86400, min_prefix=2):
+        self._cache = InMemoryCache(max_entries=max_entries)
+        self.timeout = timeout
+        self.min_prefix = min_prefix
+        self._lock = threading.Lock()
+        self._counts = defaultdict(lambda: {'hits': 0, 'derived': 0, 'misses': 0})
+
+    def lookup(self, query):
+        prefix = normalize_name(query)
+        cached = self._cache.get(prefix)
+        if cached is not None:
+            self._count(prefix, 'hits')
+            return cached.candidates
+        for length in range(len(prefix) - 1, self.min_prefix - 1, -1):
+            parent = self._cache.get(prefix[:length])
+            if parent is None or not parent.complete:
+                continue
+            candidates = [candidate for candidate in parent.candidates
+                          if normalize_name(candidate.get('name', '')).startswith(prefix)]
+            if not candidates:
+                break
+            self._cache.set(prefix, CandidateSet(candidates, True), self.timeout)
+            self._count(prefix, 'derived')
+            return candidates
+        self._count(prefix, 'misses')
+        return None
+
+    def store(self, query, candidates, complete):
+        self._cache.set(normalize_name(query), CandidateSet(list(candidates), complete), self.timeout)
+
+    def clear(self):
+        return self._cache.clear()
+
+    def get_stats(self):
+        with self._lock:
+            by_length = {}
+            for length, counts in sorted(self._counts.items()):
+                total = counts['hits'] + counts['derived'] + counts['misses']
+                by_length[str(length)] = dict(counts, hit_rate=round((counts['hits'] + counts['derived']) / total, 4))
+        stats = self._cache.get_stats()
+        return {'entries': stats['entries'], 'evictions': stats['evictions'], 'by_prefix_length': by_length}
+
+    def _count(self, prefix, outcome):
+        with self._lock:
+            self._counts[len(prefix)][outcome] += 1
@@ -0,0 +1,31 @@
+import random
+import threading
+
+
+class TTLPolicy:
+    def __init__(self, timeouts=None, jitter=0.0, rng=random.random):
+        self._lock = threading.Lock()
+        self._timeouts = dict(timeouts or {})
+        self.jitter = jitter
+        self._rng = rng
+
+    def configure(self, timeouts, jitter=0.0):
+        with self._lock:
+            self._timeouts = dict(timeouts)
+            self.jitter = jitter
+
+    def timeouts(self, data_type):
+        with self._lock:
+            timeout, stale_timeout = self._timeouts.get(data_type, (300, 0))
+            jitter = self.jitter
+        if jitter:
+            timeout = timeout * (1 - jitter * self._rng())
+        return max(1, int(timeout)), stale_timeout
+
+
+ttl_policy = TTLPolicy({
+    'weather': (300, 1800),
+    'forecast': (1800, 3600),
+    'reverse_geocode': (86400, 0),
+    'negative': (60, 0)
+})
@@ -0,0 +1,171 @@
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def favorite_key(city, country):
+    return city.strip().lower(), country.strip().lower()
+
+
+class FavoritesStore:
+    def __init__(self, path=None, compact_min_records=1000):
+        self._lock = threading.RLock()
+        self._users = {}
+        self.path = None
+        self.compact_min_records = compact_min_records
+        self._records = 0
+        self._live = 0
+        self._offset = 0
+        self._inode = None
+        self._compactions = 0
+        if path:
+            self.configure(path, compact_min_records)
+
+    def configure(self, path=None, compact_min_records=1000):
+        with self._lock:
+            self.path = path
+            self.compact_min_records = compact_min_records
+            self._reset()
+            if path:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                with self._file_lock(exclusive=False):
+                    self._sync()
+
+    def _reset(self):
+        self._users = {}
+        self._records = 0
+        self._live = 0
+        self._offset = 0
+        self._inode = None
+
+    @contextmanager
+    def _file_lock(self, exclusive):
+        if self.path is None or fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _sync(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            if self._inode is not None:
+                self._reset()
+            return
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            self._reset()
+            self._inode = stat.st_ino
+        if stat.st_size == self._offset:
+            return
+        with open(self.path, 'rb') as source:
+            source.seek(self._offset)
+            for line in source:
+                if not line.endswith(b'\n'):
+                    break
+                self._offset += len(line)
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError, TypeError) as error:
+                    logger.warning(f"Skipping bad favorites log record: {error}")
+
+    def _apply(self, record):
+        self._records += 1
+        user_favorites = self._users.setdefault(record['user'], {})
+        key = favorite_key(record['city'], record['country'])
+        if record['op'] == 'add':
+            if key not in user_favorites:
+                user_favorites[key] = {'city': record['city'], 'country': record['country'],
+                                       'added_at': record['added_at']}
+                self._live += 1
+        elif record['op'] == 'remove':
+            if user_favorites.pop(key, None) is not None:
+                self._live -= 1
+            if not user_favorites:
+                del self._users[record['user']]
+
+    def _write(self, record):
+        if self.path is None:
+            self._apply(record)
+            return
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+        with open(self.path, 'ab') as target:
+            if target.tell() > self._offset:
+                logger.warning("Dropping partial favorites log record left by an interrupted writer")
+                target.truncate(self._offset)
+            target.write(line.encode('utf-8'))
+        self._sync()
+
+    def _maybe_compact(self):
+        if self.path is not None and self._records > max(self.compact_min_records, 2 * self._live):
+            self._compact()
+
+    def _compact(self):
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        records = 0
+        with open(temp_path, 'w', encoding='utf-8') as target:
+            for user_ip, user_favorites in self._users.items():
+                for favorite in user_favorites.values():
+                    record = dict(favorite, op='add', user=user_ip)
+                    target.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+                    records += 1
+            target.flush()
+            os.fsync(target.fileno())
+        os.replace(temp_path, self.path)
+        stat = os.stat(self.path)
+        self._inode = stat.st_ino
+        self._offset = stat.st_size
+        self._records = records
+        self._compactions += 1
+
+    def get_user_favorites(self, user_ip):
+        with self._lock, self._file_lock(exclusive=False):
+            if self.path is not None:
+                self._sync()
+            return list(self._users.get(user_ip, {}).values())
+
+    def add_favorite(self, user_ip, city, country):
+        with self._lock, self._file_lock(exclusive=True):
+            if self.path is not None:
+                self._sync()
+            if favorite_key(city, country) in self._users.get(user_ip, {}):
+                return False
+            self._write({'op': 'add', 'user': user_ip, 'city': city, 'country': country,
+                         'added_at': datetime.now(timezone.utc).isoformat()})
+            self._maybe_compact()
+            return True
+
+    def remove_favorite(self, user_ip, city, country):
+        with self._lock, self._file_lock(exclusive=True):
+            if self.path is not None:
+                self._sync()
+            if favorite_key(city, country) not in self._users.get(user_ip, {}):
+                return False
+            self._write({'op': 'remove', 'user': user_ip, 'city': city, 'country': country})
+            self._maybe_compact()
+            return True
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'users': len(self._users),
+                'favorites': self._live,
+                'log_records': self._records,
+                'log_bytes': self._offset,
+                'compactions': self._compactions,
+                'path': self.path
+            }
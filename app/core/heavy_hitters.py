@@ -0,0 +1,104 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class SpaceSaving:
+    RESCALE_WEIGHT = 2.0 ** 64
+
+    def __init__(self, capacity=1000, half_life=None, clock=time.time):
+        self.capacity = capacity
+        self.half_life = half_life
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._heap = []
+        self._seq = itertools.count()
+        self._landmark = clock()
+        self._total = 0.0
+        self._evictions = 0
+
+    def configure(self, capacity=1000, half_life=None):
+        with self._lock:
+            self.capacity = capacity
+            self.half_life = half_life
+            while len(self._counts) > capacity:
+                self._evict_min()
+
+    def _weight(self, now):
+        if not self.half_life:
+            return 1.0
+        return 2.0 ** ((now - self._landmark) / self.half_life)
+
+    def _push(self, key):
+        heapq.heappush(self._heap, (self._counts[key][0], next(self._seq), key))
+        if len(self._heap) > 4 * max(self.capacity, 16):
+            self._heap = [(count, next(self._seq), key) for key, (count, _) in self._counts.items()]
+            heapq.heapify(self._heap)
+
+    def _evict_min(self):
+        while True:
+            count, _, key = heapq.heappop(self._heap)
+            current = self._counts.get(key)
+            if current is not None and current[0] == count:
+                del self._counts[key]
+                self._evictions += 1
+                return count
+
+    def _rescale(self, now, weight):
+        for counter in self._counts.values():
+            counter[0] /= weight
+            counter[1] /= weight
+        self._total /= weight
+        self._landmark = now
+        self._heap = [(count, next(self._seq), key) for key, (count, _) in self._counts.items()]
+        heapq.heapify(self._heap)
+
+    def offer(self, key, amount=1):
+        with self._lock:
+            now = self._clock()
+            weight = self._weight(now)
+            if weight > self.RESCALE_WEIGHT:
+                self._rescale(now, weight)
+                weight = 1.0
+            increment = amount * weight
+            self._total += increment
+            counter = self._counts.get(key)
+            if counter is not None:
+                counter[0] += increment
+            elif len(self._counts) < self.capacity:
+                self._counts[key] = [increment, 0.0]
+            else:
+                floor = self._evict_min()
+                self._counts[key] = [floor + increment, floor]
+            self._push(key)
+
+    def top(self, limit=10):
+        with self._lock:
+            weight = self._weight(self._clock())
+            entries = heapq.nlargest(limit, self._counts.items(), key=lambda item: item[1][0])
+            return [(key, count / weight, error / weight) for key, (count, error) in entries]
+
+    def get_stats(self):
+        with self._lock:
+            weight = self._weight(self._clock())
+            return {
+                'tracked': len(self._counts),
+                'capacity': self.capacity,
+                'half_life_seconds': self.half_life,
+                'total': round(self._total / weight, 2),
+                'max_error': round(self._total / weight / self.capacity, 2) if self.capacity else 0.0,
+                'evictions': self._evictions
+            }
+
+    def __len__(self):
+        return len(self._counts)
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+            self._heap.clear()
+            self._landmark = self._clock()
+            self._total = 0.0
+            self._evictions = 0
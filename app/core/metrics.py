@@ -0,0 +1,145 @@
+import math
+import threading
+import time
+from collections import deque
+
+ANALYTICS_WINDOWS = {
+    '1m': 60,
+    '5m': 300,
+    '15m': 900,
+    '1h': 3600,
+    '6h': 21600,
+    '24h': 86400
+}
+
+
+class LatencyHistogram:
+    __slots__ = ('buckets', 'count', 'total', 'max')
+
+    GROWTH = 1.05
+    MIN_VALUE = 0.1
+    _LOG_GROWTH = math.log(GROWTH)
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value):
+        index = 0
+        if value > self.MIN_VALUE:
+            index = math.ceil(math.log(value / self.MIN_VALUE) / self._LOG_GROWTH)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, fraction):
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * fraction))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.MIN_VALUE * self.GROWTH ** index, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'avg_ms': round(self.total / self.count, 2) if self.count else 0.0,
+            'p50_ms': round(self.percentile(0.5), 2),
+            'p95_ms': round(self.percentile(0.95), 2),
+            'p99_ms': round(self.percentile(0.99), 2),
+            'max_ms': round(self.max, 2)
+        }
+
+
+class LatencyRollups:
+    def __init__(self, minute_buckets=60, hour_buckets=24, clock=time.time):
+        self.minute_buckets = minute_buckets
+        self.hour_buckets = hour_buckets
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._minutes = deque()
+        self._hours = deque()
+        self._lifetime = {}
+
+    def record(self, endpoint, value):
+        with self._lock:
+            minute = int(self._clock() // 60) * 60
+            self._roll(minute)
+            if not self._minutes or self._minutes[-1][0] != minute:
+                self._minutes.append((minute, {}))
+            self._histogram(self._minutes[-1][1], endpoint).record(value)
+            self._histogram(self._lifetime, endpoint).record(value)
+
+    def _histogram(self, histograms, endpoint):
+        histogram = histograms.get(endpoint)
+        if histogram is None:
+            histogram = histograms[endpoint] = LatencyHistogram()
+        return histogram
+
+    def _roll(self, minute):
+        while self._minutes and self._minutes[0][0] <= minute - self.minute_buckets * 60:
+            started, histograms = self._minutes.popleft()
+            hour = started // 3600 * 3600
+            if not self._hours or self._hours[-1][0] != hour:
+                self._hours.append((hour, {}))
+            for endpoint, histogram in histograms.items():
+                self._histogram(self._hours[-1][1], endpoint).merge(histogram)
+        while self._hours and self._hours[0][0] <= minute - self.hour_buckets * 3600:
+            self._hours.popleft()
+
+    def summary(self, window=None):
+        with self._lock:
+            if window is None:
+                sources = [(None, None, self._lifetime)]
+            else:
+                now = self._clock()
+                minute = int(now // 60) * 60
+                self._roll(minute)
+                sources = []
+                if window > self.minute_buckets * 60:
+                    rolled_until = minute - (self.minute_buckets - 1) * 60
+                    sources = [(started, 3600, histograms) for started, histograms in self._hours
+                               if min(started + 3600, rolled_until) > now - window]
+                sources += [(started, 60, histograms) for started, histograms in self._minutes
+                            if started + 60 > now - window]
+            overall = LatencyHistogram()
+            endpoints = {}
+            buckets = []
+            for histograms in (source[-1] for source in sources):
+                bucket = LatencyHistogram()
+                for endpoint, histogram in histograms.items():
+                    self._histogram(endpoints, endpoint).merge(histogram)
+                    bucket.merge(histogram)
+                overall.merge(bucket)
+                buckets.append(bucket)
+            summary = {
+                'window_seconds': window,
+                'overall': overall.summary(),
+                'endpoints': {endpoint: histogram.summary() for endpoint, histogram in sorted(endpoints.items())}
+            }
+            if window is not None:
+                summary['buckets'] = [
+                    dict(bucket.summary(), start=int(started), resolution_seconds=resolution)
+                    for (started, resolution, _), bucket in zip(sources, buckets)
+                ]
+            return summary
+
+    def clear(self):
+        with self._lock:
+            self._minutes.clear()
+            self._hours.clear()
+            self._lifetime.clear()
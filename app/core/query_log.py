@@ -0,0 +1,122 @@
+import math
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime, timezone
+
+
+class StringTable:
+    def __init__(self):
+        self._ids = {}
+        self._values = []
+        self._refs = []
+        self._free = []
+
+    def acquire(self, value):
+        string_id = self._ids.get(value)
+        if string_id is None:
+            if self._free:
+                string_id = self._free.pop()
+                self._values[string_id] = value
+                self._refs[string_id] = 0
+            else:
+                string_id = len(self._values)
+                self._values.append(value)
+                self._refs.append(0)
+            self._ids[value] = string_id
+        self._refs[string_id] += 1
+        return string_id
+
+    def release(self, string_id):
+        self._refs[string_id] -= 1
+        if self._refs[string_id] == 0:
+            del self._ids[self._values[string_id]]
+            self._values[string_id] = None
+            self._free.append(string_id)
+
+    def value(self, string_id):
+        return self._values[string_id]
+
+    def __len__(self):
+        return len(self._ids)
+
+
+class QueryLog:
+    COLUMNS = ('city', 'country', 'user_ip', 'endpoint')
+
+    def __init__(self, capacity=100000):
+        self.capacity = capacity
+        self._timestamps = array('d', [0.0]) * capacity
+        self._latencies = array('d', [0.0]) * capacity
+        self._ids = {column: array('i', [0]) * capacity for column in self.COLUMNS}
+        self._tables = {column: StringTable() for column in self.COLUMNS}
+        self._next = 0
+        self._size = 0
+
+    def append(self, city, country, user_ip, response_time, endpoint, timestamp=None):
+        position = self._next
+        if self._size == self.capacity:
+            for column in self.COLUMNS:
+                self._tables[column].release(self._ids[column][position])
+        else:
+            self._size += 1
+        self._timestamps[position] = time.time() if timestamp is None else timestamp
+        self._latencies[position] = math.nan if response_time is None else response_time
+        for column, value in zip(self.COLUMNS, (city, country, user_ip, endpoint)):
+            self._ids[column][position] = self._tables[column].acquire(value)
+        self._next = (position + 1) % self.capacity
+
+    def _position(self, offset):
+        return (self._next - 1 - offset) % self.capacity
+
+    def latency(self, offset=0):
+        if offset >= self._size:
+            return None
+        value = self._latencies[self._position(offset)]
+        return None if math.isnan(value) else value
+
+    def entries(self):
+        for offset in range(self._size - 1, -1, -1):
+            position = self._position(offset)
+            entry = {column: self._tables[column].value(self._ids[column][position]) for column in self.COLUMNS}
+            entry['response_time_ms'] = self.latency(offset)
+            entry['timestamp'] = datetime.fromtimestamp(self._timestamps[position], timezone.utc)
+            yield entry
+
+    def _segments(self):
+        if self._size < self.capacity:
+            return [(0, self._size)]
+        return [(self._next, self.capacity), (0, self._next)]
+
+    def summarize(self, since=None):
+        endpoint_counts = Counter()
+        count = 0
+        timed = []
+        for start, end in self._segments():
+            if since is not None:
+                start = bisect_left(self._timestamps, since, start, end)
+            count += end - start
+            endpoint_counts.update(self._ids['endpoint'][start:end])
+            timed.extend(latency for latency in self._latencies[start:end] if latency == latency and latency)
+        endpoint_table = self._tables['endpoint']
+        return {
+            'queries': count,
+            'avg_response_time': math.fsum(timed) / len(timed) if timed else 0,
+            'endpoints': {endpoint_table.value(endpoint_id): total for endpoint_id, total in endpoint_counts.items()}
+        }
+
+    def approx_bytes(self):
+        column_bytes = sum(column.itemsize * len(column) for column in self._ids.values())
+        return self._timestamps.itemsize * self.capacity * 2 + column_bytes
+
+    def get_stats(self):
+        return {
+            'entries': self._size,
+            'capacity': self.capacity,
+            'approx_bytes': self.approx_bytes(),
+            'interned': {column: len(table) for column, table in self._tables.items()}
+        }
+
+    def __len__(self):
+        return self._size
@@ -0,0 +1,49 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundRefresher:
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='cache-refresh')
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._stats = {'scheduled': 0, 'deduplicated': 0, 'failed': 0}
+
+    def submit(self, key: Hashable, fn: Callable[[], object]) -> bool:
+        with self._lock:
+            if key in self._pending:
+                self._stats['deduplicated'] += 1
+                return False
+            self._pending.add(key)
+            self._stats['scheduled'] += 1
+        try:
+            self._executor.submit(self._run, key, fn)
+        except RuntimeError:
+            with self._lock:
+                self._pending.discard(key)
+            return False
+        return True
+
+    def _run(self, key: Hashable, fn: Callable[[], object]) -> None:
+        try:
+            fn()
+        except Exception as error:
+            logger.error(f"Background refresh failed for {key}: {error}")
+            with self._lock:
+                self._stats['failed'] += 1
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+            return stats
+
+
+background_refresher = BackgroundRefresher()
@@ -1,3 +1,3 @@
-from app.models.domain import WeatherData
+from app.models.domain import UpstreamLookup, WeatherData
 
-__all__ = ["WeatherData"]
+__all__ = ["UpstreamLookup", "WeatherData"]
@@ -13,3 +13,11 @@ class WeatherData:
     wind_speed: float
     timestamp: datetime
     icon: str
+
+
+@dataclass(frozen=True)
+class UpstreamLookup:
+    cache_key: str
+    url: str
+    data_type: str
+    groupable: bool = False
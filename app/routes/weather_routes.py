@@ -1,10 +1,17 @@
+import json
 import logging
 from datetime import datetime, timezone
-from flask import Blueprint, jsonify, render_template, request
-from app.services.weather.service import DatabaseCache, FavoritesService, WeatherAnalytics
-from app.utils.cache_keys import make_cache_key
+from flask import Blueprint, current_app, jsonify, render_template, request
+from app.core.cache import content_hash, render_cache
+from app.core.metrics import ANALYTICS_WINDOWS
+from app.services.weather.lookups import city_lookup, coords_lookup
+from app.services.weather.service import DatabaseCache, FavoritesService, UpstreamCoalescer, WeatherAnalytics
+from app.utils.cache_keys import normalize_unit
+from app.utils.geo import quantize_coordinates
+from app.utils.projection import apply_projection, parse_projection, projection_tag
 from app.utils.request_metadata import get_user_ip
 from app.utils.timing import calculate_response_time
+from app.utils.units import convert_units
 from app.utils.validation import validate_city_name, validate_coordinates
 
 bp = Blueprint("main", __name__)
@@ -18,6 +25,54 @@ def init_app_dependencies(created_weather_service, flask_cache, app_logger):
     cache = flask_cache
     logger = app_logger
 
+def make_loader(lookup):
+    def load():
+        data = weather_service.fetch_lookup(lookup)
+        if DatabaseCache.store_result(lookup, data):
+            logger.info(f"Cached upstream data for {lookup.cache_key}")
+        return data
+    return load
+
+def get_cached(cache_key, loader):
+    entry = DatabaseCache.get_entry(cache_key)
+    if entry is None:
+        return None
+    if not entry.fresh:
+        UpstreamCoalescer.schedule_refresh(cache_key, loader)
+    else:
+        prewarmer = current_app.extensions.get('cache_prewarmer')
+        if prewarmer is not None:
+            prewarmer.record_hit(cache_key)
+    return entry
+
+def response_tag(data, unit, etag=None, projection=None):
+    tag = f"{etag or content_hash(data)}-{unit}"
+    return tag if projection is None else f"{tag}-{projection_tag(projection)}"
+
+def render_projection(tag, data, unit, projection, timeout):
+    body = render_cache.get(tag)
+    if body is None:
+        projected = apply_projection(convert_units(data, unit), projection)
+        body = json.dumps(projected, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        render_cache.set(tag, body, timeout=timeout, size=len(body))
+    return body
+
+def weather_response(data, unit, etag=None, max_age=0, projection=None):
+    if 'error' in data:
+        return jsonify(convert_units(data, unit))
+    tag = response_tag(data, unit, etag, projection)
+    if request.if_none_match.contains(tag):
+        response = current_app.response_class(status=304)
+    elif projection is not None:
+        body = render_projection(tag, data, unit, projection, current_app.config['RENDER_CACHE_TIMEOUT'])
+        response = current_app.response_class(body, mimetype='application/json')
+    else:
+        response = jsonify(convert_units(data, unit))
+    response.set_etag(tag)
+    response.cache_control.public = True
+    response.cache_control.max_age = max(int(max_age or 0), 0)
+    return response
+
 @bp.route('/')
 def home():
     return render_template('index.html')
@@ -27,73 +82,130 @@ def get_weather():
     start_time = datetime.now(timezone.utc)
     city = request.args.get('city', '').strip()
     country = request.args.get('country', 'NO').strip()
-    unit = request.args.get('unit', 'metric')
+    unit = normalize_unit(request.args.get('unit'))
     if not city:
         return jsonify({'error': 'By-parameter er påkrevd'}), 400
     valid_city, city_error = validate_city_name(city)
     if not valid_city:
         return jsonify({'error': city_error}), 400
-    cache_key = make_cache_key(city=city, country=country)
-    cached_data = DatabaseCache.get(cache_key)
-    if cached_data:
+    projection, projection_error = parse_projection(request.args.get('fields'), request.args.get('format'))
+    if projection_error:
+        return jsonify({'error': projection_error}), 400
+    lookup = city_lookup(weather_service, city, country)
+    loader = make_loader(lookup)
+    entry = get_cached(lookup.cache_key, loader)
+    if entry is not None:
         logger.info(f"Cache hit for {city}, {country}")
-        return jsonify(cached_data)
-    url = f'{weather_service.base_url}weather?q={city},{country}&units={unit}&appid={weather_service.api_key}'
-    data = weather_service.fetch_weather_data(url)
+        return weather_response(entry.value, unit, entry.etag, entry.ttl, projection)
+    data = UpstreamCoalescer.fetch(lookup.cache_key, loader)
     response_time = calculate_response_time(start_time)
     WeatherAnalytics.log_query(city, country, get_user_ip(), response_time, 'weather')
-    if 'error' not in data:
-        DatabaseCache.set(cache_key, data)
-        logger.info(f"Cached weather data for {city}, {country}")
-    return jsonify(data)
+    return weather_response(data, unit, max_age=DatabaseCache.get_fresh_ttl(lookup.cache_key), projection=projection)
 
 @bp.route('/weather_by_coords', methods=['GET'])
 def get_weather_by_coords():
     start_time = datetime.now(timezone.utc)
     lat = request.args.get('lat', '').strip()
     lon = request.args.get('lon', '').strip()
-    unit = request.args.get('unit', 'metric')
+    unit = normalize_unit(request.args.get('unit'))
     if not lat or not lon:
         return jsonify({'error': 'Breddegrad og lengdegrad parametere er påkrevd'}), 400
     valid_coords, coords_error = validate_coordinates(lat, lon)
     if not valid_coords:
         return jsonify({'error': coords_error}), 400
-    cache_key = make_cache_key(lat=lat, lon=lon)
-    cached_data = DatabaseCache.get(cache_key)
-    if cached_data:
-        return jsonify(cached_data)
-    url = f'{weather_service.base_url}weather?lat={lat}&lon={lon}&units={unit}&appid={weather_service.api_key}'
-    data = weather_service.fetch_weather_data(url)
+    projection, projection_error = parse_projection(request.args.get('fields'), request.args.get('format'))
+    if projection_error:
+        return jsonify({'error': projection_error}), 400
+    lookup = coords_lookup(weather_service, lat, lon, current_app.config['COORDS_CACHE_PRECISION'])
+    DatabaseCache.track_coordinates('weather', lat, lon, DatabaseCache.get_timeouts('weather')[0])
+    loader = make_loader(lookup)
+    entry = get_cached(lookup.cache_key, loader)
+    if entry is not None:
+        return weather_response(entry.value, unit, entry.etag, entry.ttl, projection)
+    data = UpstreamCoalescer.fetch(lookup.cache_key, loader)
     response_time = calculate_response_time(start_time)
     city_name = data.get('name', 'Unknown') if 'error' not in data else 'Unknown'
     country_code = data.get('sys', {}).get('country', 'Unknown') if 'error' not in data else 'Unknown'
     WeatherAnalytics.log_query(city_name, country_code, get_user_ip(), response_time, 'coords')
-    if 'error' not in data:
-        DatabaseCache.set(cache_key, data)
-    return jsonify(data)
+    return weather_response(data, unit, max_age=DatabaseCache.get_fresh_ttl(lookup.cache_key), projection=projection)
+
+def batch_lookup(item):
+    if not isinstance(item, dict):
+        return None, 'Ugyldig sted'
+    if 'lat' in item or 'lon' in item:
+        lat, lon = str(item.get('lat', '')).strip(), str(item.get('lon', '')).strip()
+        valid_coords, coords_error = validate_coordinates(lat, lon)
+        if not valid_coords:
+            return None, coords_error
+        return coords_lookup(weather_service, lat, lon, current_app.config['COORDS_CACHE_PRECISION']), None
+    city = item.get('city')
+    country = item.get('country') or 'NO'
+    if not isinstance(city, str) or not isinstance(country, str):
+        return None, 'Ugyldig sted'
+    city, country = city.strip(), country.strip()
+    valid_city, city_error = validate_city_name(city)
+    if not valid_city:
+        return None, city_error
+    return city_lookup(weather_service, city, country), None
+
+@bp.route('/weather/batch', methods=['POST'])
+def get_weather_batch():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Liste med byer eller koordinater er påkrevd'}), 400
+    items = data.get('items')
+    unit = normalize_unit(data.get('unit'))
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'Liste med byer eller koordinater er påkrevd'}), 400
+    max_items = current_app.config['WEATHER_BATCH_MAX_ITEMS']
+    if len(items) > max_items:
+        return jsonify({'error': f'Maks {max_items} steder per forespørsel'}), 400
+    lookups = [batch_lookup(item) for item in items]
+    found = {}
+    loaders = {}
+    for lookup, _ in lookups:
+        if lookup is None or lookup.cache_key in found or lookup.cache_key in loaders:
+            continue
+        loader = make_loader(lookup)
+        entry = get_cached(lookup.cache_key, loader)
+        if entry is not None:
+            found[lookup.cache_key] = entry.value
+        else:
+            loaders[lookup.cache_key] = loader
+    cached_count = len(found)
+    found.update(UpstreamCoalescer.fetch_many(loaders))
+    results = []
+    for item, (lookup, error) in zip(items, lookups):
+        result = found[lookup.cache_key] if lookup is not None else {'error': error}
+        if 'error' in result:
+            results.append({'query': item, 'error': result['error']})
+        else:
+            results.append({'query': item, 'data': convert_units(result, unit)})
+    return jsonify({'results': results, 'cached': cached_count, 'fetched': len(loaders)})
 
 @bp.route('/forecast', methods=['GET'])
 def get_forecast():
     start_time = datetime.now(timezone.utc)
     city = request.args.get('city', '').strip()
     country = request.args.get('country', 'NO').strip()
-    unit = request.args.get('unit', 'metric')
+    unit = normalize_unit(request.args.get('unit'))
     if not city:
         return jsonify({'error': 'By-parameter er påkrevd'}), 400
     valid_city, city_error = validate_city_name(city)
     if not valid_city:
         return jsonify({'error': city_error}), 400
-    cache_key = f"forecast:{city.lower()}:{country.lower()}:{datetime.now().hour}"
-    cached_data = DatabaseCache.get(cache_key)
-    if cached_data:
-        return jsonify(cached_data)
-    url = f'{weather_service.base_url}forecast?q={city},{country}&units={unit}&appid={weather_service.api_key}'
-    data = weather_service.fetch_weather_data(url)
+    projection, projection_error = parse_projection(request.args.get('fields'), request.args.get('format'))
+    if projection_error:
+        return jsonify({'error': projection_error}), 400
+    lookup = city_lookup(weather_service, city, country, data_type='forecast')
+    loader = make_loader(lookup)
+    entry = get_cached(lookup.cache_key, loader)
+    if entry is not None:
+        return weather_response(entry.value, unit, entry.etag, entry.ttl, projection)
+    data = UpstreamCoalescer.fetch(lookup.cache_key, loader)
     response_time = calculate_response_time(start_time)
     WeatherAnalytics.log_query(city, country, get_user_ip(), response_time, 'forecast')
-    if 'error' not in data:
-        DatabaseCache.set(cache_key, data, timeout=1800)
-    return jsonify(data)
+    return weather_response(data, unit, max_age=DatabaseCache.get_fresh_ttl(lookup.cache_key), projection=projection)
 
 @bp.route('/city_suggestions', methods=['GET'])
 def get_city_suggestions():
@@ -114,14 +226,33 @@ def reverse_geocode():
     valid_coords, coords_error = validate_coordinates(lat, lon)
     if not valid_coords:
         return jsonify({'error': coords_error}), 400
-    location_data = weather_service.reverse_geocode(lat, lon)
+    cell_lat, cell_lon = quantize_coordinates(lat, lon, current_app.config['REVERSE_GEOCODE_CACHE_PRECISION'])
+    cache_key = f"reverse_geocode:{cell_lat}:{cell_lon}"
+    timeout, _ = DatabaseCache.get_timeouts('reverse_geocode')
+    DatabaseCache.track_coordinates('reverse_geocode', lat, lon, timeout)
+    cached_location = DatabaseCache.get(cache_key)
+    if cached_location:
+        return jsonify(cached_location)
+
+    def load():
+        location = weather_service.reverse_geocode(lat, lon)
+        if 'error' not in location:
+            DatabaseCache.set(cache_key, location, timeout=timeout)
+        return location
+
+    location_data = UpstreamCoalescer.fetch(cache_key, load)
     return jsonify(location_data)
 
 @bp.route('/analytics', methods=['GET'])
 def get_analytics():
+    window = request.args.get('window')
+    if window is not None and window not in ANALYTICS_WINDOWS:
+        return jsonify({'error': f"Ugyldig tidsvindu. Gyldige verdier: {', '.join(ANALYTICS_WINDOWS)}"}), 400
     stats = WeatherAnalytics.get_query_stats()
     popular_cities = WeatherAnalytics.get_popular_cities()
-    return jsonify({'stats': stats, 'popular_cities': popular_cities})
+    latency = WeatherAnalytics.get_latency_stats(ANALYTICS_WINDOWS.get(window))
+    queries = WeatherAnalytics.get_log_summary(ANALYTICS_WINDOWS.get(window))
+    return jsonify({'stats': stats, 'popular_cities': popular_cities, 'latency': latency, 'queries': queries})
 
 @bp.route('/popular_cities', methods=['GET'])
 def get_popular_cities():
@@ -161,6 +292,14 @@ def manage_favorites():
         return jsonify({'error': 'Favoritt ikke funnet'}), 404
     return jsonify({'error': 'Ugyldig forespørsel'}), 405
 
+def snapshot_stats():
+    snapshotter = current_app.extensions.get('cache_snapshotter')
+    return snapshotter.get_stats() if snapshotter is not None else None
+
+def prewarm_stats():
+    prewarmer = current_app.extensions.get('cache_prewarmer')
+    return prewarmer.get_stats() if prewarmer is not None else None
+
 @bp.route('/health', methods=['GET'])
 def health_check():
     expired_count = DatabaseCache.clear_expired()
@@ -169,14 +308,30 @@ def health_check():
         'timestamp': datetime.now(timezone.utc).isoformat(),
         'version': '1.2.0',
         'mode': 'in-memory',
-        'cache_cleaned': expired_count
+        'cache_cleaned': expired_count,
+        'cache': DatabaseCache.get_stats(),
+        'single_flight': UpstreamCoalescer.get_stats(),
+        'coordinate_cache': DatabaseCache.get_coordinate_stats(),
+        'upstream': weather_service.get_transport_stats(),
+        'quota': weather_service.get_quota_stats(),
+        'group_batch': weather_service.get_group_batch_stats(),
+        'circuit_breaker': weather_service.breaker.get_state(),
+        'gazetteer': weather_service.get_gazetteer_stats(),
+        'suggestion_cache': weather_service.get_suggestion_cache_stats(),
+        'reverse_geocode': weather_service.get_reverse_geocode_stats(),
+        'popular_cities': WeatherAnalytics.get_popular_stats(),
+        'favorites': FavoritesService.get_stats(),
+        'snapshot': snapshot_stats(),
+        'render_cache': render_cache.get_stats(),
+        'prewarm': prewarm_stats()
     })
 
 @bp.route('/clear_cache', methods=['POST'])
 def clear_cache():
     try:
-        from app.core.cache import weather_cache
-        cache_count = weather_cache.clear()
+        cache_count = DatabaseCache.clear()
+        cache_count += weather_service.suggestion_cache.clear()
+        cache_count += render_cache.clear()
         cache.clear()
         logger.info("Alle cacher tømt")
         return jsonify({
@@ -1,9 +1,13 @@
-from app.services.weather import DatabaseCache, FavoritesService, WeatherAPIService, WeatherAnalytics, WeatherData
+from app.services.geo import Gazetteer, rank_city_suggestions
+from app.services.weather import DatabaseCache, FavoritesService, UpstreamCoalescer, WeatherAPIService, WeatherAnalytics, WeatherData
 
 __all__ = [
     "DatabaseCache",
     "FavoritesService",
+    "Gazetteer",
+    "UpstreamCoalescer",
     "WeatherAPIService",
     "WeatherAnalytics",
     "WeatherData",
+    "rank_city_suggestions",
 ]
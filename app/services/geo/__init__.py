@@ -0,0 +1,15 @@
+from app.services.geo.gazetteer import Gazetteer, load_gazetteer
+from app.services.geo.ranking import DEFAULT_WEIGHTS, RankingWeights, rank_city_suggestions
+from app.services.geo.spatial_index import GridIndex, haversine_km
+from app.utils.geo import normalize_name
+
+__all__ = [
+    "DEFAULT_WEIGHTS",
+    "Gazetteer",
+    "GridIndex",
+    "haversine_km",
+    "load_gazetteer",
+    "normalize_name",
+    "RankingWeights",
+    "rank_city_suggestions",
+]
@@ -0,0 +1,130 @@
+import bisect
+import csv
+import heapq
+import logging
+import os
+import sys
+import time
+from array import array
+from typing import Dict, List, Optional
+
+from app.utils.geo import normalize_name
+
+logger = logging.getLogger(__name__)
+
+GEONAMES_NAME = 1
+GEONAMES_ASCII_NAME = 2
+GEONAMES_LAT = 4
+GEONAMES_LON = 5
+GEONAMES_COUNTRY = 8
+GEONAMES_ADMIN1 = 10
+GEONAMES_POPULATION = 14
+ADMIN1_FILENAME = 'admin1CodesASCII.txt'
+
+
+class Gazetteer:
+    def __init__(self):
+        self.names: List[str] = []
+        self.countries: List[str] = []
+        self.states: List[str] = []
+        self.lats = array('d')
+        self.lons = array('d')
+        self.populations = array('q')
+        self.index_keys: List[str] = []
+        self.index_ids = array('l')
+        self.stats: Dict = {'entries': 0, 'index_keys': 0, 'load_seconds': 0.0, 'approx_bytes': 0}
+
+    @classmethod
+    def load(cls, path: str, min_population: int = 0) -> 'Gazetteer':
+        started = time.perf_counter()
+        gazetteer = cls()
+        admin1_names = load_admin1_names(os.path.join(os.path.dirname(path), ADMIN1_FILENAME))
+        interned = {}
+        keys = []
+        with open(path, encoding='utf-8', newline='') as source:
+            for row in csv.reader(source, delimiter='\t', quoting=csv.QUOTE_NONE):
+                if len(row) <= GEONAMES_POPULATION:
+                    continue
+                population = int(row[GEONAMES_POPULATION] or 0)
+                if population < min_population:
+                    continue
+                record_id = len(gazetteer.names)
+                country = interned.setdefault(row[GEONAMES_COUNTRY], row[GEONAMES_COUNTRY])
+                state = admin1_names.get(f"{country}.{row[GEONAMES_ADMIN1]}", '')
+                gazetteer.names.append(row[GEONAMES_NAME])
+                gazetteer.countries.append(country)
+                gazetteer.states.append(interned.setdefault(state, state))
+                gazetteer.lats.append(float(row[GEONAMES_LAT]))
+                gazetteer.lons.append(float(row[GEONAMES_LON]))
+                gazetteer.populations.append(population)
+                for key in {normalize_name(row[GEONAMES_NAME]), normalize_name(row[GEONAMES_ASCII_NAME])}:
+                    if key:
+                        keys.append((key, record_id))
+        keys.sort()
+        gazetteer.index_keys = [key for key, _ in keys]
+        gazetteer.index_ids = array('l', (record_id for _, record_id in keys))
+        gazetteer.stats = {
+            'entries': len(gazetteer.names),
+            'index_keys': len(gazetteer.index_keys),
+            'load_seconds': round(time.perf_counter() - started, 4),
+            'approx_bytes': gazetteer.approx_bytes()
+        }
+        logger.info(f"Loaded gazetteer with {gazetteer.stats['entries']} places in {gazetteer.stats['load_seconds']}s")
+        return gazetteer
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, query: str, limit: int = 25) -> List[Dict]:
+        prefix = normalize_name(query)
+        if not prefix:
+            return []
+        start = bisect.bisect_left(self.index_keys, prefix)
+        end = bisect.bisect_left(self.index_keys, prefix + '\uffff', start)
+        record_ids = set(self.index_ids[start:end])
+        populations = self.populations
+        record_ids = heapq.nsmallest(limit, record_ids, key=lambda record_id: (-populations[record_id], record_id))
+        return [self.place(record_id) for record_id in record_ids]
+
+    def place(self, record_id: int) -> Dict:
+        return {
+            'name': self.names[record_id],
+            'country': self.countries[record_id],
+            'state': self.states[record_id],
+            'lat': self.lats[record_id],
+            'lon': self.lons[record_id],
+            'population': self.populations[record_id]
+        }
+
+    def approx_bytes(self) -> int:
+        total = sum(sys.getsizeof(column) for column in (
+            self.names, self.countries, self.states, self.lats, self.lons,
+            self.populations, self.index_keys, self.index_ids
+        ))
+        total += sum(sys.getsizeof(name) for name in self.names)
+        total += sum(sys.getsizeof(key) for key in self.index_keys)
+        return total
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats)
+
+
+def load_admin1_names(path: str) -> Dict[str, str]:
+    if not os.path.exists(path):
+        return {}
+    names = {}
+    with open(path, encoding='utf-8', newline='') as source:
+        for row in csv.reader(source, delimiter='\t', quoting=csv.QUOTE_NONE):
+            if len(row) >= 2:
+                names[row[0]] = row[1]
+    return names
+
+
+def load_gazetteer(path: Optional[str], min_population: int = 0) -> Optional[Gazetteer]:
+    if not path:
+        return None
+    try:
+        return Gazetteer.load(path, min_population=min_population)
+    except (OSError, ValueError) as error:
+        logger.error(f"Could not load gazetteer from {path}: {error}")
+        return None
@@ -0,0 +1,116 @@
+import heapq
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+
+@dataclass(frozen=True)
+class RankingWeights:
+    exact_match: float = 100
+    home_country: float = 50
+    population_divisor: float = 10000
+    population_cap: float = 20
+    short_name: float = 10
+    short_name_length: int = 8
+    home_country_code: str = 'NO'
+    per_country_limit: int = 3
+
+
+DEFAULT_WEIGHTS = RankingWeights()
+
+
+def score_suggestion(item: Dict, is_exact_match: bool, weights: RankingWeights) -> float:
+    relevance_score = 0
+    if is_exact_match:
+        relevance_score += weights.exact_match
+    if item['country'] == weights.home_country_code:
+        relevance_score += weights.home_country
+    if item.get('population'):
+        relevance_score += min(item.get('population', 0) / weights.population_divisor, weights.population_cap)
+    if len(item['name']) <= weights.short_name_length:
+        relevance_score += weights.short_name
+    return relevance_score
+
+
+def build_suggestion(item: Dict, is_exact_match: bool, relevance_score: float) -> Dict:
+    city_name = item['name']
+    country = item['country']
+    state = item.get('state', '')
+    if state and state != city_name:
+        display_name = f"{city_name}, {state}, {country}"
+    else:
+        display_name = f"{city_name}, {country}"
+    return {
+        'name': city_name,
+        'country': country,
+        'state': state,
+        'lat': item.get('lat'),
+        'lon': item.get('lon'),
+        'is_exact_match': is_exact_match,
+        'relevance_score': relevance_score,
+        'population': item.get('population', 0),
+        'display_name': display_name
+    }
+
+
+def rank_city_suggestions(data: List[Dict], query: str, limit: int = 8,
+                          weights: RankingWeights = DEFAULT_WEIGHTS) -> List[Dict]:
+    if limit <= 0:
+        return []
+    query_lower = query.lower()
+    first_by_place: Dict[str, Tuple] = {}
+    for index, item in enumerate(data):
+        city_name = item.get('name', '')
+        country = item.get('country', '')
+        if not city_name or not country:
+            continue
+        name_lower = city_name.lower()
+        is_exact_match = name_lower.startswith(query_lower)
+        order = (
+            not is_exact_match,
+            country != weights.home_country_code,
+            -(item.get('population', 0) or 0),
+            len(city_name),
+            index
+        )
+        unique_key = f"{name_lower}_{country.lower()}_{item.get('state', '').lower()}"
+        current = first_by_place.get(unique_key)
+        if current is None or order < current[0]:
+            first_by_place[unique_key] = (order, name_lower, is_exact_match, item)
+
+    first_by_country: Dict[Tuple[str, str], Tuple] = {}
+    for order, name_lower, is_exact_match, item in first_by_place.values():
+        key = (name_lower, item['country'])
+        current = first_by_country.get(key)
+        if current is None or order < current[0]:
+            first_by_country[key] = (order, is_exact_match, item)
+
+    ranked = []
+    for order, is_exact_match, item in first_by_country.values():
+        relevance_score = score_suggestion(item, is_exact_match, weights)
+        ranked.append((-relevance_score, order, is_exact_match, item))
+
+    unrestricted = limit // 2
+    selected = heapq.nsmallest(unrestricted, ranked)
+    country_count: Dict[str, int] = {}
+    for entry in selected:
+        country = entry[3]['country']
+        country_count[country] = country_count.get(country, 0) + 1
+
+    chosen = {entry[1] for entry in selected}
+    by_country: Dict[str, List[Tuple]] = {}
+    for entry in ranked:
+        if entry[1] not in chosen:
+            by_country.setdefault(entry[3]['country'], []).append(entry)
+    quota_entries = []
+    for country, entries in by_country.items():
+        remaining = weights.per_country_limit - country_count.get(country, 0)
+        if remaining > 0:
+            quota_entries.extend(heapq.nsmallest(remaining, entries))
+    quota_entries = heapq.nsmallest(limit - len(selected), quota_entries)
+    selected.extend(quota_entries)
+
+    if len(selected) < limit:
+        chosen.update(entry[1] for entry in quota_entries)
+        selected.extend(heapq.nsmallest(limit - len(selected), (entry for entry in ranked if entry[1] not in chosen)))
+    return [build_suggestion(item, is_exact_match, -negative_score)
+            for negative_score, _, is_exact_match, item in selected]
@@ -0,0 +1,78 @@
+import math
+import time
+from array import array
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.195
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GridIndex:
+    def __init__(self, lats, lons, cell_degrees: float = 0.25):
+        started = time.perf_counter()
+        self.lats = lats
+        self.lons = lons
+        self.cell_degrees = cell_degrees
+        self.lat_cells = int(math.ceil(180 / cell_degrees)) + 1
+        self.lon_cells = int(math.ceil(360 / cell_degrees))
+        buckets = defaultdict(list)
+        for record_id in range(len(lats)):
+            buckets[self._cell(lats[record_id], lons[record_id])].append(record_id)
+        self.cells: Dict[int, array] = {cell: array('l', ids) for cell, ids in buckets.items()}
+        self.stats = {
+            'places': len(lats),
+            'cells': len(self.cells),
+            'cell_degrees': cell_degrees,
+            'build_seconds': round(time.perf_counter() - started, 4)
+        }
+
+    @classmethod
+    def from_gazetteer(cls, gazetteer, cell_degrees: float = 0.25) -> 'GridIndex':
+        return cls(gazetteer.lats, gazetteer.lons, cell_degrees)
+
+    def _lat_cell(self, lat: float) -> int:
+        return int((lat + 90) // self.cell_degrees)
+
+    def _lon_cell(self, lon: float) -> int:
+        return int((lon + 180) // self.cell_degrees) % self.lon_cells
+
+    def _cell(self, lat: float, lon: float) -> int:
+        return self._lat_cell(lat) * self.lon_cells + self._lon_cell(lon)
+
+    def nearest(self, lat: float, lon: float, max_distance_km: float) -> Optional[Tuple[int, float]]:
+        cell_km = self.cell_degrees * KM_PER_DEGREE
+        lat_span = int(math.ceil(max_distance_km / cell_km))
+        poleward_lat = min(abs(lat) + (lat_span + 1) * self.cell_degrees, 89.9)
+        lon_span = int(math.ceil(max_distance_km / (cell_km * math.cos(math.radians(poleward_lat)))))
+        lon_span = min(lon_span, self.lon_cells // 2)
+        center_lat = self._lat_cell(lat)
+        center_lon = self._lon_cell(lon)
+        best = None
+        best_distance = max_distance_km
+        for lat_cell in range(max(center_lat - lat_span, 0), min(center_lat + lat_span, self.lat_cells - 1) + 1):
+            row = lat_cell * self.lon_cells
+            for offset in range(-lon_span, lon_span + 1):
+                record_ids = self.cells.get(row + (center_lon + offset) % self.lon_cells)
+                if not record_ids:
+                    continue
+                for record_id in record_ids:
+                    distance = haversine_km(lat, lon, self.lats[record_id], self.lons[record_id])
+                    if distance <= best_distance:
+                        best = record_id
+                        best_distance = distance
+        if best is None:
+            return None
+        return best, best_distance
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats)
@@ -2,6 +2,7 @@ from app.models.domain import WeatherData
 from app.services.weather.service import (
     DatabaseCache,
     FavoritesService,
+    UpstreamCoalescer,
     WeatherAPIService,
     WeatherAnalytics,
 )
@@ -9,6 +10,7 @@ from app.services.weather.service import (
 __all__ = [
     "DatabaseCache",
     "FavoritesService",
+    "UpstreamCoalescer",
     "WeatherAPIService",
     "WeatherAnalytics",
     "WeatherData",
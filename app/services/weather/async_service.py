@@ -0,0 +1,93 @@
+import asyncio
+import json
+import logging
+from typing import Dict, Optional
+
+from app.services.weather.circuit_breaker import CircuitBreaker
+from app.services.weather.quota import UpstreamQuota
+from app.services.weather.service import (
+    CONNECTION_ERROR,
+    INVALID_RESPONSE_ERROR,
+    QUOTA_ERROR,
+    REQUEST_ERROR,
+    TIMEOUT_ERROR,
+    UNAVAILABLE_ERROR,
+    UNEXPECTED_ERROR,
+    api_error_for_payload,
+    api_error_for_status,
+    is_upstream_failure,
+)
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency for the ASGI serving mode
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+class AsyncWeatherAPIService:
+    def __init__(self, api_key: str, base_url: str, timeout: float = 10, connect_timeout: float = 3.05,
+                 max_connections: int = 200, breaker: Optional[CircuitBreaker] = None,
+                 quota: Optional[UpstreamQuota] = None):
+        if httpx is None:
+            raise RuntimeError("httpx is required for the ASGI serving mode (pip install httpx)")
+        self.api_key = api_key
+        self.base_url = base_url
+        self.breaker = breaker or CircuitBreaker()
+        self.quota = quota
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections // 4)
+        )
+
+    async def fetch_weather_data(self, url: str) -> Dict:
+        if not self.breaker.allow_request():
+            logger.warning("Circuit breaker open, skipping weather API call")
+            return {'error': UNAVAILABLE_ERROR}
+        if not await self.acquire_quota():
+            logger.warning("Upstream quota exhausted, skipping weather API call")
+            self.breaker.release_probe()
+            return {'error': QUOTA_ERROR}
+        try:
+            response = await self.client.get(url)
+            response.raise_for_status()
+            data = response.json()
+            self.breaker.record_success()
+            return api_error_for_payload(data) or data
+        except httpx.TimeoutException:
+            logger.error("Timeout when fetching weather data")
+            self.breaker.record_failure()
+            return {'error': TIMEOUT_ERROR}
+        except httpx.NetworkError:
+            logger.error("Connection error when fetching weather data")
+            self.breaker.record_failure()
+            return {'error': CONNECTION_ERROR}
+        except httpx.HTTPStatusError as error:
+            logger.error(f"HTTP error when fetching weather data: {error}")
+            if error.response.status_code == 429 and self.quota is not None:
+                self.quota.exhaust()
+            if is_upstream_failure(error.response.status_code):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            return api_error_for_status(error.response.status_code)
+        except httpx.HTTPError as error:
+            logger.error(f"Request error when fetching weather data: {error}")
+            self.breaker.record_failure()
+            return {'error': REQUEST_ERROR}
+        except json.JSONDecodeError:
+            logger.error("Invalid JSON response from weather API")
+            self.breaker.record_failure()
+            return {'error': INVALID_RESPONSE_ERROR}
+        except Exception as error:
+            logger.error(f"Unexpected error when fetching weather data: {error}")
+            self.breaker.record_failure()
+            return {'error': UNEXPECTED_ERROR}
+
+    async def acquire_quota(self, priority: Optional[int] = None) -> bool:
+        if self.quota is None:
+            return True
+        return await asyncio.to_thread(self.quota.acquire, priority)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,109 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Group:
+    __slots__ = ('ids', 'full', 'done', 'results')
+
+    def __init__(self):
+        self.ids: List[int] = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.results: Dict[int, Dict] = {}
+
+
+class GroupBatcher:
+    def __init__(self, window: float = 0.02, max_group: int = 20, max_ids: int = 10000):
+        self.window = window
+        self.max_group = max_group
+        self.max_ids = max_ids
+        self._lock = threading.Lock()
+        self._ids: 'OrderedDict[str, int]' = OrderedDict()
+        self._open: Optional[_Group] = None
+        self._stats = {'group_calls': 0, 'grouped': 0, 'single_calls': 0, 'fallbacks': 0}
+
+    def remember(self, cache_key: str, data: Dict) -> None:
+        city_id = data.get('id') if isinstance(data, dict) and 'error' not in data else None
+        if not isinstance(city_id, int) or city_id <= 0:
+            return
+        with self._lock:
+            self._ids[cache_key] = city_id
+            self._ids.move_to_end(cache_key)
+            while len(self._ids) > self.max_ids:
+                self._ids.popitem(last=False)
+
+    def city_id(self, cache_key: str) -> Optional[int]:
+        with self._lock:
+            return self._ids.get(cache_key)
+
+    def fetch(self, cache_key: str, fetch_one: Callable[[], Dict],
+              fetch_group: Callable[[List[int]], Dict]) -> Dict:
+        group = None
+        leader = False
+        with self._lock:
+            city_id = self._ids.get(cache_key)
+            if city_id is not None and self.window > 0 and self.max_group > 1:
+                group = self._open
+                if group is None:
+                    group = _Group()
+                    self._open = group
+                    leader = True
+                if city_id not in group.ids:
+                    group.ids.append(city_id)
+                self._stats['grouped'] += 1
+                if len(group.ids) >= self.max_group:
+                    self._open = None
+                    group.full.set()
+            else:
+                self._stats['single_calls'] += 1
+        if group is None:
+            return self._fetch_single(cache_key, fetch_one)
+        if leader:
+            self._run(group, fetch_group)
+        else:
+            group.done.wait()
+        data = group.results.get(city_id)
+        if data is not None:
+            return data
+        with self._lock:
+            self._stats['fallbacks'] += 1
+            self._ids.pop(cache_key, None)
+        return self._fetch_single(cache_key, fetch_one)
+
+    def _fetch_single(self, cache_key: str, fetch_one: Callable[[], Dict]) -> Dict:
+        data = fetch_one()
+        self.remember(cache_key, data)
+        return data
+
+    def _run(self, group: _Group, fetch_group: Callable[[List[int]], Dict]) -> None:
+        try:
+            group.full.wait(self.window)
+            with self._lock:
+                if self._open is group:
+                    self._open = None
+                ids = list(group.ids)
+                self._stats['group_calls'] += 1
+            response = fetch_group(ids)
+            if 'error' in response:
+                logger.warning(f"Group call for {len(ids)} cities failed: {response['error']}")
+                return
+            for item in response.get('list', []):
+                if isinstance(item, dict) and item.get('id') in ids:
+                    group.results[item['id']] = item
+        except Exception as error:
+            logger.error(f"Unexpected error in group call: {error}")
+        finally:
+            group.done.set()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['known_ids'] = len(self._ids)
+        stats['window'] = self.window
+        stats['max_group'] = self.max_group
+        stats['calls_saved'] = max(stats['grouped'] - stats['group_calls'] - stats['fallbacks'], 0)
+        return stats
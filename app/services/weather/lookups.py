@@ -0,0 +1,17 @@
+from app.models.domain import UpstreamLookup
+from app.utils.cache_keys import make_cache_key
+from app.utils.geo import quantize_coordinates
+from app.utils.units import CANONICAL_UNIT
+
+
+def city_lookup(service, city: str, country: str, data_type: str = 'weather') -> UpstreamLookup:
+    cache_key = make_cache_key(city=city, country=country, unit=CANONICAL_UNIT, data_type=data_type)
+    url = f'{service.base_url}{data_type}?q={city},{country}&units={CANONICAL_UNIT}&appid={service.api_key}'
+    return UpstreamLookup(cache_key, url, data_type, groupable=data_type == 'weather')
+
+
+def coords_lookup(service, lat: str, lon: str, precision: int) -> UpstreamLookup:
+    cell_lat, cell_lon = quantize_coordinates(lat, lon, precision)
+    cache_key = make_cache_key(lat=cell_lat, lon=cell_lon, unit=CANONICAL_UNIT)
+    url = f'{service.base_url}weather?lat={lat}&lon={lon}&units={CANONICAL_UNIT}&appid={service.api_key}'
+    return UpstreamLookup(cache_key, url, 'weather')
@@ -0,0 +1,157 @@
+import atexit
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from app.models.domain import UpstreamLookup
+from app.services.weather.lookups import city_lookup
+from app.services.weather.quota import BACKGROUND, upstream_priority
+from app.services.weather.service import DatabaseCache, UpstreamCoalescer, WeatherAnalytics
+from app.utils.validation import validate_city_name
+
+logger = logging.getLogger(__name__)
+
+
+class CachePrewarmer:
+    def __init__(self, weather_service, top_n: int = 20, lead: float = 30, plan_interval: float = 60,
+                 data_types: Tuple[str, ...] = ('weather', 'forecast'), clock=time.monotonic):
+        self.weather_service = weather_service
+        self.top_n = top_n
+        self.lead = lead
+        self.plan_interval = plan_interval
+        self.data_types = data_types
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._queue = []
+        self._seq = itertools.count()
+        self._scheduled = set()
+        self._targets: Dict[str, UpstreamLookup] = {}
+        self._warmed: Dict[str, float] = {}
+        self._spacing = 0.0
+        self._last_refresh = None
+        self._stats = {'refreshes': 0, 'failed': 0, 'skipped_fresh': 0, 'dropped': 0, 'prevented_misses': 0}
+
+    def plan(self) -> int:
+        targets = {}
+        for popular in WeatherAnalytics.get_popular_cities(self.top_n):
+            city, _, country = popular['city'].rpartition(', ')
+            if not validate_city_name(city)[0] or country in ('', 'Unknown'):
+                continue
+            for data_type in self.data_types:
+                lookup = city_lookup(self.weather_service, city, country, data_type)
+                targets[lookup.cache_key] = lookup
+        rate = sum(1 / max(DatabaseCache.get_timeouts(lookup.data_type)[0] - self.lead, 1)
+                   for lookup in targets.values())
+        now = self._clock()
+        with self._lock:
+            self._targets = targets
+            self._spacing = 0.5 / rate if rate else 0.0
+            self._warmed = {key: until for key, until in self._warmed.items() if key in targets}
+            for cache_key in targets:
+                if cache_key not in self._scheduled:
+                    self._schedule(cache_key, self._due(cache_key, now))
+        return len(targets)
+
+    def _due(self, cache_key: str, now: float) -> float:
+        ttl = DatabaseCache.get_fresh_ttl(cache_key)
+        return now if ttl is None else now + ttl - self.lead
+
+    def _schedule(self, cache_key: str, due: float) -> None:
+        heapq.heappush(self._queue, (due, next(self._seq), cache_key))
+        self._scheduled.add(cache_key)
+
+    def next_wakeup(self) -> Optional[float]:
+        with self._lock:
+            if not self._queue:
+                return None
+            due = self._queue[0][0]
+            if self._last_refresh is not None:
+                due = max(due, self._last_refresh + self._spacing)
+            return due
+
+    def run_due(self) -> bool:
+        with self._lock:
+            now = self._clock()
+            if not self._queue or self._queue[0][0] > now:
+                return False
+            if self._last_refresh is not None and now < self._last_refresh + self._spacing:
+                return False
+            _, _, cache_key = heapq.heappop(self._queue)
+            lookup = self._targets.get(cache_key)
+            if lookup is None:
+                self._scheduled.discard(cache_key)
+                self._stats['dropped'] += 1
+                return False
+        ttl = DatabaseCache.get_fresh_ttl(cache_key)
+        with self._lock:
+            if ttl is not None and ttl > self.lead:
+                self._stats['skipped_fresh'] += 1
+                self._schedule(cache_key, now + ttl - self.lead)
+                return False
+            self._last_refresh = now
+        with upstream_priority(BACKGROUND):
+            data = UpstreamCoalescer.fetch(cache_key, self._loader(lookup))
+        with self._lock:
+            if 'error' in data:
+                self._stats['failed'] += 1
+                self._schedule(cache_key, now + self.plan_interval)
+            else:
+                self._stats['refreshes'] += 1
+                self._warmed[cache_key] = now + ttl if ttl is not None else now
+                self._schedule(cache_key, self._due(cache_key, self._clock()))
+        return True
+
+    def _loader(self, lookup: UpstreamLookup):
+        def load():
+            data = self.weather_service.fetch_lookup(lookup)
+            DatabaseCache.store_result(lookup, data)
+            return data
+        return load
+
+    def record_hit(self, cache_key: str) -> None:
+        if cache_key not in self._warmed:
+            return
+        with self._lock:
+            warmed_until = self._warmed.get(cache_key)
+            if warmed_until is not None and self._clock() >= warmed_until:
+                del self._warmed[cache_key]
+                self._stats['prevented_misses'] += 1
+
+    def _run(self) -> None:
+        next_plan = self._clock()
+        while not self._stop.is_set():
+            try:
+                if self._clock() >= next_plan:
+                    self.plan()
+                    next_plan = self._clock() + self.plan_interval
+                self.run_due()
+            except Exception as error:
+                logger.error(f"Cache pre-warming failed: {error}")
+            wakeup = self.next_wakeup()
+            wakeup = next_plan if wakeup is None else min(wakeup, next_plan)
+            self._stop.wait(max(wakeup - self._clock(), 0.05))
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='cache-prewarm', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['targets'] = len(self._targets)
+            stats['scheduled'] = len(self._queue)
+            stats['spacing_seconds'] = round(self._spacing, 3)
+        stats['top_n'] = self.top_n
+        stats['lead_seconds'] = self.lead
+        return stats
@@ -0,0 +1,114 @@
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+INTERACTIVE = 0
+AUTOCOMPLETE = 1
+BACKGROUND = 2
+PRIORITY_NAMES = ('interactive', 'autocomplete', 'background')
+RESERVED_SHARE = {INTERACTIVE: 0.0, AUTOCOMPLETE: 0.2, BACKGROUND: 0.5}
+MAX_WAIT = {INTERACTIVE: 3.0, AUTOCOMPLETE: 0.5, BACKGROUND: 0.0}
+
+_current_priority: ContextVar[int] = ContextVar('upstream_priority', default=INTERACTIVE)
+
+
+@contextmanager
+def upstream_priority(priority: int):
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> int:
+    return _current_priority.get()
+
+
+class UpstreamQuota:
+    def __init__(self, per_minute: float = 60, clock=time.monotonic):
+        self.per_minute = per_minute
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._seq = itertools.count()
+        self._exhausted = 0
+        self._retries_charged = 0
+        self._stats = {name: {'granted': 0, 'deferred': 0, 'dropped': 0} for name in PRIORITY_NAMES}
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _needed(self, priority: int, cost: int) -> float:
+        return min(cost, max(self.capacity, 1)) + self.capacity * RESERVED_SHARE[priority]
+
+    def acquire(self, priority: Optional[int] = None, cost: int = 1) -> bool:
+        priority = current_priority() if priority is None else priority
+        stats = self._stats[PRIORITY_NAMES[priority]]
+        needed = self._needed(priority, cost)
+        with self._cond:
+            now = self._clock()
+            self._refill(now)
+            if (not self._waiting or self._waiting[0][0] > priority) and self._tokens >= needed:
+                self._tokens -= cost
+                stats['granted'] += 1
+                return True
+            if cost > 1 or MAX_WAIT[priority] <= 0:
+                stats['dropped'] += 1
+                return False
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._waiting, ticket)
+            stats['deferred'] += 1
+            deadline = now + MAX_WAIT[priority]
+            try:
+                while True:
+                    now = self._clock()
+                    self._refill(now)
+                    if self._waiting[0] == ticket and self._tokens >= needed:
+                        self._tokens -= cost
+                        stats['granted'] += 1
+                        return True
+                    if now >= deadline:
+                        stats['dropped'] += 1
+                        return False
+                    self._cond.wait(min(deadline - now, max((needed - self._tokens) / self.rate, 0.01)))
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+
+    def charge(self, cost: int) -> None:
+        with self._cond:
+            self._refill(self._clock())
+            self._tokens -= cost
+            self._retries_charged += cost
+
+    def exhaust(self) -> None:
+        with self._cond:
+            self._tokens = 0.0
+            self._updated = self._clock()
+            self._exhausted += 1
+
+    def get_stats(self) -> Dict:
+        with self._cond:
+            self._refill(self._clock())
+            waiting = {name: 0 for name in PRIORITY_NAMES}
+            for priority, _ in self._waiting:
+                waiting[PRIORITY_NAMES[priority]] += 1
+            return {
+                'per_minute': self.per_minute,
+                'tokens': round(self._tokens, 2),
+                'waiting': waiting,
+                'upstream_429': self._exhausted,
+                'retries_charged': self._retries_charged,
+                'classes': {name: dict(stats) for name, stats in self._stats.items()}
+            }
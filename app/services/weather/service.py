@@ -1,144 +1,204 @@
 import json
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import requests
-from app.core.cache import analytics, favorites, weather_cache
-from app.models.domain import WeatherData
+from app.core.batch import batch_executor
+from app.core.cache import (
+    CacheEntry,
+    SuggestionCache,
+    analytics,
+    coordinate_stats,
+    favorites,
+    ttl_policy,
+    weather_cache,
+)
+from app.core.refresh import background_refresher
+from app.core.single_flight import async_upstream_flights, upstream_flights
+from app.models.domain import UpstreamLookup, WeatherData
+from app.services.geo.gazetteer import Gazetteer
+from app.services.geo.ranking import DEFAULT_WEIGHTS, RankingWeights, rank_city_suggestions
+from app.services.geo.spatial_index import GridIndex
+from app.services.weather.circuit_breaker import CircuitBreaker
+from app.services.weather.group_batcher import GroupBatcher
+from app.services.weather.quota import AUTOCOMPLETE, BACKGROUND, UpstreamQuota, upstream_priority
+from app.services.weather.transport import UpstreamTransport, retry_count
+from app.utils.units import CANONICAL_UNIT
 
 logger = logging.getLogger(__name__)
 
+TIMEOUT_ERROR = 'Forespørselen tok for lang tid. Prøv igjen senere.'
+CONNECTION_ERROR = 'Kunne ikke koble til vær-tjenesten. Sjekk internettforbindelsen.'
+REQUEST_ERROR = 'Feil ved henting av værdata. Prøv igjen senere.'
+INVALID_RESPONSE_ERROR = 'Ugyldig respons fra vær-tjenesten'
+UNEXPECTED_ERROR = 'En uventet feil oppstod. Prøv igjen senere.'
+UNAVAILABLE_ERROR = 'Vær-tjenesten er midlertidig utilgjengelig. Prøv igjen senere.'
+QUOTA_ERROR = 'For mange forespørsler. Prøv igjen senere.'
+NOT_FOUND_MESSAGES = ('Byen ble ikke funnet', 'city not found')
+STATUS_ERRORS = {
+    401: 'Ugyldig API-nøkkel',
+    404: 'Byen ble ikke funnet',
+    429: QUOTA_ERROR
+}
+
+def api_error_for_status(status_code: int) -> Dict:
+    return {'error': STATUS_ERRORS.get(status_code, f'HTTP-feil: {status_code}')}
+
+def api_error_for_payload(data: Dict) -> Optional[Dict]:
+    if not isinstance(data, dict) or 'cod' not in data:
+        return None
+    cod_value = data['cod']
+    if isinstance(cod_value, str):
+        try:
+            cod_value = int(cod_value)
+        except ValueError:
+            pass
+    if cod_value != 200:
+        return {'error': data.get('message', 'Ukjent feil fra vær-API')}
+    return None
+
+def is_not_found_error(data: Dict) -> bool:
+    return isinstance(data, dict) and data.get('error') in NOT_FOUND_MESSAGES
+
+def is_upstream_failure(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+DEFAULT_GEO_BASE_URL = 'https://api.openweathermap.org/geo/1.0/'
+SUGGESTION_CANDIDATES = 25
+
 class WeatherAPIService:
-    def __init__(self, api_key: str, base_url: str):
+    def __init__(self, api_key: str, base_url: str, geo_base_url: str = DEFAULT_GEO_BASE_URL,
+                 transport: Optional[UpstreamTransport] = None, breaker: Optional[CircuitBreaker] = None,
+                 gazetteer: Optional[Gazetteer] = None, suggestion_cache: Optional[SuggestionCache] = None,
+                 spatial_index: Optional[GridIndex] = None, reverse_geocode_max_km: float = 15,
+                 ranking_weights: RankingWeights = DEFAULT_WEIGHTS, group_batcher: Optional[GroupBatcher] = None,
+                 quota: Optional[UpstreamQuota] = None):
         self.api_key = api_key
         self.base_url = base_url
-        self.session = requests.Session()
-        self.session.timeout = 10
+        self.geo_base_url = geo_base_url
+        self.transport = transport or UpstreamTransport()
+        self.session = self.transport.session
+        self.breaker = breaker or CircuitBreaker()
+        self.gazetteer = gazetteer
+        self.suggestion_cache = suggestion_cache or SuggestionCache()
+        self.spatial_index = spatial_index
+        self.reverse_geocode_max_km = reverse_geocode_max_km
+        self.reverse_geocode_stats = {'local': 0, 'upstream': 0}
+        self.ranking_weights = ranking_weights
+        self.group_batcher = group_batcher
+        self.quota = quota
 
-    def fetch_weather_data(self, url: str) -> Dict:
+    def fetch_weather_data(self, url: str, cost: int = 1) -> Dict:
+        if not self.breaker.allow_request():
+            logger.warning("Circuit breaker open, skipping weather API call")
+            return {'error': UNAVAILABLE_ERROR}
+        if not self.acquire_quota(cost=cost):
+            logger.warning("Upstream quota exhausted, skipping weather API call")
+            self.breaker.release_probe()
+            return {'error': QUOTA_ERROR}
         try:
-            response = self.session.get(url)
+            response = self.upstream_get(url)
             response.raise_for_status()
             data = response.json()
-            if 'cod' in data:
-                cod_value = data['cod']
-                if isinstance(cod_value, str):
-                    try:
-                        cod_value = int(cod_value)
-                    except ValueError:
-                        pass
-                if cod_value != 200:
-                    error_msg = data.get('message', 'Ukjent feil fra vær-API')
-                    return {'error': error_msg}
-            return data
+            self.breaker.record_success()
+            return api_error_for_payload(data) or data
         except requests.exceptions.Timeout:
             logger.error("Timeout when fetching weather data")
-            return {'error': 'Forespørselen tok for lang tid. Prøv igjen senere.'}
+            self.breaker.record_failure()
+            return {'error': TIMEOUT_ERROR}
         except requests.exceptions.ConnectionError:
             logger.error("Connection error when fetching weather data")
-            return {'error': 'Kunne ikke koble til vær-tjenesten. Sjekk internettforbindelsen.'}
+            self.breaker.record_failure()
+            return {'error': CONNECTION_ERROR}
         except requests.exceptions.HTTPError as error:
             logger.error(f"HTTP error when fetching weather data: {error}")
-            if error.response.status_code == 401:
-                return {'error': 'Ugyldig API-nøkkel'}
-            if error.response.status_code == 404:
-                return {'error': 'Byen ble ikke funnet'}
-            if error.response.status_code == 429:
-                return {'error': 'For mange forespørsler. Prøv igjen senere.'}
-            return {'error': f'HTTP-feil: {error.response.status_code}'}
+            if error.response.status_code == 429 and self.quota is not None:
+                self.quota.exhaust()
+            if is_upstream_failure(error.response.status_code):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            return api_error_for_status(error.response.status_code)
         except requests.exceptions.RequestException as error:
             logger.error(f"Request error when fetching weather data: {error}")
-            return {'error': 'Feil ved henting av værdata. Prøv igjen senere.'}
+            self.breaker.record_failure()
+            return {'error': REQUEST_ERROR}
         except json.JSONDecodeError:
             logger.error("Invalid JSON response from weather API")
-            return {'error': 'Ugyldig respons fra vær-tjenesten'}
+            self.breaker.record_failure()
+            return {'error': INVALID_RESPONSE_ERROR}
         except Exception as error:
             logger.error(f"Unexpected error when fetching weather data: {error}")
-            return {'error': 'En uventet feil oppstod. Prøv igjen senere.'}
+            self.breaker.record_failure()
+            return {'error': UNEXPECTED_ERROR}
+
+    def acquire_quota(self, priority: Optional[int] = None, cost: int = 1) -> bool:
+        return self.quota is None or self.quota.acquire(priority, cost)
+
+    def upstream_get(self, url: str):
+        response = self.transport.get(url)
+        retries = retry_count(response)
+        if retries and self.quota is not None:
+            self.quota.charge(retries)
+        return response
+
+    def fetch_lookup(self, lookup: UpstreamLookup) -> Dict:
+        if self.group_batcher is None or not lookup.groupable:
+            return self.fetch_weather_data(lookup.url)
+        return self.group_batcher.fetch(lookup.cache_key, lambda: self.fetch_weather_data(lookup.url),
+                                        self.fetch_weather_group)
+
+    def fetch_weather_group(self, city_ids: List[int]) -> Dict:
+        ids = ','.join(str(city_id) for city_id in city_ids)
+        return self.fetch_weather_data(f'{self.base_url}group?id={ids}&units={CANONICAL_UNIT}&appid={self.api_key}',
+                                       cost=len(city_ids))
 
     def fetch_city_suggestions(self, query: str, limit: int = 8) -> List[Dict]:
+        candidates = self.suggestion_cache.lookup(query)
+        if candidates is None:
+            candidates = self.search_gazetteer(query)
+            if candidates:
+                self.suggestion_cache.store(query, candidates, complete=len(candidates) < SUGGESTION_CANDIDATES)
+            else:
+                candidates = self.fetch_upstream_suggestions(query)
+                if candidates is None:
+                    return []
+                self.suggestion_cache.store(query, candidates, complete=False)
+        return rank_city_suggestions(candidates, query, limit, self.ranking_weights)
+
+    def fetch_suggestion_candidates(self, query: str) -> Optional[List[Dict]]:
+        return self.search_gazetteer(query) or self.fetch_upstream_suggestions(query)
+
+    def search_gazetteer(self, query: str) -> List[Dict]:
+        if self.gazetteer is None:
+            return []
+        return self.gazetteer.search(query, limit=SUGGESTION_CANDIDATES)
+
+    def fetch_upstream_suggestions(self, query: str) -> Optional[List[Dict]]:
+        if not self.acquire_quota(AUTOCOMPLETE):
+            logger.warning("Upstream quota tight, skipping city suggestion lookup")
+            return None
         try:
-            url = f"http://api.openweathermap.org/geo/1.0/direct?q={query}&limit=25&appid={self.api_key}"
-            response = self.session.get(url)
+            url = f"{self.geo_base_url}direct?q={query}&limit={SUGGESTION_CANDIDATES}&appid={self.api_key}"
+            response = self.upstream_get(url)
             response.raise_for_status()
             data = response.json()
-            suggestions: List[Dict] = []
-            seen_cities = set()
-            seen_names = set()
-            data.sort(key=lambda item: (
-                not item.get('name', '').lower().startswith(query.lower()),
-                item.get('country', '') != 'NO',
-                -(item.get('population', 0) or 0),
-                len(item.get('name', ''))
-            ))
-            for item in data:
-                city_name = item.get('name', '')
-                country = item.get('country', '')
-                state = item.get('state', '')
-                if not city_name or not country:
-                    continue
-                unique_key = f"{city_name.lower()}_{country.lower()}_{state.lower()}"
-                if unique_key in seen_cities:
-                    continue
-                seen_cities.add(unique_key)
-                city_name_lower = city_name.lower()
-                if city_name_lower in seen_names:
-                    existing_countries = [suggestion['country'] for suggestion in suggestions if suggestion['name'].lower() == city_name_lower]
-                    if country in existing_countries:
-                        continue
-                seen_names.add(city_name_lower)
-                is_exact_match = city_name.lower().startswith(query.lower())
-                relevance_score = 0
-                if is_exact_match:
-                    relevance_score += 100
-                if country == 'NO':
-                    relevance_score += 50
-                if item.get('population'):
-                    relevance_score += min(item.get('population', 0) / 10000, 20)
-                if len(city_name) <= 8:
-                    relevance_score += 10
-                display_name = city_name
-                if state and state != city_name:
-                    display_name = f"{city_name}, {state}, {country}"
-                else:
-                    display_name = f"{city_name}, {country}"
-                suggestion = {
-                    'name': city_name,
-                    'country': country,
-                    'state': state,
-                    'lat': item.get('lat'),
-                    'lon': item.get('lon'),
-                    'is_exact_match': is_exact_match,
-                    'relevance_score': relevance_score,
-                    'population': item.get('population', 0),
-                    'display_name': display_name
-                }
-                suggestions.append(suggestion)
-            suggestions.sort(key=lambda suggestion: suggestion['relevance_score'], reverse=True)
-            final_suggestions: List[Dict] = []
-            country_count: Dict[str, int] = {}
-            for suggestion in suggestions:
-                country = suggestion['country']
-                if country_count.get(country, 0) < 3 or len(final_suggestions) < limit // 2:
-                    final_suggestions.append(suggestion)
-                    country_count[country] = country_count.get(country, 0) + 1
-                if len(final_suggestions) >= limit:
-                    break
-            if len(final_suggestions) < limit:
-                for suggestion in suggestions:
-                    if suggestion not in final_suggestions:
-                        final_suggestions.append(suggestion)
-                        if len(final_suggestions) >= limit:
-                            break
-            return final_suggestions[:limit]
+            return data if isinstance(data, list) else None
         except Exception as error:
             logger.error(f"Error fetching city suggestions: {error}")
-            return []
+            return None
 
     def reverse_geocode(self, lat: str, lon: str) -> Dict:
+        local_place = self.find_nearest_place(float(lat), float(lon))
+        if local_place is not None:
+            self.reverse_geocode_stats['local'] += 1
+            return local_place
+        self.reverse_geocode_stats['upstream'] += 1
+        if not self.acquire_quota():
+            return {'error': QUOTA_ERROR}
         try:
-            url = f"http://api.openweathermap.org/geo/1.0/reverse?lat={lat}&lon={lon}&limit=1&appid={self.api_key}"
-            response = self.session.get(url)
+            url = f"{self.geo_base_url}reverse?lat={lat}&lon={lon}&limit=1&appid={self.api_key}"
+            response = self.upstream_get(url)
             response.raise_for_status()
             data = response.json()
             if data:
@@ -153,19 +213,120 @@ class WeatherAPIService:
             logger.error(f"Error in reverse geocoding: {error}")
             return {'error': 'Feil ved reversering av koordinater'}
 
+    def find_nearest_place(self, lat: float, lon: float) -> Optional[Dict]:
+        if self.spatial_index is None or self.gazetteer is None:
+            return None
+        match = self.spatial_index.nearest(lat, lon, self.reverse_geocode_max_km)
+        if match is None:
+            return None
+        place = self.gazetteer.place(match[0])
+        return {'city': place['name'], 'country': place['country'], 'state': place['state']}
+
+    def get_reverse_geocode_stats(self) -> Dict:
+        stats = dict(self.reverse_geocode_stats)
+        stats['max_distance_km'] = self.reverse_geocode_max_km
+        stats['index'] = self.spatial_index.get_stats() if self.spatial_index is not None else None
+        return stats
+
+    def get_group_batch_stats(self) -> Optional[Dict]:
+        return self.group_batcher.get_stats() if self.group_batcher is not None else None
+
+    def get_quota_stats(self) -> Optional[Dict]:
+        return self.quota.get_stats() if self.quota is not None else None
+
+    def get_transport_stats(self) -> Dict:
+        return self.transport.get_stats()
+
+    def get_suggestion_cache_stats(self) -> Dict:
+        return self.suggestion_cache.get_stats()
+
+    def get_gazetteer_stats(self) -> Optional[Dict]:
+        return self.gazetteer.get_stats() if self.gazetteer is not None else None
+
 class DatabaseCache:
+    @staticmethod
+    def use_backend(backend) -> None:
+        global weather_cache
+        weather_cache = backend
+
+    @staticmethod
+    def get_timeouts(data_type: str) -> Tuple[int, int]:
+        return ttl_policy.timeouts(data_type)
+
     @staticmethod
     def get(cache_key: str) -> Optional[Dict]:
         return weather_cache.get(cache_key)
 
     @staticmethod
-    def set(cache_key: str, data: Dict, timeout: int = 300) -> None:
-        weather_cache.set(cache_key, data, timeout)
+    def get_entry(cache_key: str) -> Optional[CacheEntry]:
+        return weather_cache.get_entry(cache_key)
+
+    @staticmethod
+    def get_fresh_ttl(cache_key: str) -> Optional[float]:
+        return weather_cache.fresh_ttl(cache_key)
+
+    @staticmethod
+    def set(cache_key: str, data: Dict, timeout: int = 300, stale_timeout: int = 0) -> None:
+        weather_cache.set(cache_key, data, timeout, stale_timeout)
+
+    @staticmethod
+    def store_result(lookup: UpstreamLookup, data: Dict) -> bool:
+        if 'error' not in data:
+            timeout, stale_timeout = ttl_policy.timeouts(lookup.data_type)
+            DatabaseCache.set(lookup.cache_key, data, timeout=timeout, stale_timeout=stale_timeout)
+            return True
+        if is_not_found_error(data):
+            timeout, _ = ttl_policy.timeouts('negative')
+            DatabaseCache.set(lookup.cache_key, data, timeout=timeout)
+            return True
+        return False
 
     @staticmethod
     def clear_expired() -> int:
         return weather_cache.clear_expired()
 
+    @staticmethod
+    def clear() -> int:
+        return weather_cache.clear()
+
+    @staticmethod
+    def get_stats() -> Dict:
+        return weather_cache.get_stats()
+
+    @staticmethod
+    def track_coordinates(kind: str, lat: str, lon: str, timeout: int) -> None:
+        coordinate_stats.record(kind, lat, lon, timeout)
+
+    @staticmethod
+    def get_coordinate_stats() -> Dict:
+        return coordinate_stats.get_stats()
+
+class UpstreamCoalescer:
+    @staticmethod
+    def fetch(cache_key: str, loader: Callable[[], Dict]) -> Dict:
+        return upstream_flights.do(cache_key, loader)
+
+    @staticmethod
+    def fetch_many(loaders: Dict[str, Callable[[], Dict]]) -> Dict[str, Dict]:
+        tasks = {cache_key: (lambda key=cache_key, load=loader: upstream_flights.do(key, load))
+                 for cache_key, loader in loaders.items()}
+        return batch_executor.run_all(tasks, fallback={'error': UNEXPECTED_ERROR})
+
+    @staticmethod
+    def schedule_refresh(cache_key: str, loader: Callable[[], Dict]) -> bool:
+        def refresh():
+            with upstream_priority(BACKGROUND):
+                return upstream_flights.do(cache_key, loader)
+        return background_refresher.submit(cache_key, refresh)
+
+    @staticmethod
+    def get_stats() -> Dict:
+        stats = upstream_flights.get_stats()
+        stats['background_refresh'] = background_refresher.get_stats()
+        stats['async'] = async_upstream_flights.get_stats()
+        stats['batch'] = batch_executor.get_stats()
+        return stats
+
 class WeatherAnalytics:
     @staticmethod
     def log_query(city: str, country: str, user_ip: str, response_time: float, endpoint: str) -> None:
@@ -175,10 +336,22 @@ class WeatherAnalytics:
     def get_query_stats() -> Dict:
         return analytics.get_query_stats()
 
+    @staticmethod
+    def get_latency_stats(window: Optional[int] = None) -> Dict:
+        return analytics.get_latency_stats(window)
+
+    @staticmethod
+    def get_log_summary(window: Optional[int] = None) -> Dict:
+        return analytics.get_log_summary(window)
+
     @staticmethod
     def get_popular_cities(limit: int = 10) -> List[Dict]:
         return analytics.get_popular_cities(limit)
 
+    @staticmethod
+    def get_popular_stats() -> Dict:
+        return analytics.get_popular_stats()
+
 class FavoritesService:
     @staticmethod
     def get_user_favorites(user_ip: str) -> List[Dict]:
@@ -191,3 +364,7 @@ class FavoritesService:
     @staticmethod
     def remove_favorite(user_ip: str, city: str, country: str) -> bool:
         return favorites.remove_favorite(user_ip, city, country)
+
+    @staticmethod
+    def get_stats() -> Dict:
+        return favorites.get_stats()
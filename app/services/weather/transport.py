@@ -0,0 +1,83 @@
+import logging
+from typing import Dict, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    def __init__(self, *args, timeout: Tuple[float, float] = (3.05, 10), **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+def build_retry(max_retries: int, backoff_factor: float, backoff_jitter: float) -> Retry:
+    options = {
+        'total': max_retries,
+        'backoff_factor': backoff_factor,
+        'status_forcelist': RETRY_STATUSES,
+        'allowed_methods': frozenset({'GET'}),
+        'respect_retry_after_header': False,
+        'raise_on_status': False
+    }
+    try:
+        return Retry(backoff_jitter=backoff_jitter, backoff_max=2, **options)
+    except TypeError:
+        return Retry(**options)
+
+def retry_count(response) -> int:
+    retries = getattr(getattr(response, 'raw', None), 'retries', None)
+    history = getattr(retries, 'history', None)
+    return len(history) if history else 0
+
+class UpstreamTransport:
+    def __init__(self, connect_timeout: float = 3.05, read_timeout: float = 10, pool_connections: int = 4,
+                 pool_maxsize: int = 16, max_retries: int = 2, backoff_factor: float = 0.3,
+                 backoff_jitter: float = 0.2):
+        self.timeout = (connect_timeout, read_timeout)
+        self.adapter = TimeoutHTTPAdapter(
+            timeout=self.timeout,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=build_retry(max_retries, backoff_factor, backoff_jitter)
+        )
+        self.session = requests.Session()
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self._requests = 0
+        self._retries = 0
+
+    def get(self, url: str):
+        self._requests += 1
+        response = self.session.get(url)
+        self._retries += retry_count(response)
+        return response
+
+    def get_stats(self) -> Dict:
+        pools = self.adapter.poolmanager.pools
+        connections = 0
+        pooled_requests = 0
+        for pool_key in pools.keys():
+            pool = pools.get(pool_key)
+            if pool is None:
+                continue
+            connections += pool.num_connections
+            pooled_requests += pool.num_requests
+        return {
+            'requests': self._requests,
+            'retries': self._retries,
+            'pools': len(pools),
+            'connections_opened': connections,
+            'connections_reused': max(pooled_requests - connections, 0),
+            'reuse_ratio': round(1 - connections / pooled_requests, 4) if pooled_requests else 0.0,
+            'connect_timeout': self.timeout[0],
+            'read_timeout': self.timeout[1]
+        }
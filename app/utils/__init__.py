@@ -1,7 +1,8 @@
-from app.utils.cache_keys import make_cache_key
+from app.utils.cache_keys import make_cache_key, normalize_unit
 from app.utils.formatting import format_temperature, format_wind_speed
 from app.utils.request_metadata import get_client_info, get_user_ip
 from app.utils.timing import calculate_response_time
+from app.utils.units import CANONICAL_UNIT, convert_units
 from app.utils.validation import (
     sanitize_input,
     validate_city_name,
@@ -10,12 +11,15 @@ from app.utils.validation import (
 )
 
 __all__ = [
+    "CANONICAL_UNIT",
     "calculate_response_time",
+    "convert_units",
     "format_temperature",
     "format_wind_speed",
     "get_client_info",
     "get_user_ip",
     "make_cache_key",
+    "normalize_unit",
     "sanitize_input",
     "validate_city_name",
     "validate_coordinates",
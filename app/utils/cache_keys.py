@@ -1,19 +1,22 @@
-from datetime import datetime
 from flask import request
 
+SUPPORTED_UNITS = ('metric', 'imperial', 'standard')
 
-def make_cache_key(city: str = None, country: str = None, lat: str = None, lon: str = None) -> str:
-    if city and country:
-        current_hour = datetime.now().hour
-        return f"weather:city:{city.lower()}:{country.lower()}:{current_hour}"
-    if lat and lon:
-        current_hour = datetime.now().hour
-        return f"weather:coords:{lat}:{lon}:{current_hour}"
-    city = request.args.get('city', '').lower()
-    country = request.args.get('country', '').lower()
-    lat = request.args.get('lat', '')
-    lon = request.args.get('lon', '')
-    current_hour = datetime.now().hour
+
+def normalize_unit(unit: str = None) -> str:
+    unit = (unit or 'metric').strip().lower()
+    return unit if unit in SUPPORTED_UNITS else 'metric'
+
+
+def make_cache_key(city: str = None, country: str = None, lat: str = None, lon: str = None,
+                   unit: str = None, data_type: str = 'weather') -> str:
+    if city is None and country is None and lat is None and lon is None:
+        city = request.args.get('city', '')
+        country = request.args.get('country', '')
+        lat = request.args.get('lat', '')
+        lon = request.args.get('lon', '')
+        unit = unit or request.args.get('unit')
+    unit = normalize_unit(unit)
     if city:
-        return f"weather:city:{city}:{country}:{current_hour}"
-    return f"weather:coords:{lat}:{lon}:{current_hour}"
+        return f"{data_type}:city:{city.strip().lower()}:{(country or '').strip().lower()}:{unit}"
+    return f"{data_type}:coords:{lat}:{lon}:{unit}"
@@ -0,0 +1,15 @@
+import unicodedata
+from typing import Tuple
+
+
+def quantize_coordinates(lat, lon, precision: int = 2) -> Tuple[str, str]:
+    lat_value = round(float(lat), precision) + 0.0
+    lon_value = round(float(lon), precision) + 0.0
+    return f"{lat_value:.{precision}f}", f"{lon_value:.{precision}f}"
+
+
+def normalize_name(name: str) -> str:
+    if name.isascii():
+        return name.lower().strip()
+    decomposed = unicodedata.normalize('NFKD', name)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold().strip()
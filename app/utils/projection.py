@@ -0,0 +1,150 @@
+import hashlib
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+SLIM_FORMAT = 'slim'
+RESPONSE_FORMATS = ('full', SLIM_FORMAT)
+MAX_FIELDS = 30
+FIELD_PATTERN = re.compile(r'^[A-Za-z0-9_]+(\.[A-Za-z0-9_]+){0,5}$')
+_MISSING = object()
+FORECAST_COLUMNS = (
+    ('dt', ('dt',)),
+    ('temp', ('main', 'temp')),
+    ('feels_like', ('main', 'feels_like')),
+    ('humidity', ('main', 'humidity')),
+    ('wind_speed', ('wind', 'speed')),
+    ('rain_3h', ('rain', '3h')),
+    ('condition', ('weather', 0, 'main')),
+    ('description', ('weather', 0, 'description')),
+    ('icon', ('weather', 0, 'icon'))
+)
+WEATHER_FIELDS = (
+    ('name', ('name',)),
+    ('country', ('sys', 'country')),
+    ('dt', ('dt',)),
+    ('lat', ('coord', 'lat')),
+    ('lon', ('coord', 'lon')),
+    ('temp', ('main', 'temp')),
+    ('feels_like', ('main', 'feels_like')),
+    ('humidity', ('main', 'humidity')),
+    ('wind_speed', ('wind', 'speed')),
+    ('condition', ('weather', 0, 'main')),
+    ('description', ('weather', 0, 'description')),
+    ('icon', ('weather', 0, 'icon')),
+    ('sunrise', ('sys', 'sunrise')),
+    ('sunset', ('sys', 'sunset'))
+)
+
+
+def parse_projection(fields: Optional[str], response_format: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    response_format = (response_format or 'full').strip().lower()
+    if response_format not in RESPONSE_FORMATS:
+        return None, f"Ugyldig format. Gyldige verdier: {', '.join(RESPONSE_FORMATS)}"
+    paths = sorted({path.strip() for path in (fields or '').split(',') if path.strip()})
+    if response_format == SLIM_FORMAT:
+        if paths:
+            return None, 'fields kan ikke kombineres med format=slim'
+        return SLIM_FORMAT, None
+    if not paths:
+        return None, None
+    if len(paths) > MAX_FIELDS:
+        return None, f"Maks {MAX_FIELDS} felt per forespørsel"
+    if not all(FIELD_PATTERN.match(path) for path in paths):
+        return None, 'Ugyldig feltnavn'
+    return 'fields:' + ','.join(paths), None
+
+
+def projection_tag(projection: str) -> str:
+    if projection == SLIM_FORMAT:
+        return SLIM_FORMAT
+    return hashlib.blake2b(projection.encode('utf-8'), digest_size=4).hexdigest()
+
+
+def _lookup(value: Any, path: Tuple) -> Any:
+    for key in path:
+        if isinstance(key, int):
+            value = value[key] if isinstance(value, list) and len(value) > key else None
+        else:
+            value = value.get(key) if isinstance(value, dict) else None
+        if value is None:
+            return None
+    return value
+
+
+def _pick(value: Any, path: List[str]) -> Tuple[bool, Any]:
+    if not path:
+        return True, value
+    head, rest = path[0], path[1:]
+    if isinstance(value, dict):
+        if head not in value:
+            return False, None
+        found, picked = _pick(value[head], rest)
+        return found, {head: picked} if found else None
+    if isinstance(value, list):
+        if head.isdigit():
+            index = int(head)
+            if index >= len(value):
+                return False, None
+            found, picked = _pick(value[index], rest)
+            return found, [_MISSING] * index + [picked] if found else None
+        picked = [_pick(item, path) for item in value]
+        return any(found for found, _ in picked), [item if found else _MISSING for found, item in picked]
+    return False, None
+
+
+def _merge(target: Any, source: Any) -> Any:
+    if source is _MISSING:
+        return target
+    if target is _MISSING:
+        return source
+    if isinstance(target, dict) and isinstance(source, dict):
+        merged = dict(target)
+        for key, value in source.items():
+            merged[key] = _merge(merged[key], value) if key in merged else value
+        return merged
+    if isinstance(target, list) and isinstance(source, list):
+        return [_merge(target[index] if index < len(target) else _MISSING,
+                       source[index] if index < len(source) else _MISSING)
+                for index in range(max(len(target), len(source)))]
+    return source
+
+
+def _fill_missing(value: Any) -> Any:
+    if value is _MISSING:
+        return {}
+    if isinstance(value, dict):
+        return {key: _fill_missing(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fill_missing(item) for item in value]
+    return value
+
+
+def project_fields(data: Dict, paths: List[str]) -> Dict:
+    projected = {}
+    for path in paths:
+        found, picked = _pick(data, path.split('.'))
+        if found:
+            projected = _merge(projected, picked)
+    return _fill_missing(projected)
+
+
+def slim_weather(data: Dict) -> Dict:
+    return {name: _lookup(data, path) for name, path in WEATHER_FIELDS}
+
+
+def slim_forecast(data: Dict) -> Dict:
+    entries = data.get('list') or []
+    city = data.get('city') or {}
+    return {
+        'city': {key: city.get(key) for key in ('name', 'country', 'timezone', 'sunrise', 'sunset')},
+        'count': len(entries),
+        'columns': {name: [_lookup(entry, path) for entry in entries] for name, path in FORECAST_COLUMNS}
+    }
+
+
+def apply_projection(data: Dict, projection: Optional[str]) -> Dict:
+    if projection is None or not isinstance(data, dict) or 'error' in data:
+        return data
+    if projection == SLIM_FORMAT:
+        return slim_forecast(data) if isinstance(data.get('list'), list) else slim_weather(data)
+    return project_fields(data, projection[len('fields:'):].split(','))
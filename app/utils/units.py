@@ -0,0 +1,57 @@
+from typing import Dict
+
+CANONICAL_UNIT = 'metric'
+TEMPERATURE_FIELDS = ('temp', 'feels_like', 'temp_min', 'temp_max')
+TEMPERATURE_DELTA_FIELDS = ('temp_kf',)
+SPEED_FIELDS = ('speed', 'gust')
+MPS_TO_MPH = 2.2369362920544
+
+
+def convert_temperature(celsius: float, unit: str = 'metric') -> float:
+    if unit == 'imperial':
+        return round(celsius * 9 / 5 + 32, 2)
+    if unit == 'standard':
+        return round(celsius + 273.15, 2)
+    return celsius
+
+
+def convert_temperature_delta(delta: float, unit: str = 'metric') -> float:
+    if unit == 'imperial':
+        return round(delta * 9 / 5, 2)
+    return delta
+
+
+def convert_speed(meters_per_second: float, unit: str = 'metric') -> float:
+    if unit == 'imperial':
+        return round(meters_per_second * MPS_TO_MPH, 2)
+    return meters_per_second
+
+
+def _convert_fields(section, fields, converter, unit):
+    for field in fields:
+        value = section.get(field)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            section[field] = converter(value, unit)
+
+
+def _convert_entry(entry: Dict, unit: str) -> Dict:
+    converted = dict(entry)
+    if isinstance(entry.get('main'), dict):
+        main = dict(entry['main'])
+        _convert_fields(main, TEMPERATURE_FIELDS, convert_temperature, unit)
+        _convert_fields(main, TEMPERATURE_DELTA_FIELDS, convert_temperature_delta, unit)
+        converted['main'] = main
+    if isinstance(entry.get('wind'), dict):
+        wind = dict(entry['wind'])
+        _convert_fields(wind, SPEED_FIELDS, convert_speed, unit)
+        converted['wind'] = wind
+    return converted
+
+
+def convert_units(data: Dict, unit: str = 'metric') -> Dict:
+    if unit == CANONICAL_UNIT or not isinstance(data, dict) or 'error' in data:
+        return data
+    converted = _convert_entry(data, unit)
+    if isinstance(data.get('list'), list):
+        converted['list'] = [_convert_entry(entry, unit) if isinstance(entry, dict) else entry for entry in data['list']]
+    return converted
@@ -0,0 +1,103 @@
+"""Compare the sync Flask path against the optional ASGI mode under slow upstream calls.
+
+Starts a local stub of OpenWeatherMap that answers every request after a
+fixed delay, then sends N cache-missing /weather requests through
+  * the sync Flask app, one request at a time (one sync gunicorn worker)
+  * the ASGI app, all requests concurrently in one event loop
+
+Requires the optional ASGI dependencies (httpx, asgiref).
+
+    python benchmarks/async_vs_sync.py [requests] [upstream_delay_ms]
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("API_KEY", "benchmark")
+
+import httpx  # noqa: E402
+from werkzeug.test import Client  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.asgi import AsyncWeatherApp  # noqa: E402
+from app.config import config  # noqa: E402
+from app.core.cache import weather_cache  # noqa: E402
+from app.services.weather.async_service import AsyncWeatherAPIService  # noqa: E402
+
+
+def start_stub_upstream(delay):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            body = json.dumps({"cod": 200, "name": "Stub", "main": {"temp": 10}}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    ThreadingHTTPServer.request_queue_size = 1024
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def city_name(index):
+    letters = ''
+    while True:
+        index, remainder = divmod(index, 26)
+        letters += chr(ord('a') + remainder)
+        if not index:
+            return f"Bench {letters}"
+
+
+def run_sync(flask_app, paths):
+    client = Client(flask_app)
+    started = time.perf_counter()
+    for path in paths:
+        assert client.get(path).status_code == 200
+    return time.perf_counter() - started
+
+
+async def run_async(asgi_app, paths):
+    transport = httpx.ASGITransport(app=asgi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(client.get(path) for path in paths))
+        elapsed = time.perf_counter() - started
+    assert all(response.status_code == 200 for response in responses)
+    await asgi_app.weather_service.aclose()
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    delay = (int(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    server, base_url = start_stub_upstream(delay)
+    config['testing'].WEATHER_API_BASE_URL = base_url
+    flask_app = create_app('testing')
+    paths = [f"/weather?city={city_name(index)}&country=NO" for index in range(count)]
+
+    weather_cache.clear()
+    sync_elapsed = run_sync(flask_app, paths)
+    weather_cache.clear()
+    asgi_app = AsyncWeatherApp(flask_app, AsyncWeatherAPIService(api_key="benchmark", base_url=base_url))
+    async_elapsed = asyncio.run(run_async(asgi_app, paths))
+    server.shutdown()
+
+    print(f"{count} cache-missing requests, upstream delay {delay * 1000:.0f} ms")
+    print(f"sync worker : {sync_elapsed:7.3f} s  ({count / sync_elapsed:8.1f} req/s)")
+    print(f"asgi mode   : {async_elapsed:7.3f} s  ({count / async_elapsed:8.1f} req/s)")
+
+
+if __name__ == "__main__":
+    main()
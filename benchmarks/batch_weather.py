@@ -0,0 +1,69 @@
+"""Compare loading N cities one request at a time with one /weather/batch request.
+
+The upstream call is replaced by a sleep with a random latency, so the numbers
+show how the wall time scales: one request per city pays the sum of the
+latencies, the batch endpoint pays roughly the slowest one.
+
+    python benchmarks/batch_weather.py [cities] [mean_latency_ms]
+"""
+import os
+import random
+import sys
+import time
+
+import werkzeug
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("API_KEY", "benchmark-key")
+
+from app import create_app  # noqa: E402
+from app.core.cache import weather_cache  # noqa: E402
+
+
+def make_upstream(latencies):
+    def fetch_weather_data(url):
+        city = url.split("q=")[1].split(",")[0]
+        time.sleep(latencies[city])
+        return {"name": city, "main": {"temp": 4.0}, "sys": {"country": "NO"}}
+    return fetch_weather_data
+
+
+def main():
+    cities = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    mean_latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 120) / 1000
+    if not getattr(werkzeug, "__version__", None):
+        werkzeug.__version__ = "benchmark"
+    app = create_app("testing")
+    client = app.test_client()
+    names = [f"By{chr(97 + index // 26 % 26)}{chr(97 + index % 26)}" for index in range(cities)]
+    rng = random.Random(7)
+    latencies = {name: rng.expovariate(1 / mean_latency) for name in names}
+    app.extensions["weather_service"].fetch_weather_data = make_upstream(latencies)
+    batch_size = app.config["WEATHER_BATCH_MAX_ITEMS"]
+    batches = [[{"city": name} for name in names[start:start + batch_size]] for start in range(0, cities, batch_size)]
+
+    weather_cache.clear()
+    started = time.perf_counter()
+    for name in names:
+        client.get(f"/weather?city={name}")
+    sequential = time.perf_counter() - started
+
+    weather_cache.clear()
+    started = time.perf_counter()
+    fetched = sum(client.post("/weather/batch", json={"items": items}).get_json()["fetched"] for items in batches)
+    batch = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for items in batches:
+        client.post("/weather/batch", json={"items": items})
+    cached = time.perf_counter() - started
+
+    print(f"{cities} cities, mean upstream latency {mean_latency * 1000:.0f} ms, "
+          f"slowest {max(latencies.values()) * 1000:.0f} ms, {len(batches)} batch request(s)")
+    print(f"one request per city   {sequential * 1000:8.1f} ms")
+    print(f"batch, all misses      {batch * 1000:8.1f} ms  (fetched {fetched})")
+    print(f"batch, all cached      {cached * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Compare cache hit rates of the hour-bucketed keys against TTL-aligned keys.
+
+Replays a synthetic Zipf-distributed request stream through InMemoryCache
+with a simulated clock and reports hit rate, hits that returned the wrong
+unit system, and the worst 10 second miss burst after warm-up.
+
+    python benchmarks/cache_key_hit_rate.py
+"""
+import os
+import random
+import sys
+from collections import Counter
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.cache.memory_cache import InMemoryCache  # noqa: E402
+from app.core.cache.ttl_policy import TTLPolicy  # noqa: E402
+
+CITIES = 300
+REQUESTS_PER_SECOND = 4
+DURATION_SECONDS = 6 * 3600
+WARMUP_SECONDS = 1800
+TIMEOUTS = {'weather': (300, 0), 'forecast': (1800, 0)}
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def legacy_key(data_type, city, unit, now):
+    hour = int(now // 3600) % 24
+    return f"{data_type}:{city}:{hour}"
+
+
+def aligned_key(data_type, city, unit, now):
+    return f"{data_type}:city:{city}:no:{unit}"
+
+
+def replay(make_key, policy, seed=7):
+    rng = random.Random(seed)
+    clock = SimulatedClock()
+    cache = InMemoryCache(clock=clock)
+    weights = [1 / (rank + 1) for rank in range(CITIES)]
+    cities = [f"city{rank}" for rank in range(CITIES)]
+    hits = misses = 0
+    bursts = Counter()
+    wrong_unit = 0
+    for second in range(DURATION_SECONDS):
+        clock.now = float(second)
+        for city in rng.choices(cities, weights, k=REQUESTS_PER_SECOND):
+            data_type = 'forecast' if rng.random() < 0.4 else 'weather'
+            unit = 'imperial' if rng.random() < 0.2 else 'metric'
+            key = make_key(data_type, city, unit, clock.now)
+            cached = cache.get(key)
+            if cached is not None:
+                hits += 1
+                wrong_unit += cached != unit
+                continue
+            misses += 1
+            if second >= WARMUP_SECONDS:
+                bursts[second // 10] += 1
+            timeout, stale_timeout = policy.timeouts(data_type)
+            cache.set(key, unit, timeout, stale_timeout)
+    total = hits + misses
+    return {
+        'hit_rate': hits / total,
+        'correct_hit_rate': (hits - wrong_unit) / total,
+        'upstream_calls': misses,
+        'worst_10s_misses': max(bursts.values()),
+        'wrong_unit_hits': wrong_unit
+    }
+
+
+def main():
+    results = {
+        'hour-bucket keys, fixed TTL': replay(legacy_key, TTLPolicy(TIMEOUTS)),
+        'aligned keys, jittered TTL': replay(aligned_key, TTLPolicy(TIMEOUTS, jitter=0.1, rng=random.Random(1).random))
+    }
+    for name, result in results.items():
+        print(f"{name:30} hit rate {result['hit_rate']:.2%} (correct {result['correct_hit_rate']:.2%})  upstream calls {result['upstream_calls']:6d}  "
+              f"worst 10s misses {result['worst_10s_misses']:4d}  wrong-unit hits {result['wrong_unit_hits']}")
+
+
+if __name__ == "__main__":
+    main()
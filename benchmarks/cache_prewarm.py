@@ -0,0 +1,85 @@
+"""Simulate an hour of skewed traffic with and without the cache pre-warmer.
+
+Runs on a fake clock, so it finishes in seconds. Every simulated second a few
+requests pick a city from a Zipf-like distribution. A request that finds no
+fresh entry counts as a refresh on the request path. With the pre-warmer on,
+the popular cities are refreshed in the background shortly before they go
+stale. The script also prints the largest number of pre-warm refreshes in any
+10 second window, to show that they are spread out rather than bursty.
+
+    python benchmarks/cache_prewarm.py [requests_per_second] [top_n]
+"""
+import os
+import random
+import sys
+from collections import Counter
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.cache import InMemoryCache, InMemoryAnalytics  # noqa: E402
+from app.services.weather import service as service_module  # noqa: E402
+from app.services.weather.lookups import city_lookup  # noqa: E402
+from app.services.weather.prewarm import CachePrewarmer  # noqa: E402
+from app.services.weather.service import DatabaseCache  # noqa: E402
+
+CITIES = [f"By{chr(97 + index // 26)}{chr(97 + index % 26)}" for index in range(300)]
+DURATION = 3600
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def simulate(prewarm, rate, top_n):
+    clock = FakeClock()
+    service_module.weather_cache = InMemoryCache(clock=clock)
+    service_module.analytics = InMemoryAnalytics(clock=clock)
+    weather_service = MagicMock(base_url="http://stub/", api_key="benchmark")
+    weather_service.fetch_lookup.side_effect = lambda lookup: {"name": lookup.cache_key}
+    prewarmer = CachePrewarmer(weather_service, top_n=top_n, clock=clock) if prewarm else None
+    rng = random.Random(3)
+    weights = [1 / (rank + 1) for rank in range(len(CITIES))]
+    request_path = 0
+    refresh_times = []
+    next_plan = 0
+    for second in range(DURATION):
+        clock.now = float(second)
+        if prewarmer is not None:
+            if clock.now >= next_plan:
+                prewarmer.plan()
+                next_plan = clock.now + 60
+            while prewarmer.run_due():
+                refresh_times.append(second)
+        for city in rng.choices(CITIES, weights, k=rate):
+            data_type = "forecast" if rng.random() < 0.3 else "weather"
+            lookup = city_lookup(weather_service, city, "NO", data_type)
+            entry = DatabaseCache.get_entry(lookup.cache_key)
+            if entry is None or not entry.fresh:
+                request_path += 1
+                DatabaseCache.store_result(lookup, weather_service.fetch_lookup(lookup))
+            elif prewarmer is not None:
+                prewarmer.record_hit(lookup.cache_key)
+            service_module.analytics.log_query(city, "NO", "127.0.0.1", 10.0, data_type)
+    windows = Counter(second // 10 for second in refresh_times)
+    return request_path, prewarmer.get_stats() if prewarmer else None, max(windows.values(), default=0)
+
+
+def main():
+    rate = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    top_n = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    baseline, _, _ = simulate(False, rate, top_n)
+    warmed, stats, burst = simulate(True, rate, top_n)
+    print(f"{rate} requests/s for {DURATION} s, top {top_n} cities pre-warmed")
+    print(f"refreshes on the request path without pre-warming  {baseline:6d}")
+    print(f"refreshes on the request path with pre-warming     {warmed:6d}")
+    print(f"background refreshes {stats['refreshes']}, prevented misses {stats['prevented_misses']}, "
+          f"spacing {stats['spacing_seconds']} s, most in any 10 s window {burst}")
+
+
+if __name__ == "__main__":
+    main()
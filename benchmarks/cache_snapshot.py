@@ -0,0 +1,60 @@
+"""Measure cache snapshot size, save time and warm-start load time.
+
+Fills an InMemoryCache with weather-sized and forecast-sized payloads,
+saves a snapshot and loads it back into an empty cache.
+
+    python benchmarks/cache_snapshot.py [weather_entries] [forecast_entries]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.cache.memory_cache import InMemoryCache  # noqa: E402
+from app.core.cache.snapshot import CacheSnapshotter  # noqa: E402
+
+
+def weather_payload(rng, index):
+    return {
+        "coord": {"lon": rng.uniform(-180, 180), "lat": rng.uniform(-60, 70)},
+        "weather": [{"id": 500, "main": "Rain", "description": "lett regn", "icon": "10d"}],
+        "main": {"temp": rng.uniform(-10, 30), "feels_like": rng.uniform(-15, 30), "pressure": 1012,
+                 "humidity": rng.randint(20, 100)},
+        "wind": {"speed": rng.uniform(0, 15), "deg": rng.randint(0, 359)},
+        "dt": 1700000000 + index, "sys": {"country": "NO", "sunrise": 1700000000, "sunset": 1700030000},
+        "name": f"City{index}", "cod": 200
+    }
+
+
+def main():
+    weather_entries = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    forecast_entries = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    rng = random.Random(18)
+    cache = InMemoryCache()
+    for index in range(weather_entries):
+        cache.set(f"weather:city:city{index}:no:metric", weather_payload(rng, index), timeout=300, stale_timeout=1800)
+    for index in range(forecast_entries):
+        forecast = {"city": {"name": f"City{index}"}, "list": [weather_payload(rng, step) for step in range(40)]}
+        cache.set(f"forecast:city:city{index}:no:metric", forecast, timeout=1800, stale_timeout=3600)
+    raw_bytes = sum(size for _, _, _, _, size in cache.export_entries())
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "weather_cache.snapshot.gz")
+        started = time.perf_counter()
+        saved = CacheSnapshotter(cache, path).save()
+        save_seconds = time.perf_counter() - started
+        target = InMemoryCache()
+        snapshotter = CacheSnapshotter(target, path, max_load_seconds=10)
+        loaded = snapshotter.load()
+        stats = snapshotter.get_stats()
+        print(f"entries             {saved} saved, {loaded} loaded")
+        print(f"payload size        {raw_bytes / 1e6:.1f} MB as JSON, {os.path.getsize(path) / 1e6:.1f} MB on disk")
+        print(f"save                {save_seconds * 1e3:.0f} ms")
+        print(f"load                {stats['last_load_seconds'] * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
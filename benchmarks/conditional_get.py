@@ -0,0 +1,52 @@
+"""Measure repeat views of a cached forecast with and without If-None-Match.
+
+Fills the cache with a forecast-sized payload, then requests it repeatedly
+through the Flask test client: once as a plain GET and once revalidating
+with the ETag from the first response. Prints bytes sent and time per request.
+
+    python benchmarks/conditional_get.py [requests]
+"""
+import os
+import sys
+import time
+
+import werkzeug
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("API_KEY", "benchmark-key")
+
+from app import create_app  # noqa: E402
+from app.core.cache import weather_cache  # noqa: E402
+
+FORECAST = {
+    "city": {"name": "Oslo", "country": "NO"},
+    "list": [{"dt": 1700000000 + step * 10800, "main": {"temp": 3.2, "feels_like": 0.4, "humidity": 81},
+              "weather": [{"description": "lett regn", "icon": "10d"}], "wind": {"speed": 4.1, "deg": 200},
+              "dt_txt": "2024-01-01 12:00:00"} for step in range(40)]
+}
+
+
+def measure(client, requests, headers):
+    sent = 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = client.get("/forecast?city=Oslo&country=NO", headers=headers)
+        sent += len(response.data)
+    return sent / requests, (time.perf_counter() - started) / requests
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    if not getattr(werkzeug, "__version__", None):
+        werkzeug.__version__ = "benchmark"
+    app = create_app("testing")
+    weather_cache.set("forecast:city:oslo:no:metric", FORECAST, timeout=1800)
+    client = app.test_client()
+    etag = client.get("/forecast?city=Oslo&country=NO").headers["ETag"]
+    for label, headers in (("plain GET", {}), ("If-None-Match", {"If-None-Match": etag})):
+        size, seconds = measure(client, requests, headers)
+        print(f"{label:<14} {size:8.0f} bytes/response  {seconds * 1e6:7.1f} us/request")
+
+
+if __name__ == "__main__":
+    main()
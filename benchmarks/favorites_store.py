@@ -0,0 +1,88 @@
+"""Compare the indexed favorites store with the previous list-scanning store.
+
+Gives one user a large favorites list and times adds, duplicate checks and
+removes for the old list-based store, the indexed store in memory and the
+indexed store with its append-only log. Also times replaying the log.
+
+    python benchmarks/favorites_store.py [favorites_per_user]
+"""
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.favorites_store import FavoritesStore  # noqa: E402
+
+
+class ListFavorites:
+    def __init__(self):
+        self.favorites = defaultdict(list)
+
+    def get_user_favorites(self, user_ip):
+        return self.favorites.get(user_ip, [])
+
+    def add_favorite(self, user_ip, city, country):
+        favorite = {'city': city, 'country': country, 'added_at': datetime.now(timezone.utc).isoformat()}
+        user_favs = self.favorites[user_ip]
+        for fav in user_favs:
+            if fav['city'].lower() == city.lower() and fav['country'].lower() == country.lower():
+                return False
+        user_favs.append(favorite)
+        return True
+
+    def remove_favorite(self, user_ip, city, country):
+        user_favs = self.favorites[user_ip]
+        for index, fav in enumerate(user_favs):
+            if fav['city'].lower() == city.lower() and fav['country'].lower() == country.lower():
+                del user_favs[index]
+                return True
+        return False
+
+
+def run(store, count):
+    cities = [f"City{index}" for index in range(count)]
+    started = time.perf_counter()
+    for city in cities:
+        store.add_favorite("10.0.0.1", city, "NO")
+    add_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    for city in cities[::10]:
+        store.add_favorite("10.0.0.1", city.lower(), "no")
+    duplicate_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    for city in reversed(cities):
+        store.remove_favorite("10.0.0.1", city, "NO")
+    remove_seconds = time.perf_counter() - started
+    return add_seconds / count, duplicate_seconds / len(cities[::10]), remove_seconds / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "favorites.log")
+        stores = [
+            ("list scan", ListFavorites()),
+            ("indexed", FavoritesStore()),
+            ("indexed + log", FavoritesStore(path, compact_min_records=10 * count)),
+        ]
+        print(f"{count} favorites for one user, microseconds per operation")
+        for name, store in stores:
+            add, duplicate, remove = run(store, count)
+            print(f"{name:<15} add {add * 1e6:8.1f}  duplicate {duplicate * 1e6:8.1f}  remove {remove * 1e6:8.1f}")
+
+        for index in range(count):
+            stores[2][1].add_favorite(f"10.0.{index % 250}.1", f"City{index}", "NO")
+        started = time.perf_counter()
+        replayed = FavoritesStore(path, compact_min_records=10 * count)
+        replay_seconds = time.perf_counter() - started
+        stats = replayed.get_stats()
+        print(f"replay          {stats['log_records']} records, {stats['log_bytes'] / 1e3:.0f} kB in "
+              f"{replay_seconds * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Compare forecast payload size and serialization cost for full, fields= and slim responses.
+
+Fills the cache with a 40-entry OpenWeatherMap-style forecast, then:
+- times rendering the body once (convert units, project, serialize) for each format;
+- requests each format repeatedly through the Flask test client, where the
+  projected bodies come from the render cache after the first request.
+
+    python benchmarks/forecast_projection.py [requests]
+"""
+import json
+import os
+import sys
+import time
+
+import werkzeug
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("API_KEY", "benchmark-key")
+
+from app import create_app  # noqa: E402
+from app.core.cache import weather_cache  # noqa: E402
+from app.utils.projection import apply_projection, parse_projection  # noqa: E402
+from app.utils.units import convert_units  # noqa: E402
+
+FRONTEND_FIELDS = ("list.dt,list.main.temp,list.rain.3h,list.wind.speed,"
+                   "list.weather.0.main,list.weather.0.description,list.weather.0.icon")
+FORECAST = {
+    "cod": "200", "message": 0, "cnt": 40,
+    "city": {"id": 3143244, "name": "Oslo", "coord": {"lat": 59.9127, "lon": 10.7461}, "country": "NO",
+             "population": 1000000, "timezone": 3600, "sunrise": 1700000000, "sunset": 1700030000},
+    "list": [{"dt": 1700000000 + step * 10800,
+              "main": {"temp": 3.2 + step % 7, "feels_like": 0.4, "temp_min": 2.1, "temp_max": 4.8,
+                       "pressure": 1012, "sea_level": 1012, "grnd_level": 1003, "humidity": 81, "temp_kf": 0.6},
+              "weather": [{"id": 500, "main": "Rain", "description": "light rain", "icon": "10d"}],
+              "clouds": {"all": 75}, "wind": {"speed": 4.1, "deg": 200, "gust": 8.3},
+              "visibility": 10000, "pop": 0.42, "rain": {"3h": 0.35}, "sys": {"pod": "d"},
+              "dt_txt": "2024-01-01 12:00:00"} for step in range(40)]
+}
+FORMATS = (("full", ""), ("fields", f"&fields={FRONTEND_FIELDS}"), ("slim", "&format=slim"))
+
+
+def render_once(query, rounds=500):
+    params = dict(pair.split("=", 1) for pair in query.lstrip("&").split("&") if pair)
+    projection, _ = parse_projection(params.get("fields"), params.get("format"))
+    started = time.perf_counter()
+    for _ in range(rounds):
+        body = json.dumps(apply_projection(convert_units(FORECAST, "metric"), projection), separators=(",", ":"))
+    return (time.perf_counter() - started) / rounds, len(body.encode("utf-8"))
+
+
+def measure(client, requests, query):
+    sent = 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(f"/forecast?city=Oslo&country=NO{query}")
+        sent += len(response.data)
+    return sent / requests, (time.perf_counter() - started) / requests
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    if not getattr(werkzeug, "__version__", None):
+        werkzeug.__version__ = "benchmark"
+    app = create_app("testing")
+    weather_cache.set("forecast:city:oslo:no:metric", FORECAST, timeout=1800)
+    client = app.test_client()
+    print(f"{'format':<8} {'bytes':>7} {'render':>11} {'served':>11}")
+    for label, query in FORMATS:
+        render_seconds, _ = render_once(query)
+        size, seconds = measure(client, requests, query)
+        print(f"{label:<8} {size:7.0f} {render_seconds * 1e6:8.1f} us {seconds * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Measure gazetteer load time, memory and suggestion latency.
+
+Uses a GeoNames cities file if one is given, otherwise writes a synthetic
+file in the same format.
+
+    python benchmarks/gazetteer_suggestions.py [cities.txt] [synthetic_rows]
+"""
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.geo.gazetteer import Gazetteer  # noqa: E402
+from app.services.geo.ranking import rank_city_suggestions  # noqa: E402
+
+COUNTRIES = ["NO", "SE", "DK", "DE", "US", "GB", "FR", "JP", "BR", "IN"]
+
+
+def write_synthetic(path, rows, rng):
+    with open(path, "w", encoding="utf-8") as target:
+        for geonameid in range(rows):
+            name = rng.choice(string.ascii_uppercase) + "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+            columns = [str(geonameid), name, name, "", f"{rng.uniform(-60, 70):.5f}", f"{rng.uniform(-180, 180):.5f}",
+                       "P", "PPL", rng.choice(COUNTRIES), "", "01", "", "", "", str(int(rng.paretovariate(1.2) * 1000)),
+                       "", "", "UTC", "2024-01-01"]
+            target.write("\t".join(columns) + "\n")
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def main():
+    rng = random.Random(3)
+    path = sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].isdigit() else None
+    rows = int(sys.argv[-1]) if sys.argv[-1].isdigit() else 150000
+    temp_dir = None
+    if path is None:
+        temp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(temp_dir.name, "cities.txt")
+        write_synthetic(path, rows, rng)
+
+    started = time.perf_counter()
+    gazetteer = Gazetteer.load(path)
+    load_seconds = time.perf_counter() - started
+    del gazetteer
+    tracemalloc.start()
+    gazetteer = Gazetteer.load(path)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    queries = [gazetteer.names[rng.randrange(len(gazetteer))][:rng.randint(2, 6)] for _ in range(5000)]
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        rank_city_suggestions(gazetteer.search(query, limit=25), query, 8)
+        timings.append((time.perf_counter() - started) * 1e6)
+
+    print(f"places            {len(gazetteer)}")
+    print(f"load time         {load_seconds:.2f} s")
+    print(f"memory retained   {current / 1e6:.1f} MB (peak during load {peak / 1e6:.1f} MB)")
+    print(f"approx_bytes      {gazetteer.get_stats()['approx_bytes'] / 1e6:.1f} MB")
+    print(f"suggestion p50    {percentile(timings, 0.5):.0f} us")
+    print(f"suggestion p99    {percentile(timings, 0.99):.0f} us")
+    if temp_dir is not None:
+        temp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Count upstream calls for concurrent cache misses with and without group batching.
+
+Bursts of threads each ask for a different, already-seen city at the same
+time. Without the batcher every miss is its own upstream call; with it the
+misses that arrive within the window share one `group` call. The upstream is
+a stub with a fixed latency; the script also reports the mean per-request time.
+
+    python benchmarks/group_batching.py [burst_size] [bursts] [latency_ms]
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.models.domain import UpstreamLookup  # noqa: E402
+from app.services.weather.group_batcher import GroupBatcher  # noqa: E402
+from app.services.weather.service import WeatherAPIService  # noqa: E402
+
+
+class StubResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+def make_service(batcher, latency, calls):
+    service = WeatherAPIService(api_key="benchmark", base_url="http://stub/", group_batcher=batcher)
+
+    def get(url):
+        calls.append(url)
+        time.sleep(latency)
+        if "group?id=" in url:
+            ids = url.split("group?id=")[1].split("&")[0].split(",")
+            return StubResponse({"cnt": len(ids), "list": [{"id": int(city_id), "name": f"c{city_id}"} for city_id in ids]})
+        city_id = int(url.split("q=c")[1].split(",")[0])
+        return StubResponse({"cod": 200, "id": city_id, "name": f"c{city_id}"})
+
+    service.transport.get = get
+    return service
+
+
+def lookup(city_id):
+    return UpstreamLookup(f"weather:city:c{city_id}:no:metric", f"http://stub/weather?q=c{city_id},NO", "weather", True)
+
+
+def run(batcher, burst_size, bursts, latency):
+    calls = []
+    service = make_service(batcher, latency, calls)
+    for city_id in range(burst_size):
+        service.fetch_lookup(lookup(city_id))
+    calls.clear()
+    elapsed = []
+
+    def request(city_id):
+        started = time.perf_counter()
+        service.fetch_lookup(lookup(city_id))
+        elapsed.append(time.perf_counter() - started)
+
+    for _ in range(bursts):
+        threads = [threading.Thread(target=request, args=(city_id,)) for city_id in range(burst_size)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return len(calls), sum(elapsed) / len(elapsed)
+
+
+def main():
+    burst_size = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    bursts = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    latency = (float(sys.argv[3]) if len(sys.argv) > 3 else 80) / 1000
+    for label, batcher in (("one call per city", None), ("group batching", GroupBatcher(window=0.02))):
+        calls, mean = run(batcher, burst_size, bursts, latency)
+        print(f"{label:<18} {burst_size * bursts} misses  upstream calls {calls:5d}  mean latency {mean * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
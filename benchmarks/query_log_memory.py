@@ -0,0 +1,81 @@
+"""Compare memory per entry of the columnar QueryLog with the old deque of dicts.
+
+Fills both with the same synthetic queries (a few hundred cities, a few
+thousand client IPs) and reports tracemalloc bytes per entry and the time to
+summarize the whole log.
+
+    python benchmarks/query_log_memory.py [entries]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter, deque
+from datetime import datetime, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.query_log import QueryLog  # noqa: E402
+
+ENDPOINTS = ["weather", "forecast", "coords"]
+
+
+def make_queries(count, rng):
+    cities = [(f"City{index}", rng.choice(["NO", "SE", "DK", "US"])) for index in range(300)]
+    ips = [f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}" for _ in range(5000)]
+    for _ in range(count):
+        city, country = rng.choice(cities)
+        yield city, country, rng.choice(ips), rng.uniform(5, 900), rng.choice(ENDPOINTS)
+
+
+def fill_deque(count, rng):
+    queries = deque(maxlen=count)
+    for city, country, user_ip, response_time, endpoint in make_queries(count, rng):
+        queries.append({
+            'city': city,
+            'country': country,
+            'user_ip': user_ip,
+            'response_time_ms': response_time,
+            'endpoint': endpoint,
+            'timestamp': datetime.now(timezone.utc)
+        })
+    return queries
+
+
+def fill_log(count, rng):
+    log = QueryLog(count)
+    for query in make_queries(count, rng):
+        log.append(*query)
+    return log
+
+
+def measure(fill, count, seed):
+    tracemalloc.start()
+    container = fill(count, random.Random(seed))
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return container, used
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    queries, deque_bytes = measure(fill_deque, count, 16)
+    log, log_bytes = measure(fill_log, count, 16)
+
+    started = time.perf_counter()
+    Counter(query['endpoint'] for query in queries)
+    timed = [query['response_time_ms'] for query in queries if query['response_time_ms']]
+    sum(timed) / len(timed)
+    deque_scan = time.perf_counter() - started
+    started = time.perf_counter()
+    log.summarize()
+    log_scan = time.perf_counter() - started
+
+    print(f"entries             {count}")
+    print(f"deque of dicts      {deque_bytes / count:7.0f} bytes/entry  {deque_bytes / 1e6:6.1f} MB  scan {deque_scan * 1e3:6.1f} ms")
+    print(f"columnar QueryLog   {log_bytes / count:7.0f} bytes/entry  {log_bytes / 1e6:6.1f} MB  scan {log_scan * 1e3:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
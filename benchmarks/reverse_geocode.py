@@ -0,0 +1,102 @@
+"""Compare offline reverse geocoding through GridIndex with the upstream path.
+
+Builds a gazetteer (a GeoNames file if given, otherwise a synthetic one),
+then resolves random coordinates
+  * through WeatherAPIService with the grid index
+  * through WeatherAPIService against a local stub of the reverse geocoding
+    API (no network latency, so this is a lower bound for the upstream path)
+
+    python benchmarks/reverse_geocode.py [cities.txt] [synthetic_rows]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from gazetteer_suggestions import percentile, write_synthetic  # noqa: E402
+
+from app.services.geo.gazetteer import Gazetteer  # noqa: E402
+from app.services.geo.spatial_index import GridIndex  # noqa: E402
+from app.services.weather.service import WeatherAPIService  # noqa: E402
+
+
+def start_stub_upstream():
+    body = json.dumps([{"name": "Stub", "country": "NO", "state": ""}]).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def time_lookups(service, points):
+    timings = []
+    for lat, lon in points:
+        started = time.perf_counter()
+        service.reverse_geocode(lat, lon)
+        timings.append((time.perf_counter() - started) * 1e6)
+    return timings
+
+
+def main():
+    rng = random.Random(5)
+    path = sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].isdigit() else None
+    rows = int(sys.argv[-1]) if sys.argv[-1].isdigit() else 150000
+    temp_dir = None
+    if path is None:
+        temp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(temp_dir.name, "cities.txt")
+        write_synthetic(path, rows, rng)
+    gazetteer = Gazetteer.load(path)
+
+    tracemalloc.start()
+    index = GridIndex.from_gazetteer(gazetteer)
+    index_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    points = []
+    for _ in range(2000):
+        record_id = rng.randrange(len(gazetteer))
+        points.append((f"{gazetteer.lats[record_id] + rng.uniform(-0.05, 0.05):.5f}",
+                       f"{gazetteer.lons[record_id] + rng.uniform(-0.05, 0.05):.5f}"))
+
+    server, base_url = start_stub_upstream()
+    local = WeatherAPIService(api_key="benchmark", base_url=base_url, geo_base_url=base_url,
+                              gazetteer=gazetteer, spatial_index=index)
+    upstream = WeatherAPIService(api_key="benchmark", base_url=base_url, geo_base_url=base_url)
+    local_timings = time_lookups(local, points)
+    upstream_timings = time_lookups(upstream, points)
+    server.shutdown()
+
+    print(f"places              {len(gazetteer)}  cells {index.get_stats()['cells']}")
+    print(f"index build         {index.get_stats()['build_seconds']:.2f} s, {index_bytes / 1e6:.1f} MB")
+    print(f"local hits          {local.get_reverse_geocode_stats()['local']} / {len(points)}")
+    print(f"grid index          p50 {percentile(local_timings, 0.5):7.0f} us  p99 {percentile(local_timings, 0.99):7.0f} us")
+    print(f"stub upstream       p50 {percentile(upstream_timings, 0.5):7.0f} us  p99 {percentile(upstream_timings, 0.99):7.0f} us")
+    if temp_dir is not None:
+        temp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
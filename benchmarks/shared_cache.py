@@ -0,0 +1,66 @@
+"""Count upstream calls with per-worker memory caches versus the shared SQLite cache.
+
+Starts several worker processes that each replay the same kind of skewed
+request stream. On a cache miss a worker "calls upstream" (counted) and
+stores the result. Also reports the average lookup latency for both backends.
+
+    python benchmarks/shared_cache.py [workers] [requests_per_worker]
+"""
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.cache.memory_cache import InMemoryCache  # noqa: E402
+from app.core.cache.sqlite_cache import SqliteCache  # noqa: E402
+
+PAYLOAD = {"name": "City", "main": {"temp": 3.2, "humidity": 81}, "weather": [{"description": "lett regn"}]}
+
+
+def run_worker(backend, path, seed, requests, results):
+    rng = random.Random(seed)
+    cache = SqliteCache(path) if backend == "sqlite" else InMemoryCache()
+    upstream_calls = 0
+    lookup_seconds = 0.0
+    for _ in range(requests):
+        key = f"weather:city:city{min(int(rng.paretovariate(1.0)), 2000)}:no:metric"
+        started = time.perf_counter()
+        value = cache.get(key)
+        lookup_seconds += time.perf_counter() - started
+        if value is None:
+            upstream_calls += 1
+            cache.set(key, PAYLOAD, timeout=300)
+    results.put((upstream_calls, lookup_seconds / requests))
+
+
+def run(backend, workers, requests, path):
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    processes = [context.Process(target=run_worker, args=(backend, path, seed, requests, results))
+                 for seed in range(workers)]
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    upstream_calls = sum(calls for calls, _ in collected)
+    latency = sum(seconds for _, seconds in collected) / len(collected)
+    return upstream_calls, latency
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    with tempfile.TemporaryDirectory() as directory:
+        for backend in ("memory", "sqlite"):
+            calls, latency = run(backend, workers, requests, os.path.join(directory, "cache.db"))
+            print(f"{backend:<7} {workers} workers x {requests} requests  upstream calls {calls:6d}  "
+                  f"lookup {latency * 1e6:6.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Compare the single-pass ranking engine with the previous sort-based ranking.
+
+Runs both on 25, 1k and 100k candidates (random names, duplicates and
+missing fields included), checks that they return identical suggestions and
+prints the time per call. The previous implementation is quadratic in the
+number of duplicate names, so the 100k run takes a few minutes and is only
+compared once.
+
+    python benchmarks/suggestion_ranking.py
+"""
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.geo.ranking import rank_city_suggestions  # noqa: E402
+
+COUNTRIES = ["NO", "SE", "DK", "DE", "US", "GB", "FR", "JP", "BR", "IN"]
+
+
+def legacy_rank_city_suggestions(data, query, limit=8):
+    suggestions = []
+    seen_cities = set()
+    seen_names = set()
+    data.sort(key=lambda item: (
+        not item.get('name', '').lower().startswith(query.lower()),
+        item.get('country', '') != 'NO',
+        -(item.get('population', 0) or 0),
+        len(item.get('name', ''))
+    ))
+    for item in data:
+        city_name = item.get('name', '')
+        country = item.get('country', '')
+        state = item.get('state', '')
+        if not city_name or not country:
+            continue
+        unique_key = f"{city_name.lower()}_{country.lower()}_{state.lower()}"
+        if unique_key in seen_cities:
+            continue
+        seen_cities.add(unique_key)
+        city_name_lower = city_name.lower()
+        if city_name_lower in seen_names:
+            existing_countries = [suggestion['country'] for suggestion in suggestions if suggestion['name'].lower() == city_name_lower]
+            if country in existing_countries:
+                continue
+        seen_names.add(city_name_lower)
+        is_exact_match = city_name.lower().startswith(query.lower())
+        relevance_score = 0
+        if is_exact_match:
+            relevance_score += 100
+        if country == 'NO':
+            relevance_score += 50
+        if item.get('population'):
+            relevance_score += min(item.get('population', 0) / 10000, 20)
+        if len(city_name) <= 8:
+            relevance_score += 10
+        if state and state != city_name:
+            display_name = f"{city_name}, {state}, {country}"
+        else:
+            display_name = f"{city_name}, {country}"
+        suggestions.append({
+            'name': city_name,
+            'country': country,
+            'state': state,
+            'lat': item.get('lat'),
+            'lon': item.get('lon'),
+            'is_exact_match': is_exact_match,
+            'relevance_score': relevance_score,
+            'population': item.get('population', 0),
+            'display_name': display_name
+        })
+    suggestions.sort(key=lambda suggestion: suggestion['relevance_score'], reverse=True)
+    final_suggestions = []
+    country_count = {}
+    for suggestion in suggestions:
+        country = suggestion['country']
+        if country_count.get(country, 0) < 3 or len(final_suggestions) < limit // 2:
+            final_suggestions.append(suggestion)
+            country_count[country] = country_count.get(country, 0) + 1
+        if len(final_suggestions) >= limit:
+            break
+    if len(final_suggestions) < limit:
+        for suggestion in suggestions:
+            if suggestion not in final_suggestions:
+                final_suggestions.append(suggestion)
+                if len(final_suggestions) >= limit:
+                    break
+    return final_suggestions[:limit]
+
+
+def make_candidates(count, rng, countries):
+    names = ["Os" + "".join(rng.choices(string.ascii_lowercase, k=rng.randint(0, 9))) for _ in range(max(count // 3, 1))]
+    names += ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))).title() for _ in range(max(count // 3, 1))]
+    candidates = []
+    for _ in range(count):
+        candidates.append({
+            'name': rng.choice(names) if rng.random() > 0.01 else '',
+            'country': rng.choice(countries),
+            'state': rng.choice(['', 'Viken', 'Oslo', 'Bayern']),
+            'lat': round(rng.uniform(-60, 70), 4),
+            'lon': round(rng.uniform(-180, 180), 4),
+            'population': rng.choice([0, None, rng.randint(100, 400000), rng.choice([1000, 50000])])
+        })
+    return candidates
+
+
+def time_call(function, data, query, limit):
+    rounds = max(1, 20000 // len(data))
+    started = time.perf_counter()
+    for _ in range(rounds):
+        result = function(list(data), query, limit)
+    return result, (time.perf_counter() - started) / rounds * 1e6
+
+
+def main():
+    rng = random.Random(13)
+    for size, trials in ((25, 200), (1000, 20), (100000, 0)):
+        for _ in range(trials):
+            countries = COUNTRIES[:rng.randint(1, len(COUNTRIES))]
+            data = make_candidates(size, rng, countries)
+            for limit in (1, 2, 5, 8, 15):
+                expected = legacy_rank_city_suggestions(list(data), "os", limit)
+                assert rank_city_suggestions(data, "os", limit) == expected, (size, limit)
+        data = make_candidates(size, rng, COUNTRIES)
+        expected, legacy = time_call(legacy_rank_city_suggestions, data, "os", 8)
+        result, engine = time_call(rank_city_suggestions, data, "os", 8)
+        assert result == expected
+        print(f"{size:>7} candidates  legacy {legacy:12.0f} us  engine {engine:9.0f} us  "
+              f"identical output ({trials * 5 + 1} checks)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Offer more upstream traffic than the quota allows, with and without the budget.
+
+A stub upstream enforces a per-minute limit with a fixed window and returns
+429 beyond it, like OpenWeatherMap does. Three generators send interactive
+weather calls, autocomplete lookups and background refreshes at a combined
+rate above the limit. The script prints per class how many calls succeeded,
+how many hit a 429 upstream, and how many the budget held back locally.
+
+    python benchmarks/upstream_quota.py [seconds] [quota_per_minute]
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import requests  # noqa: E402
+
+from app.services.weather.quota import AUTOCOMPLETE, BACKGROUND, INTERACTIVE, UpstreamQuota, upstream_priority  # noqa: E402
+from app.services.weather.service import WeatherAPIService  # noqa: E402
+
+RATES = {INTERACTIVE: 8, AUTOCOMPLETE: 6, BACKGROUND: 4}
+NAMES = {INTERACTIVE: "interactive", AUTOCOMPLETE: "autocomplete", BACKGROUND: "background"}
+
+
+class StubUpstream:
+    def __init__(self, per_minute):
+        self.per_second = per_minute / 60
+        self.lock = threading.Lock()
+        self.window = None
+        self.used = 0
+
+    def get(self, url):
+        with self.lock:
+            second = int(time.monotonic())
+            if second != self.window:
+                self.window, self.used = second, 0
+            self.used += 1
+            status = 200 if self.used <= self.per_second else 429
+        response = requests.Response()
+        response.status_code = status
+        response._content = b'[{"name": "Oslo"}]' if "direct" in url else b'{"cod": 200, "name": "Oslo"}'
+        return response
+
+
+def run(quota_per_minute, seconds, budget):
+    service = WeatherAPIService(api_key="benchmark", base_url="http://stub/",
+                                quota=UpstreamQuota(quota_per_minute) if budget else None)
+    service.transport.get = StubUpstream(quota_per_minute).get
+    service.breaker.failure_threshold = 10 ** 9
+    outcomes = Counter()
+    lock = threading.Lock()
+
+    def call(priority):
+        with upstream_priority(priority):
+            if priority == AUTOCOMPLETE:
+                result = service.fetch_suggestion_candidates("Os")
+                outcome = "ok" if result else "held back"
+            else:
+                result = service.fetch_weather_data("http://stub/weather?q=Oslo")
+                outcome = "ok" if "error" not in result else "held back"
+        with lock:
+            outcomes[(priority, outcome)] += 1
+
+    def generator(priority):
+        interval = 1 / RATES[priority]
+        deadline = time.monotonic() + seconds
+        workers = []
+        while time.monotonic() < deadline:
+            worker = threading.Thread(target=call, args=(priority,))
+            worker.start()
+            workers.append(worker)
+            time.sleep(interval)
+        for worker in workers:
+            worker.join()
+
+    rejected = Counter()
+    original = service.transport.get
+
+    def counting_get(url):
+        response = original(url)
+        if response.status_code == 429:
+            rejected[AUTOCOMPLETE if "direct" in url else None] += 1
+        return response
+
+    service.transport.get = counting_get
+    generators = [threading.Thread(target=generator, args=(priority,)) for priority in RATES]
+    for thread in generators:
+        thread.start()
+    for thread in generators:
+        thread.join()
+    return outcomes, sum(rejected.values()), service.get_quota_stats()
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 6
+    quota_per_minute = int(sys.argv[2]) if len(sys.argv) > 2 else 600
+    print(f"offered {sum(RATES.values())} calls/s for {seconds:.0f} s against {quota_per_minute / 60:.0f} calls/s")
+    for budget in (False, True):
+        outcomes, rejected, stats = run(quota_per_minute, seconds, budget)
+        label = "with budget" if budget else "no budget"
+        summary = "  ".join(f"{NAMES[priority]} {outcomes[(priority, 'ok')]}/"
+                            f"{outcomes[(priority, 'ok')] + outcomes[(priority, 'held back')]}"
+                            for priority in RATES)
+        print(f"{label:<12} served {summary}  upstream 429s {rejected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -30,6 +30,25 @@ export const WeatherAPI = {
             });
     },
 
+    fetchBatchWeather(items, unit = 'metric') {
+        return fetch('/weather/batch', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ items, unit })
+        })
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error('Network response was not ok');
+                }
+                return response.json();
+            })
+            .then(data => data.results || [])
+            .catch(error => {
+                console.error('Error fetching batch weather:', error);
+                return [];
+            });
+    },
+
     reverseGeocode(lat, lon, unit) {
         return fetch(`/reverse_geocode?lat=${lat}&lon=${lon}`)
             .then(response => {
@@ -80,6 +80,7 @@ export const Favorites = {
                 <div class="favorite-name">
                     <div class="favorite-star-indicator"></div>
                     <span>${city}</span>
+                    <span class="favorite-temp"></span>
                 </div>
                 <button class="favorite-remove" title="Fjern fra favoritter" data-city="${city}">
                     <span class="remove-text">Fjern</span>
@@ -105,6 +106,35 @@ export const Favorites = {
                 this.updateFavoritesDisplay();
             });
         });
+
+        this.loadFavoriteTemperatures(favoritesList, favorites);
+    },
+
+    splitCity(city) {
+        const cityParts = city.split(', ');
+        if (cityParts.length < 2) {
+            return { city, country: 'NO' };
+        }
+        return {
+            city: cityParts.slice(0, cityParts.length - 1).join(', '),
+            country: cityParts[cityParts.length - 1]
+        };
+    },
+
+    loadFavoriteTemperatures(favoritesList, favorites) {
+        const batchSize = 20;
+        const tempElements = favoritesList.querySelectorAll('.favorite-temp');
+        for (let start = 0; start < favorites.length; start += batchSize) {
+            const items = favorites.slice(start, start + batchSize).map(city => this.splitCity(city));
+            WeatherAPI.fetchBatchWeather(items, 'metric').then(results => {
+                results.forEach((result, index) => {
+                    const tempElement = tempElements[start + index];
+                    if (tempElement && result.data && result.data.main) {
+                        tempElement.textContent = `${Math.round(result.data.main.temp)}°C`;
+                    }
+                });
+            });
+        }
     },
 
     loadFavorites() {
@@ -158,9 +188,7 @@ export const Favorites = {
         const unit = 'metric';
         console.log(`Fetching weather for favorite city: ${city}`);
 
-        const cityParts = city.split(', ');
-        const cityName = cityParts.slice(0, cityParts.length - 1).join(', ');
-        const country = cityParts[cityParts.length - 1];
+        const { city: cityName, country } = this.splitCity(city);
 
         console.log(`Extracted City: ${cityName}, Country: ${country}`);
 
@@ -1,5 +1,15 @@
 import { WeatherTranslations } from '../core/weather-translations.js';
 
+const FORECAST_FIELDS = [
+    'list.dt',
+    'list.main.temp',
+    'list.rain.3h',
+    'list.wind.speed',
+    'list.weather.0.main',
+    'list.weather.0.description',
+    'list.weather.0.icon'
+];
+
 export const WeatherDisplay = {
     init() {
         console.log('Weather Display module initialized');
@@ -166,7 +176,8 @@ export const WeatherDisplay = {
 
     async fetchAndDisplayForecast(city, country) {
         try {
-            const response = await fetch(`/forecast?city=${encodeURIComponent(city)}&country=${country}&unit=metric`);
+            const fields = encodeURIComponent(FORECAST_FIELDS.join(','));
+            const response = await fetch(`/forecast?city=${encodeURIComponent(city)}&country=${country}&unit=metric&fields=${fields}`);
             const forecastData = await response.json();
 
             if (!forecastData.error) {
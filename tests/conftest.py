@@ -6,6 +6,24 @@ import pytest
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture()
+def make_clock():
+    return FakeClock
+
+
 @pytest.fixture()
 def app(monkeypatch):
     monkeypatch.setenv("API_KEY", "test-key")
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("asgiref")
+
+from app.core.cache import weather_cache  # noqa: E402
+
+
+@pytest.fixture()
+def asgi_app(app):
+    from app.asgi import AsyncWeatherApp
+    from app.services.weather.async_service import AsyncWeatherAPIService
+
+    weather_cache.clear()
+    service = AsyncWeatherAPIService(api_key="test-key", base_url="http://upstream.test/")
+    app_instance = AsyncWeatherApp(app, service)
+    yield app_instance
+    weather_cache.clear()
+
+
+def stub_upstream(asgi_app, handler):
+    asgi_app.weather_service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def gather_requests(asgi_app, paths):
+    transport = httpx.ASGITransport(app=asgi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        return await asyncio.gather(*(client.get(path) for path in paths))
+
+
+def test_concurrent_misses_share_one_upstream_call(asgi_app):
+    calls = []
+
+    async def handler(request):
+        calls.append(str(request.url))
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"cod": 200, "name": "Oslo", "main": {"temp": 10}})
+
+    stub_upstream(asgi_app, handler)
+
+    responses = asyncio.run(gather_requests(asgi_app, ["/weather?city=Oslo"] * 10 + ["/weather?city=Oslo&unit=imperial"]))
+
+    assert len(calls) == 1
+    assert "units=metric" in calls[0]
+    assert all(response.status_code == 200 for response in responses)
+    assert responses[0].json()["main"]["temp"] == 10
+    assert responses[-1].json()["main"]["temp"] == 50.0
+
+
+def test_upstream_errors_are_mapped_and_only_not_found_is_cached(asgi_app):
+    async def handler(request):
+        if "Nowhere" in str(request.url):
+            return httpx.Response(404, json={"cod": "404", "message": "city not found"})
+        return httpx.Response(503, json={"cod": 503, "message": "unavailable"})
+
+    stub_upstream(asgi_app, handler)
+
+    missing, failing = asyncio.run(gather_requests(asgi_app, ["/forecast?city=Nowhere", "/forecast?city=Oslo"]))
+
+    assert missing.json() == {"error": "Byen ble ikke funnet"}
+    assert failing.json() == {"error": "HTTP-feil: 503"}
+    assert weather_cache.get("forecast:city:nowhere:no:metric") == {"error": "Byen ble ikke funnet"}
+    assert weather_cache.get("forecast:city:oslo:no:metric") is None
+
+
+def test_validation_and_wsgi_fallback(asgi_app):
+    missing_city, health = asyncio.run(gather_requests(asgi_app, ["/weather", "/health"]))
+
+    assert missing_city.status_code == 400
+    assert health.status_code == 200
+    assert health.json()["status"] == "healthy"
+
+
+def test_async_upstream_calls_spend_the_shared_quota(asgi_app):
+    from app.services.weather.quota import UpstreamQuota
+
+    async def handler(request):
+        if "Bergen" in str(request.url):
+            return httpx.Response(429, json={"cod": 429, "message": "limit"})
+        return httpx.Response(200, json={"cod": 200, "name": "Oslo"})
+
+    stub_upstream(asgi_app, handler)
+    quota = asgi_app.weather_service.quota = UpstreamQuota(per_minute=10)
+
+    oslo, bergen = asyncio.run(gather_requests(asgi_app, ["/weather?city=Oslo", "/weather?city=Bergen"]))
+
+    assert oslo.json()["name"] == "Oslo"
+    assert bergen.json() == {"error": "For mange forespørsler. Prøv igjen senere."}
+    stats = quota.get_stats()
+    assert stats["classes"]["interactive"]["granted"] == 2
+    assert stats["upstream_429"] == 1
+    assert stats["tokens"] < 1
+
+
+def test_async_routes_send_validators_and_apply_projections(asgi_app):
+    weather_cache.set("forecast:city:oslo:no:metric", {"city": {"name": "Oslo"}, "list": [
+        {"dt": 1, "main": {"temp": 0, "humidity": 80}}, {"dt": 2, "main": {"temp": 10, "humidity": 70}}]}, timeout=600)
+
+    full, fields, slim, bad = asyncio.run(gather_requests(asgi_app, [
+        "/forecast?city=Oslo", "/forecast?city=Oslo&fields=list.main.temp", "/forecast?city=Oslo&format=slim",
+        "/forecast?city=Oslo&format=xml"]))
+
+    assert full.json()["city"] == {"name": "Oslo"}
+    assert full.headers["cache-control"].startswith("public, max-age=")
+    assert fields.json() == {"list": [{"main": {"temp": 0}}, {"main": {"temp": 10}}]}
+    assert slim.json()["columns"]["temp"] == [0, 10]
+    assert len({full.headers["etag"], fields.headers["etag"], slim.headers["etag"]}) == 3
+    assert bad.status_code == 400 and "etag" not in bad.headers
+
+    async def revalidate():
+        transport = httpx.ASGITransport(app=asgi_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            return await client.get("/forecast?city=Oslo&format=slim", headers={"If-None-Match": slim.headers["etag"]})
+
+    not_modified = asyncio.run(revalidate())
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == slim.headers["etag"]
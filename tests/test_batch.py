@@ -0,0 +1,39 @@
+import threading
+
+from app.core.batch import BatchExecutor
+
+
+def test_run_all_executes_tasks_concurrently():
+    executor = BatchExecutor(max_workers=4)
+    barrier = threading.Barrier(4, timeout=2)
+
+    def task(value):
+        def run():
+            barrier.wait()
+            return {"value": value}
+        return run
+
+    results = executor.run_all({key: task(key) for key in "abcd"}, fallback={"error": "feil"})
+
+    assert results == {key: {"value": key} for key in "abcd"}
+    assert executor.get_stats() == {"batches": 1, "tasks": 4, "failed": 0, "max_workers": 4}
+
+
+def test_failed_task_returns_fallback():
+    executor = BatchExecutor(max_workers=2)
+
+    def broken():
+        raise RuntimeError("boom")
+
+    results = executor.run_all({"ok": lambda: {"name": "Oslo"}, "broken": broken}, fallback={"error": "feil"})
+
+    assert results == {"ok": {"name": "Oslo"}, "broken": {"error": "feil"}}
+    assert executor.get_stats()["failed"] == 1
+
+
+def test_configure_replaces_pool():
+    executor = BatchExecutor(max_workers=2)
+    executor.configure(max_workers=3)
+
+    assert executor.run_all({"a": lambda: {"a": 1}}, fallback={})["a"] == {"a": 1}
+    assert executor.get_stats()["max_workers"] == 3
@@ -0,0 +1,89 @@
+from app.core.cache.memory_cache import InMemoryCache
+from app.core.cache.snapshot import CacheSnapshotter
+
+
+def make_cache(monotonic):
+    return InMemoryCache(clock=monotonic)
+
+
+def test_snapshot_round_trip_keeps_only_valid_entries(tmp_path, make_clock):
+    path = str(tmp_path / "snapshot.gz")
+    wall = make_clock(1_700_000_000.0)
+    source = make_cache(make_clock(50.0))
+    source.set("fresh", {"name": "Oslo"}, timeout=300)
+    source.set("stale", {"name": "Bergen"}, timeout=10, stale_timeout=600)
+    source.set("short", {"name": "Molde"}, timeout=30)
+    assert CacheSnapshotter(source, path, clock=wall).save() == 3
+
+    wall.now += 60
+    target = make_cache(make_clock(9000.0))
+    snapshotter = CacheSnapshotter(target, path, clock=wall)
+
+    assert snapshotter.load() == 2
+    assert target.get_entry("fresh") == ({"name": "Oslo"}, True, 240)
+    assert target.get_entry("stale").fresh is False
+    assert target.get("short") is None
+    assert snapshotter.get_stats()["skipped_expired"] == 1
+
+
+def test_load_is_bounded_and_tolerates_bad_files(tmp_path, make_clock):
+    path = tmp_path / "snapshot.gz"
+    source = make_cache(make_clock(0.0))
+    for index in range(50):
+        source.set(f"key{index}", index, timeout=300)
+    CacheSnapshotter(source, str(path)).save()
+
+    target = make_cache(make_clock(0.0))
+    snapshotter = CacheSnapshotter(target, str(path), max_load_seconds=0)
+    assert snapshotter.load() == 0
+    assert snapshotter.get_stats()["load_truncated"] is True
+
+    path.write_bytes(b"not a snapshot")
+    assert CacheSnapshotter(target, str(path)).load() == 0
+    assert CacheSnapshotter(target, str(tmp_path / "missing.gz")).load() == 0
+
+
+def test_recency_order_survives_reload(tmp_path, make_clock):
+    path = str(tmp_path / "snapshot.gz")
+    source = make_cache(make_clock(0.0))
+    for key in ("old", "middle", "new"):
+        source.set(key, key, timeout=300)
+    CacheSnapshotter(source, path).save()
+
+    target = InMemoryCache(max_entries=3, clock=make_clock(0.0))
+    CacheSnapshotter(target, path).load()
+    target.set("extra", "extra", timeout=300)
+
+    assert target.get("old") is None
+    assert target.get("new") == "new"
+
+
+def test_background_load_does_not_overwrite_newer_entries(tmp_path, make_clock):
+    path = str(tmp_path / "snapshot.gz")
+    source = make_cache(make_clock(0.0))
+    source.set("oslo", "old", timeout=300)
+    source.set("bergen", "old", timeout=300)
+    CacheSnapshotter(source, path).save()
+
+    target = make_cache(make_clock(0.0))
+    target.set("oslo", "new", timeout=300)
+    snapshotter = CacheSnapshotter(target, path, interval=3600)
+    snapshotter.start()
+    snapshotter._loaded.wait(5)
+    snapshotter.stop()
+
+    assert target.get("oslo") == "new"
+    assert target.get("bergen") == "old"
+    assert snapshotter.get_stats()["loading"] is False
+
+
+def test_stop_before_load_finishes_keeps_the_old_snapshot(tmp_path, make_clock):
+    path = tmp_path / "snapshot.gz"
+    source = make_cache(make_clock(0.0))
+    source.set("oslo", "old", timeout=300)
+    CacheSnapshotter(source, str(path)).save()
+    before = path.read_bytes()
+
+    CacheSnapshotter(make_cache(make_clock(0.0)), str(path)).stop()
+
+    assert path.read_bytes() == before
@@ -0,0 +1,76 @@
+from unittest.mock import MagicMock
+
+import requests
+
+from app.services.weather.circuit_breaker import CircuitBreaker
+from app.services.weather.service import UNAVAILABLE_ERROR, WeatherAPIService
+
+
+def test_breaker_opens_after_threshold_and_probes_half_open(clock):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.allow_request() is True
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow_request() is False
+
+    clock.now += 10
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now += 10
+    assert breaker.allow_request() is True
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.get_state()["opened"] == 2
+
+
+def test_quota_denial_gives_back_half_open_probe(monkeypatch, clock):
+    from app.services.weather.quota import BACKGROUND, UpstreamQuota, upstream_priority
+
+    quota = UpstreamQuota(per_minute=2, clock=clock)
+    service = WeatherAPIService(api_key="test", base_url="http://example.com/", quota=quota,
+                                breaker=CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock))
+    get_mock = MagicMock(side_effect=requests.exceptions.ConnectionError())
+    monkeypatch.setattr(service.session, "get", get_mock)
+    service.fetch_weather_data("http://example.com/weather")
+    quota.exhaust()
+
+    clock.now += 11
+    with upstream_priority(BACKGROUND):
+        assert service.fetch_weather_data("http://example.com/weather") == {"error": "For mange forespørsler. Prøv igjen senere."}
+    assert service.breaker.state == CircuitBreaker.HALF_OPEN
+
+    clock.now += 989
+    get_mock.side_effect = None
+    get_mock.return_value = MagicMock(status_code=200, json=MagicMock(return_value={"name": "Oslo"}))
+    assert service.fetch_weather_data("http://example.com/weather") == {"name": "Oslo"}
+    assert service.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_open_breaker_fails_fast_without_upstream_call(monkeypatch):
+    service = WeatherAPIService(api_key="test", base_url="http://example.com/",
+                                breaker=CircuitBreaker(failure_threshold=1, recovery_timeout=60))
+    get_mock = MagicMock(side_effect=requests.exceptions.ConnectionError())
+    monkeypatch.setattr(service.session, "get", get_mock)
+
+    service.fetch_weather_data("http://example.com/weather")
+    data = service.fetch_weather_data("http://example.com/weather")
+
+    assert data == {"error": UNAVAILABLE_ERROR}
+    assert get_mock.call_count == 1
+
+
+def test_not_found_does_not_trip_breaker(monkeypatch):
+    response = MagicMock(status_code=404)
+    response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=response)
+    service = WeatherAPIService(api_key="test", base_url="http://example.com/",
+                                breaker=CircuitBreaker(failure_threshold=1))
+    monkeypatch.setattr(service.session, "get", lambda url: response)
+
+    service.fetch_weather_data("http://example.com/weather")
+
+    assert service.breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,72 @@
+from app.core.favorites_store import FavoritesStore
+
+
+def test_index_is_case_insensitive_and_keeps_order():
+    store = FavoritesStore()
+
+    assert store.add_favorite("1.1.1.1", "Oslo", "NO")
+    assert store.add_favorite("1.1.1.1", "Bergen", "NO")
+    assert not store.add_favorite("1.1.1.1", "oslo", "no")
+    assert [favorite["city"] for favorite in store.get_user_favorites("1.1.1.1")] == ["Oslo", "Bergen"]
+    assert store.remove_favorite("1.1.1.1", "OSLO", "no")
+    assert not store.remove_favorite("1.1.1.1", "Oslo", "NO")
+    assert store.get_user_favorites("2.2.2.2") == []
+
+
+def test_log_is_replayed_on_restart(tmp_path):
+    path = str(tmp_path / "favorites.log")
+    store = FavoritesStore(path)
+    store.add_favorite("1.1.1.1", "Tromsø", "NO")
+    store.add_favorite("1.1.1.1", "Oslo", "NO")
+    store.remove_favorite("1.1.1.1", "Oslo", "NO")
+    with open(path, "a", encoding="utf-8") as log:
+        log.write('{"op":"add","user":"1.1.1.1","ci')
+
+    restarted = FavoritesStore(path)
+
+    assert [favorite["city"] for favorite in restarted.get_user_favorites("1.1.1.1")] == ["Tromsø"]
+    assert restarted.get_stats()["log_records"] == 3
+
+
+def test_write_after_partial_record_is_not_lost(tmp_path):
+    path = str(tmp_path / "favorites.log")
+    store = FavoritesStore(path)
+    store.add_favorite("1.1.1.1", "Tromsø", "NO")
+    with open(path, "a", encoding="utf-8") as log:
+        log.write('{"op":"add","user":"1.1.1.1","ci')
+
+    assert store.add_favorite("1.1.1.1", "Oslo", "NO") is True
+
+    restarted = FavoritesStore(path)
+    assert [favorite["city"] for favorite in restarted.get_user_favorites("1.1.1.1")] == ["Tromsø", "Oslo"]
+
+
+def test_compaction_rewrites_live_favorites(tmp_path):
+    path = str(tmp_path / "favorites.log")
+    store = FavoritesStore(path, compact_min_records=10)
+    for _ in range(10):
+        store.add_favorite("1.1.1.1", "Oslo", "NO")
+        store.remove_favorite("1.1.1.1", "Oslo", "NO")
+    store.add_favorite("1.1.1.1", "Bergen", "NO")
+
+    stats = store.get_stats()
+    assert stats["compactions"] >= 1
+    assert stats["log_records"] < 10
+    assert FavoritesStore(path).get_user_favorites("1.1.1.1")[0]["city"] == "Bergen"
+
+
+def test_stores_sharing_a_log_see_each_others_changes(tmp_path):
+    path = str(tmp_path / "favorites.log")
+    first = FavoritesStore(path, compact_min_records=4)
+    second = FavoritesStore(path, compact_min_records=4)
+
+    first.add_favorite("1.1.1.1", "Oslo", "NO")
+    assert not second.add_favorite("1.1.1.1", "Oslo", "NO")
+    for city in ("Bergen", "Molde", "Bodø"):
+        second.add_favorite("1.1.1.1", city, "NO")
+        second.remove_favorite("1.1.1.1", city, "NO")
+
+    assert second.get_stats()["compactions"] >= 1
+    assert [favorite["city"] for favorite in first.get_user_favorites("1.1.1.1")] == ["Oslo"]
+    assert first.remove_favorite("1.1.1.1", "Oslo", "NO")
+    assert second.get_user_favorites("1.1.1.1") == []
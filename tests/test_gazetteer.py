@@ -0,0 +1,98 @@
+from app.services.geo.gazetteer import Gazetteer, load_gazetteer
+from app.services.weather.service import WeatherAPIService
+
+ROWS = [
+    ("3143244", "Oslo", "Oslo", "59.91273", "10.74609", "NO", "12", "580000"),
+    ("1853909", "Osaka", "Osaka", "34.69374", "135.50218", "JP", "32", "2592413"),
+    ("3133880", "Tromsø", "Tromso", "69.6489", "18.95508", "NO", "18", "52436"),
+    ("3143000", "Osen", "Osen", "64.3", "10.5", "NO", "21", "900"),
+]
+
+
+def write_geonames(tmp_path):
+    lines = []
+    for geonameid, name, ascii_name, lat, lon, country, admin1, population in ROWS:
+        columns = [geonameid, name, ascii_name, "", lat, lon, "P", "PPL", country, "", admin1,
+                   "", "", "", population, "", "", "Europe/Oslo", "2024-01-01"]
+        lines.append("\t".join(columns))
+    path = tmp_path / "cities.txt"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    (tmp_path / "admin1CodesASCII.txt").write_text("NO.12\tOslo\tOslo\t3143242\n", encoding="utf-8")
+    return str(path)
+
+
+def test_prefix_search_orders_by_population(tmp_path):
+    gazetteer = Gazetteer.load(write_geonames(tmp_path))
+
+    results = gazetteer.search("os")
+
+    assert [place["name"] for place in results] == ["Osaka", "Oslo", "Osen"]
+    assert results[1]["state"] == "Oslo"
+    assert gazetteer.search("os", limit=1)[0]["name"] == "Osaka"
+    assert gazetteer.search("xyz") == []
+
+
+def test_search_matches_ascii_and_accented_names(tmp_path):
+    gazetteer = Gazetteer.load(write_geonames(tmp_path))
+
+    assert gazetteer.search("Tromso")[0]["name"] == "Tromsø"
+    assert gazetteer.search("TROMSØ")[0]["country"] == "NO"
+
+
+def test_load_reports_stats_and_skips_small_places(tmp_path):
+    gazetteer = Gazetteer.load(write_geonames(tmp_path), min_population=1000)
+
+    stats = gazetteer.get_stats()
+    assert stats["entries"] == 3
+    assert stats["approx_bytes"] > 0
+    assert load_gazetteer(str(tmp_path / "missing.txt")) is None
+
+
+def test_suggestions_use_gazetteer_before_upstream(tmp_path):
+    service = WeatherAPIService(api_key="test", base_url="http://example.com/",
+                                gazetteer=Gazetteer.load(write_geonames(tmp_path)))
+
+    suggestions = service.fetch_city_suggestions("Os", limit=2)
+
+    assert [suggestion["name"] for suggestion in suggestions] == ["Oslo", "Osen"]
+    assert suggestions[0]["display_name"] == "Oslo, NO"
+
+
+def test_grid_index_finds_nearest_place_within_threshold(tmp_path):
+    from app.services.geo.spatial_index import GridIndex
+
+    gazetteer = Gazetteer.load(write_geonames(tmp_path))
+    index = GridIndex.from_gazetteer(gazetteer)
+
+    record_id, distance = index.nearest(59.92, 10.76, max_distance_km=15)
+    assert gazetteer.names[record_id] == "Oslo"
+    assert distance < 2
+    assert index.nearest(0.0, 0.0, max_distance_km=50) is None
+
+
+def test_grid_index_wraps_around_the_antimeridian():
+    from array import array
+
+    from app.services.geo.spatial_index import GridIndex
+
+    index = GridIndex(array("d", [-17.7]), array("d", [179.95]))
+
+    assert index.nearest(-17.7, -179.95, max_distance_km=20)[0] == 0
+
+
+def test_reverse_geocode_prefers_local_index(tmp_path, monkeypatch):
+    from unittest.mock import MagicMock
+
+    from app.services.geo.spatial_index import GridIndex
+
+    gazetteer = Gazetteer.load(write_geonames(tmp_path))
+    service = WeatherAPIService(api_key="test", base_url="http://example.com/", gazetteer=gazetteer,
+                                spatial_index=GridIndex.from_gazetteer(gazetteer))
+    response = MagicMock()
+    response.json.return_value = [{"name": "Null Island", "country": "XX"}]
+    monkeypatch.setattr(service.session, "get", MagicMock(return_value=response))
+
+    assert service.reverse_geocode("59.92", "10.76") == {"city": "Oslo", "country": "NO", "state": "Oslo"}
+    assert service.reverse_geocode("0", "0")["city"] == "Null Island"
+    assert service.get_reverse_geocode_stats()["local"] == 1
+    assert service.get_reverse_geocode_stats()["upstream"] == 1
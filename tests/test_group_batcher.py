@@ -0,0 +1,64 @@
+import threading
+
+from app.services.weather.group_batcher import GroupBatcher
+
+
+def weather(city_id, name):
+    return {"id": city_id, "name": name, "main": {"temp": 5}}
+
+
+def test_unknown_city_is_fetched_alone_and_its_id_remembered():
+    batcher = GroupBatcher(window=0.01)
+    group_calls = []
+
+    data = batcher.fetch("weather:city:oslo:no:metric", lambda: weather(3143244, "Oslo"), group_calls.append)
+
+    assert data["name"] == "Oslo"
+    assert group_calls == []
+    assert batcher.city_id("weather:city:oslo:no:metric") == 3143244
+
+
+def test_concurrent_known_cities_share_one_group_call():
+    batcher = GroupBatcher(window=0.5, max_group=3)
+    cities = {"oslo": 1, "bergen": 2, "trondheim": 3}
+    for name, city_id in cities.items():
+        batcher.remember(f"weather:city:{name}:no:metric", weather(city_id, name))
+    group_calls = []
+
+    def fetch_group(ids):
+        group_calls.append(sorted(ids))
+        return {"cnt": len(ids), "list": [weather(city_id, name) for name, city_id in cities.items()]}
+
+    results = {}
+
+    def request(name):
+        results[name] = batcher.fetch(f"weather:city:{name}:no:metric", lambda: {"error": "ikke brukt"}, fetch_group)
+
+    threads = [threading.Thread(target=request, args=(name,)) for name in cities]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=2)
+
+    assert group_calls == [[1, 2, 3]]
+    assert {name: data["id"] for name, data in results.items()} == cities
+    stats = batcher.get_stats()
+    assert (stats["group_calls"], stats["grouped"], stats["calls_saved"]) == (1, 3, 2)
+
+
+def test_failed_or_partial_group_falls_back_to_single_calls():
+    batcher = GroupBatcher(window=0.001)
+    batcher.remember("weather:city:oslo:no:metric", weather(1, "Oslo"))
+
+    data = batcher.fetch("weather:city:oslo:no:metric", lambda: weather(1, "Oslo"),
+                         lambda ids: {"error": "For mange forespørsler. Prøv igjen senere."})
+
+    assert data["name"] == "Oslo"
+    assert batcher.get_stats()["fallbacks"] == 1
+
+
+def test_error_payloads_are_not_remembered():
+    batcher = GroupBatcher()
+    batcher.remember("weather:city:atlantis:no:metric", {"error": "Byen ble ikke funnet", "id": 9})
+
+    assert batcher.city_id("weather:city:atlantis:no:metric") is None
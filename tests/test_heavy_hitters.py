@@ -0,0 +1,53 @@
+from app.core.cache.memory_cache import InMemoryAnalytics
+from app.core.heavy_hitters import SpaceSaving
+
+
+def test_tracks_exact_counts_below_capacity():
+    counter = SpaceSaving(capacity=10)
+    for key in ["Oslo"] * 5 + ["Bergen"] * 3 + ["Molde"]:
+        counter.offer(key)
+
+    assert counter.top(2) == [("Oslo", 5, 0), ("Bergen", 3, 0)]
+
+
+def test_memory_is_bounded_and_heavy_hitters_survive_noise():
+    counter = SpaceSaving(capacity=20)
+    for index in range(2000):
+        counter.offer("Oslo" if index % 4 == 0 else f"junk-{index}")
+
+    top_city, count, error = counter.top(1)[0]
+    stats = counter.get_stats()
+    assert len(counter) == 20
+    assert top_city == "Oslo"
+    assert count - error <= 500 <= count
+    assert error <= stats["max_error"] == 2000 / 20
+
+
+def test_decay_prefers_recent_queries(clock):
+    counter = SpaceSaving(capacity=10, half_life=60, clock=clock)
+    for _ in range(8):
+        counter.offer("Oslo")
+    clock.now += 300
+    for _ in range(2):
+        counter.offer("Bergen")
+
+    top = counter.top(2)
+    assert [city for city, _, _ in top] == ["Bergen", "Oslo"]
+    assert abs(top[1][1] - 8 / 32) < 1e-9
+
+
+def test_decay_rescales_without_changing_counts(clock):
+    counter = SpaceSaving(capacity=10, half_life=1, clock=clock)
+    counter.offer("Oslo")
+    clock.now += 100
+    counter.offer("Oslo")
+
+    assert abs(counter.top(1)[0][1] - 1) < 1e-9
+
+
+def test_popular_cities_shape():
+    analytics = InMemoryAnalytics()
+    analytics.log_query("Oslo", "NO", "127.0.0.1", 10, "weather")
+    analytics.log_query("Oslo", "NO", "127.0.0.1", 10, "weather")
+
+    assert analytics.get_popular_cities() == [{"city": "Oslo, NO", "count": 2, "error": 0}]
@@ -0,0 +1,113 @@
+import threading
+
+from app.core.cache.memory_cache import InMemoryCache
+
+
+def test_get_returns_value_until_expiry(clock):
+    cache = InMemoryCache(clock=clock)
+    cache.set("key", {"name": "Oslo"}, timeout=10)
+
+    assert cache.get("key") == {"name": "Oslo"}
+    clock.now += 10
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction_respects_entry_budget():
+    cache = InMemoryCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_byte_budget_evicts_oldest_and_rejects_oversized():
+    cache = InMemoryCache(max_bytes=40)
+    cache.set("a", "x" * 15)
+    cache.set("b", "y" * 15)
+    cache.set("c", "z" * 15)
+
+    assert cache.get("a") is None
+    assert cache.get_stats()["bytes"] <= 40
+    assert cache.set("huge", "w" * 100) is False
+    assert cache.get("huge") is None
+
+
+def test_clear_expired_only_pops_expired_entries(clock):
+    cache = InMemoryCache(clock=clock)
+    cache.set("short", 1, timeout=5)
+    cache.set("long", 2, timeout=50)
+    cache.set("short", 3, timeout=60)
+    cache.set("other", 4, timeout=5)
+    clock.now += 10
+
+    assert cache.clear_expired() == 1
+    assert cache.get("short") == 3
+    assert cache.get("long") == 2
+
+
+def test_clear_returns_count():
+    cache = InMemoryCache()
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.clear() == 2
+    assert cache.get_stats()["bytes"] == 0
+
+
+def test_concurrent_writers_stay_within_budget():
+    cache = InMemoryCache(max_entries=50)
+
+    def writer(offset):
+        for index in range(500):
+            cache.set(f"{offset}:{index}", index)
+            cache.get(f"{offset}:{index - 1}")
+
+    threads = [threading.Thread(target=writer, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache) == 50
+
+
+def test_stale_window_serves_entry_until_hard_expiry(clock):
+    cache = InMemoryCache(clock=clock)
+    cache.set("key", "value", timeout=10, stale_timeout=20)
+
+    assert cache.get_entry("key") == ("value", True, 10)
+    clock.now += 15
+    assert cache.get("key") is None
+    assert cache.get_entry("key") == ("value", False, 0)
+    clock.now += 15
+    assert cache.get_entry("key") is None
+    assert cache.get_stats()["stale_hits"] == 1
+
+
+def test_fresh_ttl_does_not_count_as_lookup(clock):
+    cache = InMemoryCache(clock=clock)
+    cache.set("key", {"name": "Oslo"}, timeout=10, stale_timeout=20)
+
+    assert cache.fresh_ttl("key") == 10
+    clock.now += 15
+    assert cache.fresh_ttl("key") == -5
+    clock.now += 20
+    assert cache.fresh_ttl("key") is None
+    assert cache.fresh_ttl("missing") is None
+    assert cache.get_stats()["hits"] == cache.get_stats()["misses"] == 0
+
+
+def test_entries_carry_a_stable_content_hash():
+    cache = InMemoryCache()
+    cache.set("a", {"name": "Oslo", "main": {"temp": 10}})
+    cache.set("b", {"name": "Oslo", "main": {"temp": 10}})
+    cache.set("c", {"name": "Oslo", "main": {"temp": 11}})
+
+    assert cache.get_entry("a").etag == cache.get_entry("b").etag
+    assert cache.get_entry("a").etag != cache.get_entry("c").etag
@@ -0,0 +1,62 @@
+from app.core.cache.memory_cache import InMemoryAnalytics
+from app.core.metrics import LatencyHistogram, LatencyRollups
+
+
+def test_histogram_percentiles_within_relative_error():
+    histogram = LatencyHistogram()
+    for value in range(1, 1001):
+        histogram.record(float(value))
+
+    summary = histogram.summary()
+    assert summary["count"] == 1000
+    assert summary["avg_ms"] == 500.5
+    assert abs(summary["p50_ms"] - 500) <= 500 * 0.05
+    assert abs(summary["p99_ms"] - 990) <= 990 * 0.05
+    assert summary["max_ms"] == 1000
+
+
+def test_rollups_window_and_hourly_downsampling(clock):
+    rollups = LatencyRollups(minute_buckets=60, hour_buckets=24, clock=clock)
+    rollups.record("weather", 100)
+    clock.now += 3 * 3600
+    rollups.record("weather", 10)
+    rollups.record("forecast", 20)
+
+    recent = rollups.summary(window=300)
+    assert recent["overall"]["count"] == 2
+    assert set(recent["endpoints"]) == {"forecast", "weather"}
+    assert recent["buckets"][-1]["resolution_seconds"] == 60
+
+    day = rollups.summary(window=86400)
+    assert day["overall"]["count"] == 3
+    assert day["buckets"][0]["resolution_seconds"] == 3600
+    assert rollups.summary()["overall"]["count"] == 3
+
+    clock.now += 25 * 3600
+    assert rollups.summary(window=86400)["overall"]["count"] == 0
+    assert rollups.summary()["overall"]["count"] == 3
+
+
+def test_rolled_up_hours_outside_the_window_are_not_counted(clock):
+    clock.now = 1_700_000_000 // 3600 * 3600 + 9 * 3600
+    rollups = LatencyRollups(minute_buckets=60, hour_buckets=24, clock=clock)
+    rollups.record("weather", 100)
+    clock.now += 3600 + 30 * 60
+    rollups.record("weather", 10)
+
+    assert rollups.summary(window=3600)["overall"]["count"] == 1
+    assert rollups.summary(window=2 * 3600)["overall"]["count"] == 2
+    clock.now += 2 * 3600
+    assert rollups.summary(window=2 * 3600)["overall"]["count"] == 1
+    assert rollups.summary(window=4 * 3600)["overall"]["count"] == 2
+
+
+def test_analytics_average_tracks_sliding_window_incrementally():
+    analytics = InMemoryAnalytics(query_log_capacity=5, avg_window=3)
+    for response_time in (10, 20, 30, 40):
+        analytics.log_query("Oslo", "NO", "127.0.0.1", response_time, "weather")
+
+    stats = analytics.get_query_stats()
+    assert stats["total_queries"] == 4
+    assert stats["avg_response_time"] == 30
+    assert analytics.get_latency_stats()["endpoints"]["weather"]["count"] == 4
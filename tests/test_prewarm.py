@@ -0,0 +1,72 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.cache import InMemoryCache
+from app.services.weather import prewarm, service as service_module
+from app.services.weather.prewarm import CachePrewarmer
+
+
+@pytest.fixture(autouse=True)
+def popular_cities(clock, monkeypatch):
+    monkeypatch.setattr(service_module, "weather_cache", InMemoryCache(clock=clock))
+    monkeypatch.setattr(prewarm.WeatherAnalytics, "get_popular_cities", MagicMock(return_value=[
+        {"city": "Oslo, NO", "count": 9, "error": 0},
+        {"city": "Bergen, NO", "count": 4, "error": 0},
+        {"city": "Unknown, Unknown", "count": 2, "error": 0},
+        {"city": "Molde, ", "count": 1, "error": 0}
+    ]))
+
+
+def make_prewarmer(clock):
+    weather_service = MagicMock(base_url="http://example.com/", api_key="test")
+    weather_service.fetch_lookup.side_effect = lambda lookup: {"name": lookup.cache_key}
+    return CachePrewarmer(weather_service, top_n=3, lead=30, plan_interval=60, clock=clock), weather_service
+
+
+def test_plan_targets_weather_and_forecast_for_popular_cities(clock):
+    prewarmer, _ = make_prewarmer(clock)
+
+    assert prewarmer.plan() == 4
+    stats = prewarmer.get_stats()
+    assert stats["scheduled"] == 4
+    assert stats["spacing_seconds"] > 0
+
+
+def test_refreshes_are_paced_and_rescheduled_before_expiry(clock):
+    prewarmer, weather_service = make_prewarmer(clock)
+    prewarmer.plan()
+
+    assert prewarmer.run_due() is True
+    assert prewarmer.run_due() is False
+    assert prewarmer.next_wakeup() > clock.now
+    clock.now = prewarmer.next_wakeup()
+    assert prewarmer.run_due() is True
+    assert weather_service.fetch_lookup.call_count == 2
+    lookup = weather_service.fetch_lookup.call_args.args[0]
+    timeout, _ = service_module.DatabaseCache.get_timeouts(lookup.data_type)
+    assert service_module.DatabaseCache.get_fresh_ttl(lookup.cache_key) == pytest.approx(timeout)
+
+
+def test_fresh_entries_wait_until_lead_time_and_prevented_misses_are_counted(clock):
+    prewarmer, weather_service = make_prewarmer(clock)
+    oslo = "weather:city:oslo:no:metric"
+    service_module.DatabaseCache.set(oslo, {"name": "Oslo"}, timeout=300)
+    prewarmer.plan()
+    for _ in range(3):
+        clock.now = prewarmer.next_wakeup()
+        assert prewarmer.run_due() is True
+    refreshed = [call.args[0].cache_key for call in weather_service.fetch_lookup.call_args_list]
+    assert oslo not in refreshed
+    assert prewarmer.next_wakeup() == pytest.approx(1000 + 300 - 30)
+
+    clock.now = prewarmer.next_wakeup()
+    assert prewarmer.run_due() is True
+    assert weather_service.fetch_lookup.call_args.args[0].cache_key == oslo
+
+    prewarmer.record_hit(oslo)
+    assert prewarmer.get_stats()["prevented_misses"] == 0
+    clock.now = 1000 + 300
+    prewarmer.record_hit(oslo)
+    prewarmer.record_hit(oslo)
+    assert prewarmer.get_stats()["prevented_misses"] == 1
@@ -0,0 +1,36 @@
+from app.core.query_log import QueryLog
+
+
+def test_ring_buffer_keeps_latest_entries():
+    log = QueryLog(capacity=3)
+    for index in range(5):
+        log.append(f"City{index}", "NO", "127.0.0.1", float(index) or None, "weather", timestamp=1000.0 + index)
+
+    entries = list(log.entries())
+    assert len(log) == 3
+    assert [entry["city"] for entry in entries] == ["City2", "City3", "City4"]
+    assert entries[-1]["response_time_ms"] == 4.0
+    assert entries[-1]["timestamp"].timestamp() == 1004.0
+    assert log.latency(0) == 4.0
+    assert log.latency(3) is None
+
+
+def test_interned_strings_are_released_with_evicted_entries():
+    log = QueryLog(capacity=2)
+    for index in range(100):
+        log.append(f"junk-{index}", "NO", "10.0.0.1", 5.0, "weather")
+
+    stats = log.get_stats()
+    assert stats["interned"] == {"city": 2, "country": 1, "user_ip": 1, "endpoint": 1}
+    assert stats["approx_bytes"] == 2 * (8 + 8 + 4 * 4)
+
+
+def test_summarize_scans_window():
+    log = QueryLog(capacity=10)
+    log.append("Oslo", "NO", "1", 30.0, "weather", timestamp=100.0)
+    log.append("Oslo", "NO", "1", 10.0, "forecast", timestamp=200.0)
+    log.append("Oslo", "NO", "1", None, "weather", timestamp=300.0)
+
+    summary = log.summarize(since=150.0)
+    assert summary == {"queries": 2, "avg_response_time": 10.0, "endpoints": {"forecast": 1, "weather": 1}}
+    assert log.summarize()["queries"] == 3
@@ -0,0 +1,96 @@
+import threading
+import time
+
+from app.services.weather.quota import (
+    AUTOCOMPLETE,
+    BACKGROUND,
+    INTERACTIVE,
+    UpstreamQuota,
+    current_priority,
+    upstream_priority,
+)
+
+
+def test_lower_priorities_keep_a_reserve_for_interactive_calls(clock):
+    quota = UpstreamQuota(per_minute=10, clock=clock)
+
+    granted = sum(quota.acquire(BACKGROUND) for _ in range(10))
+    assert granted == 5
+    assert sum(quota.acquire(INTERACTIVE) for _ in range(5)) == 5
+    stats = quota.get_stats()
+    assert stats["classes"]["background"] == {"granted": 5, "deferred": 0, "dropped": 5}
+    assert stats["tokens"] == 0
+
+
+def test_tokens_refill_at_the_per_minute_rate(clock):
+    quota = UpstreamQuota(per_minute=60, clock=clock)
+    for _ in range(60):
+        assert quota.acquire(INTERACTIVE)
+
+    clock.now += 30
+    assert quota.get_stats()["tokens"] == 30
+    assert quota.acquire(AUTOCOMPLETE)
+
+
+def test_interactive_call_waits_for_a_token_instead_of_failing():
+    quota = UpstreamQuota(per_minute=600)
+    quota.exhaust()
+
+    started = time.monotonic()
+    assert quota.acquire(INTERACTIVE)
+    assert time.monotonic() - started < 1
+    assert quota.get_stats()["classes"]["interactive"]["deferred"] == 1
+    assert quota.get_stats()["upstream_429"] == 1
+
+
+def test_waiting_interactive_call_is_served_before_autocomplete():
+    quota = UpstreamQuota(per_minute=60)
+    quota.exhaust()
+    order = []
+
+    def wait_for(priority):
+        if quota.acquire(priority):
+            order.append(priority)
+
+    autocomplete = threading.Thread(target=wait_for, args=(AUTOCOMPLETE,))
+    autocomplete.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=wait_for, args=(INTERACTIVE,))
+    interactive.start()
+    interactive.join(timeout=3)
+    autocomplete.join(timeout=3)
+
+    assert order == [INTERACTIVE]
+    assert quota.get_stats()["classes"]["autocomplete"]["dropped"] == 1
+
+
+def test_priority_context_defaults_to_interactive():
+    assert current_priority() == INTERACTIVE
+    with upstream_priority(BACKGROUND):
+        assert current_priority() == BACKGROUND
+    assert current_priority() == INTERACTIVE
+
+
+def test_multi_id_calls_and_retries_cost_extra_tokens(clock):
+    quota = UpstreamQuota(per_minute=10, clock=clock)
+
+    assert quota.acquire(INTERACTIVE, cost=4)
+    assert quota.get_stats()["tokens"] == 6
+    quota.charge(2)
+    assert quota.get_stats()["tokens"] == 4
+    assert not quota.acquire(BACKGROUND, cost=3)
+    assert quota.get_stats()["retries_charged"] == 2
+
+    clock.now += 60
+    assert quota.acquire(INTERACTIVE, cost=30)
+    assert quota.get_stats()["tokens"] == -20
+
+
+def test_multi_token_call_is_dropped_instead_of_queueing_ahead_of_single_calls(clock):
+    quota = UpstreamQuota(per_minute=30, clock=clock)
+    quota.charge(25)
+
+    assert not quota.acquire(INTERACTIVE, cost=10)
+    assert quota.get_stats()["waiting"]["interactive"] == 0
+    assert quota.acquire(INTERACTIVE)
+    assert quota.get_stats()["classes"]["interactive"] == {"granted": 1, "deferred": 0, "dropped": 1}
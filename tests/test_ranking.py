@@ -0,0 +1,49 @@
+from app.services.geo.ranking import RankingWeights, rank_city_suggestions
+
+
+def place(name, country, population=0, state=""):
+    return {"name": name, "country": country, "state": state, "lat": 1.0, "lon": 2.0, "population": population}
+
+
+def test_prefers_exact_home_country_matches_and_dedupes():
+    data = [
+        place("Bergen", "DE", 5000),
+        place("Oslo", "NO", 580000),
+        place("oslo", "NO", 10, "Viken"),
+        place("Oslo", "US", 300),
+        place("", "NO", 99999),
+    ]
+
+    suggestions = rank_city_suggestions(data, "os")
+
+    assert [(s["name"], s["country"]) for s in suggestions] == [("Oslo", "NO"), ("Oslo", "US"), ("Bergen", "DE")]
+    assert suggestions[0]["relevance_score"] == 100 + 50 + 20 + 10
+    assert suggestions[0]["display_name"] == "Oslo, NO"
+    assert len(data) == 5 and data[0]["name"] == "Bergen"
+
+
+def test_per_country_quota_after_first_half():
+    data = [place(f"Os{index}", "US", 100000 - index) for index in range(6)] + [place("Osby", "SE", 10)]
+
+    suggestions = rank_city_suggestions(data, "os", limit=4)
+
+    assert [s["name"] for s in suggestions] == ["Os0", "Os1", "Os2", "Osby"]
+
+
+def test_fills_with_best_remaining_when_quota_leaves_gaps():
+    data = [place(f"Os{index}", "US", 100000 - index) for index in range(6)]
+
+    suggestions = rank_city_suggestions(data, "os", limit=5)
+
+    assert [s["name"] for s in suggestions] == ["Os0", "Os1", "Os2", "Os3", "Os4"]
+    assert rank_city_suggestions(data, "os", limit=0) == []
+
+
+def test_weights_are_configurable():
+    data = [place("Oslo", "NO", 1000), place("Osaka", "JP", 1000)]
+    weights = RankingWeights(home_country_code="JP")
+
+    suggestions = rank_city_suggestions(data, "os", weights=weights)
+
+    assert [s["name"] for s in suggestions] == ["Osaka", "Oslo"]
+    assert suggestions[0]["relevance_score"] == 100 + 50 + 0.1 + 10
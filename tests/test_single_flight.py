@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.single_flight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        release.wait(timeout=2)
+        return {"name": "Oslo"}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flights.do("weather:oslo", loader))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 2
+    while flights.get_stats()["coalesced"] < 4 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=2)
+
+    assert len(calls) == 1
+    assert results == [{"name": "Oslo"}] * 5
+    stats = flights.get_stats()
+    assert stats["executed"] == 1
+    assert stats["coalesced"] == 4
+    assert stats["in_flight"] == 0
+
+
+def test_sequential_calls_are_not_coalesced():
+    flights = SingleFlight()
+
+    assert flights.do("key", lambda: 1) == 1
+    assert flights.do("key", lambda: 2) == 2
+    assert flights.get_stats()["executed"] == 2
+
+
+def test_errors_propagate_and_release_key():
+    flights = SingleFlight()
+
+    def failing():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flights.do("key", failing)
+
+    assert flights.in_flight() == 0
+    assert flights.do("key", lambda: "ok") == "ok"
+
+
+def test_cancelled_async_leader_does_not_cancel_followers():
+    flights = AsyncSingleFlight()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"name": "Oslo"}
+
+    async def scenario():
+        leader = asyncio.ensure_future(flights.do("weather:oslo", loader))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.do("weather:oslo", loader))
+        await asyncio.sleep(0)
+        leader.cancel()
+        result = await follower
+        await asyncio.sleep(0)
+        return leader.cancelled(), result
+
+    leader_cancelled, result = asyncio.run(scenario())
+
+    assert leader_cancelled is True
+    assert result == {"name": "Oslo"}
+    assert len(calls) == 1
+    assert flights.get_stats()["in_flight"] == 0
@@ -0,0 +1,69 @@
+import multiprocessing
+
+from app.core.cache.sqlite_cache import SqliteCache
+from app.services.weather.service import DatabaseCache
+
+
+def write_from_other_process(path):
+    SqliteCache(path).set("weather:city:oslo:no:metric", {"name": "Oslo"}, timeout=60)
+
+
+def test_fresh_stale_and_expired_entries(tmp_path, clock):
+    cache = SqliteCache(str(tmp_path / "cache.db"), clock=clock)
+    cache.set("key", {"name": "Oslo"}, timeout=10, stale_timeout=20)
+
+    assert cache.get_entry("key") == ({"name": "Oslo"}, True, 10)
+    clock.now += 15
+    assert cache.get("key") is None
+    assert cache.get_entry("key").fresh is False
+    clock.now += 20
+    assert cache.get_entry("key") is None
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["stale_hits"], stats["expirations"]) == (1, 1, 1)
+
+
+def test_evicts_least_recently_used_over_budget(tmp_path, clock):
+    cache = SqliteCache(str(tmp_path / "cache.db"), max_entries=2, clock=clock)
+    cache.set("a", 1)
+    clock.now += 60
+    cache.set("b", 2)
+    clock.now += 60
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_entries_are_shared_between_processes(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = SqliteCache(path)
+    process = multiprocessing.get_context("spawn").Process(target=write_from_other_process, args=(path,))
+    process.start()
+    process.join(30)
+
+    assert process.exitcode == 0
+    assert cache.get("weather:city:oslo:no:metric") == {"name": "Oslo"}
+
+
+def test_database_cache_uses_selected_backend(tmp_path):
+    cache = SqliteCache(str(tmp_path / "cache.db"))
+    DatabaseCache.use_backend(cache)
+    try:
+        DatabaseCache.set("key", {"name": "Oslo"}, timeout=60)
+        assert cache.get("key") == {"name": "Oslo"}
+        assert DatabaseCache.get_stats()["backend"] == "sqlite"
+    finally:
+        from app.core.cache import weather_cache
+        DatabaseCache.use_backend(weather_cache)
+
+
+def test_fresh_ttl_matches_memory_backend(tmp_path, clock):
+    cache = SqliteCache(str(tmp_path / "cache.db"), clock=clock)
+    cache.set("key", {"name": "Oslo"}, timeout=10, stale_timeout=20)
+
+    assert cache.fresh_ttl("key") == 10
+    clock.now += 30
+    assert cache.fresh_ttl("key") is None
+    assert cache.get_stats()["misses"] == 0
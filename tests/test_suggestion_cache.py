@@ -0,0 +1,62 @@
+from unittest.mock import MagicMock
+
+from app.core.cache.suggestion_cache import SuggestionCache
+from app.services.weather.service import WeatherAPIService
+
+CANDIDATES = [
+    {"name": "Trondheim", "country": "NO", "population": 200000},
+    {"name": "Tromsø", "country": "NO", "population": 77000},
+    {"name": "Tranby", "country": "NO", "population": 6000},
+]
+
+
+def test_longer_prefix_is_derived_from_complete_parent():
+    cache = SuggestionCache()
+    cache.store("Tr", CANDIDATES, complete=True)
+
+    assert [c["name"] for c in cache.lookup("Tro")] == ["Trondheim", "Tromsø"]
+    assert [c["name"] for c in cache.lookup("troms")] == ["Tromsø"]
+    assert cache.lookup("Tr") == CANDIDATES
+
+    stats = cache.get_stats()["by_prefix_length"]
+    assert stats["2"]["hits"] == 1
+    assert stats["3"]["derived"] == 1
+    assert stats["5"]["derived"] == 1
+
+
+def test_incomplete_parent_or_empty_filter_is_a_miss():
+    cache = SuggestionCache()
+    cache.store("Tr", CANDIDATES, complete=False)
+    assert cache.lookup("Tro") is None
+
+    cache.store("Os", [{"name": "Oslo", "country": "NO"}], complete=True)
+    assert cache.lookup("Ose") is None
+    assert cache.get_stats()["by_prefix_length"]["3"]["misses"] == 2
+
+
+def test_service_reuses_cached_gazetteer_prefix_without_searching_again():
+    gazetteer = MagicMock()
+    gazetteer.search.return_value = [dict(candidate) for candidate in CANDIDATES]
+    service = WeatherAPIService(api_key="test", base_url="http://example.com/", gazetteer=gazetteer)
+
+    first = service.fetch_city_suggestions("Tr")
+    second = service.fetch_city_suggestions("Tron")
+
+    assert len(first) == 3
+    assert [suggestion["name"] for suggestion in second] == ["Trondheim"]
+    assert gazetteer.search.call_count == 1
+
+
+def test_upstream_suggestions_are_only_reused_for_the_same_query(monkeypatch):
+    service = WeatherAPIService(api_key="test", base_url="http://example.com/")
+    response = MagicMock()
+    response.json.return_value = [dict(candidate) for candidate in CANDIDATES]
+    get_mock = MagicMock(return_value=response)
+    monkeypatch.setattr(service.session, "get", get_mock)
+
+    service.fetch_city_suggestions("Tr")
+    service.fetch_city_suggestions("tr")
+    assert get_mock.call_count == 1
+
+    service.fetch_city_suggestions("Tron")
+    assert get_mock.call_count == 2
@@ -0,0 +1,40 @@
+from app.core.cache.ttl_policy import TTLPolicy
+from app.utils.cache_keys import make_cache_key, normalize_unit
+
+
+def test_cache_key_is_stable_and_unit_aware():
+    metric = make_cache_key(city="Oslo", country="NO", unit="metric")
+    imperial = make_cache_key(city="Oslo", country="NO", unit="imperial")
+
+    assert metric == "weather:city:oslo:no:metric"
+    assert metric != imperial
+    assert make_cache_key(city=" OSLO ", country="no") == metric
+
+
+def test_cache_key_separates_data_types_and_coordinates():
+    assert make_cache_key(city="Oslo", country="NO", data_type="forecast") == "forecast:city:oslo:no:metric"
+    assert make_cache_key(lat="59.91", lon="10.75") == "weather:coords:59.91:10.75:metric"
+
+
+def test_cache_key_falls_back_to_request_args(app):
+    with app.test_request_context("/weather?city=Bergen&country=NO&unit=imperial"):
+        assert make_cache_key() == "weather:city:bergen:no:imperial"
+
+
+def test_explicit_arguments_never_read_request_args():
+    assert make_cache_key(city="Oslo", country="") == "weather:city:oslo::metric"
+
+
+def test_normalize_unit_defaults_to_metric():
+    assert normalize_unit(None) == "metric"
+    assert normalize_unit("IMPERIAL") == "imperial"
+    assert normalize_unit("kelvin") == "metric"
+
+
+def test_ttl_policy_jitter_only_shortens_timeout():
+    policy = TTLPolicy({"weather": (600, 1800)}, jitter=0.2, rng=lambda: 1.0)
+    assert policy.timeouts("weather") == (480, 1800)
+
+    policy.configure({"weather": (600, 1800)}, jitter=0.0)
+    assert policy.timeouts("weather") == (600, 1800)
+    assert policy.timeouts("unknown") == (300, 0)
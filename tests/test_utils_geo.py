@@ -0,0 +1,19 @@
+from app.core.cache.coordinate_stats import CoordinateHitTracker
+from app.utils.geo import quantize_coordinates
+
+
+def test_quantize_coordinates_snaps_to_grid():
+    assert quantize_coordinates("59.913868", "10.752245") == ("59.91", "10.75")
+    assert quantize_coordinates("59.913868", "10.752245", precision=1) == ("59.9", "10.8")
+    assert quantize_coordinates("-0.0001", "0.0001") == ("0.00", "0.00")
+
+
+def test_coordinate_tracker_reports_hit_rate_per_precision():
+    tracker = CoordinateHitTracker(precisions=(1, 3))
+    tracker.record("weather", "59.9138", "10.7322", 300)
+    tracker.record("weather", "59.9171", "10.7289", 300)
+
+    stats = tracker.get_stats()["weather"]
+    assert stats["1"]["hits"] == 1
+    assert stats["3"]["hits"] == 0
+    assert stats["3"]["cells"] == 2
@@ -0,0 +1,58 @@
+from app.utils import projection
+
+
+def test_parse_projection_normalises_fields_and_rejects_bad_input():
+    assert projection.parse_projection(None, None) == (None, None)
+    assert projection.parse_projection(" main.temp , name,main.temp", "full") == ("fields:main.temp,name", None)
+    assert projection.parse_projection("", "SLIM") == ("slim", None)
+    assert projection.parse_projection(None, "xml")[1].startswith("Ugyldig format")
+    assert projection.parse_projection("name", "slim")[0] is None
+    assert projection.parse_projection("main..temp", None) == (None, "Ugyldig feltnavn")
+    too_many = ",".join(f"field{index}" for index in range(projection.MAX_FIELDS + 1))
+    assert projection.parse_projection(too_many, None)[1] is not None
+
+
+def test_field_projection_keeps_shape_and_skips_missing_paths():
+    payload = {"name": "Oslo", "main": {"temp": 10, "humidity": 80},
+               "list": [{"dt": 1, "rain": {"3h": 0.4}, "weather": [{"icon": "10d", "id": 500}]},
+                        {"dt": 2, "weather": [{"icon": "01d", "id": 800}]}]}
+
+    projected = projection.apply_projection(payload, "fields:list.dt,list.rain.3h,list.weather.0.icon,main.temp,nope")
+
+    assert projected == {"main": {"temp": 10},
+                         "list": [{"dt": 1, "rain": {"3h": 0.4}, "weather": [{"icon": "10d"}]},
+                                  {"dt": 2, "weather": [{"icon": "01d"}]}]}
+    assert payload["main"] == {"temp": 10, "humidity": 80}
+    assert payload["list"][0]["weather"][0] == {"icon": "10d", "id": 500}
+
+
+def test_slim_formats_for_weather_and_forecast():
+    weather = {"name": "Oslo", "sys": {"country": "NO"}, "main": {"temp": 5}, "weather": [{"main": "Rain"}]}
+    forecast = {"city": {"name": "Oslo", "country": "NO"},
+                "list": [{"dt": 1, "main": {"temp": 5}, "rain": {"3h": 1.2}}, {"dt": 2, "main": {"temp": 6}}]}
+
+    slim_weather = projection.apply_projection(weather, "slim")
+    slim_forecast = projection.apply_projection(forecast, "slim")
+
+    assert (slim_weather["name"], slim_weather["country"], slim_weather["temp"]) == ("Oslo", "NO", 5)
+    assert slim_weather["condition"] == "Rain" and slim_weather["wind_speed"] is None
+    assert slim_forecast["count"] == 2
+    assert slim_forecast["columns"]["temp"] == [5, 6]
+    assert slim_forecast["columns"]["rain_3h"] == [1.2, None]
+
+
+def test_errors_pass_through_untouched():
+    error = {"error": "Byen ble ikke funnet"}
+    assert projection.apply_projection(error, "slim") is error
+    assert projection.projection_tag("slim") == "slim"
+    assert projection.projection_tag("fields:a") != projection.projection_tag("fields:b")
+
+
+def test_indexed_fields_keep_their_list_positions():
+    payload = {"weather": [{"id": 1, "main": "A"}, {"id": 2, "main": "B"}, {"id": 3, "main": "C"}]}
+
+    assert projection.project_fields(payload, ["weather.0.id", "weather.1.main"]) == \
+        {"weather": [{"id": 1}, {"main": "B"}]}
+    assert projection.project_fields(payload, ["weather.2.main"]) == {"weather": [{}, {}, {"main": "C"}]}
+    assert projection.project_fields(payload, ["weather", "weather.0.id"]) == payload
+    assert projection.project_fields(payload, ["weather.0.id", "weather"]) == payload
@@ -0,0 +1,35 @@
+from app.utils import units
+
+
+def test_metric_payload_is_returned_unchanged():
+    payload = {"main": {"temp": 10}}
+    assert units.convert_units(payload, "metric") is payload
+
+
+def test_weather_payload_converted_to_imperial_without_mutating_cache():
+    payload = {"name": "Oslo", "main": {"temp": 10, "feels_like": -5.5, "humidity": 80, "pressure": 1012},
+               "wind": {"speed": 5, "gust": 10, "deg": 200}, "visibility": 10000}
+
+    converted = units.convert_units(payload, "imperial")
+
+    assert converted["main"] == {"temp": 50.0, "feels_like": 22.1, "humidity": 80, "pressure": 1012}
+    assert converted["wind"] == {"speed": 11.18, "gust": 22.37, "deg": 200}
+    assert converted["visibility"] == 10000
+    assert payload["main"]["temp"] == 10
+    assert payload["wind"]["speed"] == 5
+
+
+def test_forecast_entries_converted():
+    payload = {"city": {"name": "Oslo"}, "list": [{"dt": 1, "main": {"temp": 0, "temp_kf": 1.5}, "wind": {"speed": 1}}]}
+
+    converted = units.convert_units(payload, "imperial")
+
+    assert converted["list"][0]["main"] == {"temp": 32.0, "temp_kf": 2.7}
+    assert converted["list"][0]["wind"]["speed"] == 2.24
+    assert payload["list"][0]["main"]["temp"] == 0
+
+
+def test_standard_units_use_kelvin_and_errors_pass_through():
+    assert units.convert_units({"main": {"temp": 0}}, "standard")["main"]["temp"] == 273.15
+    error = {"error": "Byen ble ikke funnet"}
+    assert units.convert_units(error, "imperial") is error
@@ -2,14 +2,17 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from app.core.cache import CacheEntry, content_hash, render_cache
 from app.routes import weather_routes
 
 
 @pytest.fixture(autouse=True)
 def reset_cache_mocks(monkeypatch):
     monkeypatch.setattr(weather_routes.DatabaseCache, "get", MagicMock(return_value=None))
+    monkeypatch.setattr(weather_routes.DatabaseCache, "get_entry", MagicMock(return_value=None))
     monkeypatch.setattr(weather_routes.DatabaseCache, "set", MagicMock())
     monkeypatch.setattr(weather_routes.DatabaseCache, "clear_expired", MagicMock(return_value=0))
+    render_cache.clear()
 
 
 def test_get_weather_success(client, monkeypatch):
@@ -39,6 +42,60 @@ def test_get_forecast_success(client, monkeypatch):
     assert isinstance(body.get("list"), list)
 
 
+def test_stale_entry_is_served_and_refreshed_in_background(client, monkeypatch):
+    stale = CacheEntry({"name": "Oslo", "stale": True}, False, 0)
+    monkeypatch.setattr(weather_routes.DatabaseCache, "get_entry", MagicMock(return_value=stale))
+    fetch_mock = MagicMock(return_value={"name": "Oslo"})
+    monkeypatch.setattr(weather_routes.weather_service, "fetch_weather_data", fetch_mock)
+    refresh_mock = MagicMock(return_value=True)
+    monkeypatch.setattr(weather_routes.UpstreamCoalescer, "schedule_refresh", refresh_mock)
+
+    response = client.get("/weather?city=Oslo")
+
+    assert response.get_json() == {"name": "Oslo", "stale": True}
+    fetch_mock.assert_not_called()
+    refresh_mock.assert_called_once()
+    cache_key, loader = refresh_mock.call_args.args
+    loader()
+    fetch_mock.assert_called_once()
+    weather_routes.DatabaseCache.set.assert_called_once_with(cache_key, {"name": "Oslo"}, timeout=300, stale_timeout=1800)
+
+
+def test_fresh_entry_skips_upstream(client, monkeypatch):
+    fresh = CacheEntry({"name": "Oslo"}, True, 120)
+    monkeypatch.setattr(weather_routes.DatabaseCache, "get_entry", MagicMock(return_value=fresh))
+    fetch_mock = MagicMock()
+    monkeypatch.setattr(weather_routes.weather_service, "fetch_weather_data", fetch_mock)
+    refresh_mock = MagicMock()
+    monkeypatch.setattr(weather_routes.UpstreamCoalescer, "schedule_refresh", refresh_mock)
+
+    response = client.get("/forecast?city=Oslo")
+
+    assert response.get_json() == {"name": "Oslo"}
+    fetch_mock.assert_not_called()
+    refresh_mock.assert_not_called()
+
+
+def test_city_not_found_is_negatively_cached(client, monkeypatch):
+    fetch_mock = MagicMock(return_value={"error": "Byen ble ikke funnet"})
+    monkeypatch.setattr(weather_routes.weather_service, "fetch_weather_data", fetch_mock)
+
+    response = client.get("/weather?city=Osloo")
+
+    assert response.get_json() == {"error": "Byen ble ikke funnet"}
+    weather_routes.DatabaseCache.set.assert_called_once_with(
+        "weather:city:osloo:no:metric", {"error": "Byen ble ikke funnet"}, timeout=60)
+
+
+def test_transient_errors_are_not_cached(client, monkeypatch):
+    fetch_mock = MagicMock(return_value={"error": "HTTP-feil: 503"})
+    monkeypatch.setattr(weather_routes.weather_service, "fetch_weather_data", fetch_mock)
+
+    client.get("/weather?city=Oslo")
+
+    weather_routes.DatabaseCache.set.assert_not_called()
+
+
 def test_city_suggestions(client, monkeypatch):
     suggestions = [{"name": "Oslo", "country": "NO"}, {"name": "Osaka", "country": "JP"}]
     suggestion_mock = MagicMock(return_value=suggestions)
@@ -63,6 +120,29 @@ def test_reverse_geocode_success(client, monkeypatch):
     reverse_mock.assert_called_once_with("59", "10")
 
 
+def test_imperial_request_converts_cached_metric_payload(client, monkeypatch):
+    cached = CacheEntry({"name": "Oslo", "main": {"temp": 10}, "wind": {"speed": 5}}, True, 120)
+    monkeypatch.setattr(weather_routes.DatabaseCache, "get_entry", MagicMock(return_value=cached))
+
+    response = client.get("/weather?city=Oslo&unit=imperial")
+
+    body = response.get_json()
+    assert body["main"]["temp"] == 50.0
+    assert body["wind"]["speed"] == 11.18
+    weather_routes.DatabaseCache.get_entry.assert_called_once_with("weather:city:oslo:no:metric")
+
+
+def test_nearby_coordinates_share_cache_key(client, monkeypatch):
+    fetch_mock = MagicMock(return_value={"name": "Oslo", "sys": {"country": "NO"}})
+    monkeypatch.setattr(weather_routes.weather_service, "fetch_weather_data", fetch_mock)
+
+    client.get("/weather_by_coords?lat=59.913868&lon=10.752245")
+    client.get("/weather_by_coords?lat=59.9141&lon=10.7498")
+
+    keys = [call.args[0] for call in weather_routes.DatabaseCache.get_entry.call_args_list]
+    assert keys == ["weather:coords:59.91:10.75:metric"] * 2
+
+
 def test_health_endpoint(client, monkeypatch):
     monkeypatch.setattr(weather_routes.DatabaseCache, "clear_expired", MagicMock(return_value=2))
 
@@ -84,3 +164,145 @@ def test_reverse_geocode_requires_coordinates(client):
     response = client.get("/reverse_geocode")
     assert response.status_code == 400
     assert "error" in response.get_json()
+
+
+def test_analytics_latency_window(client):
+    response = client.get("/analytics?window=5m")
+
+    assert response.status_code == 200
+    latency = response.get_json()["latency"]
+    assert latency["window_seconds"] == 300
+    assert "p95_ms" in latency["overall"]
+    assert "queries" in response.get_json()["queries"]
+    assert client.get("/analytics?window=2d").status_code == 400
+
+
+def test_favorites_add_list_and_remove(client):
+    assert client.post("/favorites", json={"city": "Oslo", "country": "NO"}).status_code == 200
+    assert client.post("/favorites", json={"city": "oslo", "country": "no"}).status_code == 409
+    assert [favorite["city"] for favorite in client.get("/favorites").get_json()] == ["Oslo"]
+    assert client.delete("/favorites", json={"city": "Oslo", "country": "NO"}).status_code == 200
+    assert client.delete("/favorites", json={"city": "Oslo", "country": "NO"}).status_code == 404
+
+
+def test_weather_batch_serves_hits_and_fetches_misses(client, monkeypatch):
+    def get_entry(cache_key):
+        return CacheEntry({"name": "Oslo", "main": {"temp": 10}}, True, 120) if "oslo" in cache_key else None
+
+    monkeypatch.setattr(weather_routes.DatabaseCache, "get_entry", MagicMock(side_effect=get_entry))
+    fetch_mock = MagicMock(side_effect=lambda url: {"error": "Byen ble ikke funnet"} if "Atlantis" in url
+                           else {"name": "Bergen", "main": {"temp": 8}, "sys": {"country": "NO"}})
+    monkeypatch.setattr(weather_routes.weather_service, "fetch_weather_data", fetch_mock)
+
+    response = client.post("/weather/batch", json={"items": [
+        {"city": "Oslo"}, {"city": "Bergen", "country": "NO"}, {"city": "Bergen"},
+        {"city": "Atlantis"}, {"city": "1"}, {"lat": 95, "lon": 10}
+    ]})
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body["cached"], body["fetched"]) == (1, 2)
+    assert fetch_mock.call_count == 2
+    results = body["results"]
+    assert [result.get("data", {}).get("name") for result in results[:3]] == ["Oslo", "Bergen", "Bergen"]
+    assert results[3]["error"] == "Byen ble ikke funnet"
+    assert results[4]["query"] == {"city": "1"} and "error" in results[4]
+    assert results[5]["error"] == "Breddegrad må være mellom -90 og 90"
+
+
+def test_weather_batch_validates_items(client, app):
+    assert client.post("/weather/batch", json={}).status_code == 400
+    too_many = [{"city": "Oslo"}] * (app.config["WEATHER_BATCH_MAX_ITEMS"] + 1)
+    assert client.post("/weather/batch", json={"items": too_many}).status_code == 400
+    assert client.post("/weather/batch", json=[{"city": "Oslo"}]).status_code == 400
+
+
+def test_weather_batch_rejects_non_string_places_and_skips_analytics(client, monkeypatch):
+    fetch_mock = MagicMock(return_value={"name": "Bergen", "sys": {"country": "NO"}})
+    log_mock = MagicMock()
+    monkeypatch.setattr(weather_routes.weather_service, "fetch_weather_data", fetch_mock)
+    monkeypatch.setattr(weather_routes.WeatherAnalytics, "log_query", log_mock)
+
+    response = client.post("/weather/batch", json={"items": [{"city": None}, {"city": "Bergen", "country": 5},
+                                                             {"city": "Bergen"}]})
+
+    results = response.get_json()["results"]
+    assert [result.get("error") for result in results[:2]] == ["Ugyldig sted", "Ugyldig sted"]
+    assert results[2]["data"]["name"] == "Bergen"
+    assert fetch_mock.call_count == 1
+    log_mock.assert_not_called()
+
+
+def test_cached_weather_sends_etag_and_max_age_and_honours_if_none_match(client, monkeypatch):
+    fresh = CacheEntry({"name": "Oslo", "main": {"temp": 10}}, True, 120.7, "abc123")
+    monkeypatch.setattr(weather_routes.DatabaseCache, "get_entry", MagicMock(return_value=fresh))
+
+    response = client.get("/weather?city=Oslo")
+
+    assert response.headers["ETag"] == '"abc123-metric"'
+    assert response.cache_control.max_age == 120
+    assert response.cache_control.public is True
+    imperial = client.get("/weather?city=Oslo&unit=imperial")
+    assert imperial.headers["ETag"] == '"abc123-imperial"'
+    revalidated = client.get("/weather?city=Oslo", headers={"If-None-Match": '"abc123-metric"'})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b""
+    assert revalidated.headers["ETag"] == '"abc123-metric"'
+
+
+def test_upstream_forecast_gets_validators_but_errors_do_not(client, monkeypatch):
+    monkeypatch.setattr(weather_routes.DatabaseCache, "get_fresh_ttl", MagicMock(return_value=1800))
+    forecast = {"city": {"name": "Oslo"}, "list": []}
+    monkeypatch.setattr(weather_routes.weather_service, "fetch_weather_data", MagicMock(return_value=forecast))
+
+    response = client.get("/forecast?city=Oslo")
+
+    assert response.headers["ETag"] == f'"{content_hash(forecast)}-metric"'
+    assert response.cache_control.max_age == 1800
+    monkeypatch.setattr(weather_routes.weather_service, "fetch_weather_data",
+                        MagicMock(return_value={"error": "Byen ble ikke funnet"}))
+    assert "ETag" not in client.get("/forecast?city=Atlantis").headers
+
+
+def test_forecast_fields_projection_is_rendered_once_per_entry(client, monkeypatch):
+    forecast = {"city": {"name": "Oslo", "country": "NO"},
+                "list": [{"dt": 1, "main": {"temp": 10, "humidity": 80}, "weather": [{"icon": "01d", "id": 800}]},
+                         {"dt": 2, "main": {"temp": 12, "humidity": 75}, "weather": [{"icon": "02d", "id": 801}]}]}
+    fresh = CacheEntry(forecast, True, 600, "abc123")
+    monkeypatch.setattr(weather_routes.DatabaseCache, "get_entry", MagicMock(return_value=fresh))
+    project_spy = MagicMock(wraps=weather_routes.apply_projection)
+    monkeypatch.setattr(weather_routes, "apply_projection", project_spy)
+
+    url = "/forecast?city=Oslo&fields=list.dt,list.main.temp,list.weather.0.icon"
+    first = client.get(url)
+    second = client.get(url)
+
+    assert first.get_json() == {"list": [{"dt": 1, "main": {"temp": 10}, "weather": [{"icon": "01d"}]},
+                                         {"dt": 2, "main": {"temp": 12}, "weather": [{"icon": "02d"}]}]}
+    assert second.data == first.data
+    assert project_spy.call_count == 1
+    assert first.headers["ETag"].startswith('"abc123-metric-')
+    assert first.headers["ETag"] != client.get("/forecast?city=Oslo&format=slim").headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+
+def test_slim_forecast_is_columnar_and_unit_aware(client, monkeypatch):
+    forecast = {"city": {"name": "Oslo"}, "list": [{"dt": 1, "main": {"temp": 0}}, {"dt": 2, "main": {"temp": 10}}]}
+    monkeypatch.setattr(weather_routes.DatabaseCache, "get_entry",
+                        MagicMock(return_value=CacheEntry(forecast, True, 600, "abc123")))
+
+    body = client.get("/forecast?city=Oslo&format=slim&unit=imperial").get_json()
+
+    assert body["count"] == 2
+    assert body["columns"]["dt"] == [1, 2]
+    assert body["columns"]["temp"] == [32.0, 50.0]
+
+
+def test_invalid_projection_is_rejected_before_lookup(client, monkeypatch):
+    get_entry = MagicMock(return_value=None)
+    monkeypatch.setattr(weather_routes.DatabaseCache, "get_entry", get_entry)
+
+    assert client.get("/weather?city=Oslo&format=xml").status_code == 400
+    assert client.get("/forecast?city=Oslo&format=slim&fields=list.dt").status_code == 400
+    assert client.get("/weather?city=Oslo&fields=main.temp;drop").status_code == 400
+    get_entry.assert_not_called()
@@ -83,7 +83,7 @@ def test_database_cache_interaction():
         cache_mock.get.assert_called_once_with("key")
 
         DatabaseCache.set("key", {"name": "new"}, timeout=60)
-        cache_mock.set.assert_called_once_with("key", {"name": "new"}, 60)
+        cache_mock.set.assert_called_once_with("key", {"name": "new"}, 60, 0)
 
         cache_mock.clear_expired.return_value = 1
         expired = DatabaseCache.clear_expired()
@@ -112,3 +112,102 @@ def test_fetch_weather_data_handles_error_codes(monkeypatch, payload, expected_c
     data = service.fetch_weather_data("http://example.com/weather")
 
     assert "error" in data
+
+
+def test_geocoding_calls_use_configured_https_base(monkeypatch):
+    service = WeatherAPIService(api_key="test", base_url="https://example.com/data/2.5/")
+    urls = []
+
+    def mock_get(url):
+        urls.append(url)
+        return MockResponse([{"name": "Oslo", "country": "NO", "state": ""}])
+
+    monkeypatch.setattr(service.session, "get", mock_get)
+
+    service.fetch_city_suggestions("Oslo")
+    service.reverse_geocode("59.9", "10.7")
+
+    assert urls[0].startswith("https://api.openweathermap.org/geo/1.0/direct?q=Oslo")
+    assert urls[1].startswith("https://api.openweathermap.org/geo/1.0/reverse?lat=59.9&lon=10.7")
+
+
+def test_transport_applies_default_timeouts_and_retry_policy(monkeypatch):
+    from requests.adapters import HTTPAdapter
+
+    from app.services.weather.transport import UpstreamTransport
+
+    transport = UpstreamTransport(connect_timeout=2, read_timeout=7, max_retries=3)
+    sent = {}
+
+    def fake_send(self, request, **kwargs):
+        sent.update(kwargs)
+        return MockResponse({})
+
+    monkeypatch.setattr(HTTPAdapter, "send", fake_send)
+    transport.adapter.send(requests.Request("GET", "https://example.com").prepare())
+
+    assert sent["timeout"] == (2, 7)
+    retry = transport.adapter.max_retries
+    assert retry.total == 3
+    assert 429 in retry.status_forcelist and 503 in retry.status_forcelist
+    assert transport.session.get_adapter("https://api.openweathermap.org/") is transport.adapter
+    assert transport.get_stats()["connections_opened"] == 0
+
+
+def test_fetch_lookup_uses_group_endpoint_for_known_cities(monkeypatch):
+    from app.models.domain import UpstreamLookup
+    from app.services.weather.group_batcher import GroupBatcher
+
+    service = WeatherAPIService(api_key="test", base_url="http://example.com/",
+                                group_batcher=GroupBatcher(window=0.001))
+    urls = []
+
+    def mock_get(url):
+        urls.append(url)
+        if "group?" in url:
+            return MockResponse({"cnt": 1, "list": [{"id": 3143244, "name": "Oslo"}]})
+        return MockResponse({"cod": 200, "id": 3143244, "name": "Oslo"})
+
+    monkeypatch.setattr(service.session, "get", mock_get)
+    lookup = UpstreamLookup("weather:city:oslo:no:metric", "http://example.com/weather?q=Oslo,NO", "weather", True)
+
+    assert service.fetch_lookup(lookup)["name"] == "Oslo"
+    assert service.fetch_lookup(lookup)["name"] == "Oslo"
+    assert urls[0] == "http://example.com/weather?q=Oslo,NO"
+    assert urls[1] == "http://example.com/group?id=3143244&units=metric&appid=test"
+
+
+def test_upstream_calls_respect_quota(monkeypatch):
+    from app.services.weather.quota import BACKGROUND, UpstreamQuota, upstream_priority
+
+    service = WeatherAPIService(api_key="test", base_url="http://example.com/", quota=UpstreamQuota(per_minute=4))
+    calls = []
+    monkeypatch.setattr(service.session, "get", lambda url: calls.append(url) or MockResponse([{"name": "Oslo"}]))
+
+    with upstream_priority(BACKGROUND):
+        assert "error" not in service.fetch_weather_data("http://example.com/weather")
+        assert "error" not in service.fetch_weather_data("http://example.com/weather")
+        assert service.fetch_weather_data("http://example.com/weather") == {"error": "For mange forespørsler. Prøv igjen senere."}
+    assert service.fetch_suggestion_candidates("Os") == [{"name": "Oslo"}]
+    assert service.fetch_suggestion_candidates("Os") is None
+    assert "error" not in service.fetch_weather_data("http://example.com/weather")
+    assert len(calls) == 4
+    assert service.breaker.get_state()["consecutive_failures"] == 0
+
+
+def test_group_calls_and_transport_retries_are_charged_to_the_quota(monkeypatch):
+    from types import SimpleNamespace
+
+    from app.services.weather.quota import UpstreamQuota
+
+    quota = UpstreamQuota(per_minute=30)
+    service = WeatherAPIService(api_key="test", base_url="http://example.com/", quota=quota)
+    response = MockResponse({"cnt": 3, "list": []})
+    response.raw = SimpleNamespace(retries=SimpleNamespace(history=("first", "second")))
+    monkeypatch.setattr(service.session, "get", lambda url: response)
+
+    service.fetch_weather_group([1, 2, 3])
+
+    stats = quota.get_stats()
+    assert round(stats["tokens"]) == 25
+    assert stats["retries_charged"] == 2